@@ -34,6 +34,7 @@ from suds.xsd.query import TypeQuery, ElementQuery
 from suds.xsd.sxbasic import Element as SchemaElement
 from suds.options import Options
 from suds.plugin import PluginContainer
+from suds.plan import PlanCache
 from copy import deepcopy 
 
 log = getLogger(__name__)
@@ -53,6 +54,8 @@ class Binding:
     @type schema: L{xsd.schema.Schema}
     @ivar options: A dictionary options.
     @type options: L{Options}
+    @ivar plans: The compiled (per method) processing plans.
+    @type plans: L{PlanCache}
     """
     
     replyfilter = (lambda s,r: r)
@@ -63,7 +66,7 @@ class Binding:
         @type wsdl: L{wsdl.Definitions}
         """
         self.wsdl = wsdl
-        self.multiref = MultiRef()
+        self.plans = PlanCache()
         
     def schema(self):
         return self.wsdl.schema
@@ -71,24 +74,66 @@ class Binding:
     def options(self):
         return self.wsdl.options
         
-    def unmarshaller(self, typed=True):
+    def unmarshaller(self, typed=True, plan=None, columnar=False):
         """
         Get the appropriate XML decoder.
+        @param plan: An (optional) plan used to record schema lookups.
+        @type plan: L{suds.plan.Plan}
+        @param columnar: Indicates that lists of objects are returned
+            as columns when possible.
+        @type columnar: boolean
         @return: Either the (basic|typed) unmarshaller.
         @rtype: L{UmxTyped}
         """
         if typed:
-            return UmxTyped(self.schema())
+            options = self.options()
+            return UmxTyped(
+                self.schema(), plan, options.arrays, options.retnative,
+                columnar)
         else:
             return UmxBasic()
         
-    def marshaller(self):
+    def marshaller(self, plan=None):
         """
         Get the appropriate XML encoder.
+        @param plan: An (optional) plan used to record schema lookups.
+        @type plan: L{suds.plan.Plan}
         @return: An L{MxLiteral} marshaller.
         @rtype: L{MxLiteral}
         """
-        return MxLiteral(self.schema(), self.options().xstq)
+        return MxLiteral(self.schema(), self.options().xstq, plan)
+
+    def plan(self, method, *key):
+        """
+        Get the compiled processing plan for the specified method.
+        The plan is filled in as messages for the method are processed
+        and is reused by all later invocations.
+        @param method: A service method.
+        @type method: I{service.Method}
+        @param key: Qualifies the plan (eg: 'mx').
+        @type key: tuple
+        @return: The plan.
+        @rtype: L{suds.plan.Plan}
+        """
+        name = '.'.join([method.name]+[str(k) for k in key])
+        return self.plans.get(name, method, *key)
+
+    def rplan(self, method, rt):
+        """
+        Get the unmarshalling plan for the specified I{method} and
+        return type.
+        @param method: A service method (or None).
+        @type method: I{service.Method}
+        @param rt: The return I{type} (or None for composite replies).
+        @type rt: L{suds.xsd.sxbase.SchemaObject}
+        @return: The plan or None when I{method} is None.
+        @rtype: L{suds.plan.Plan}
+        """
+        if method is None:
+            return None
+        if rt is None:
+            return self.plan(method, 'umx')
+        return self.plan(method, 'umx', rt.name)
     
     def param_defs(self, method):
         """
@@ -127,7 +172,7 @@ class Binding:
             env.refitPrefixes()
         return Document(env)
     
-    def get_reply(self, method, reply):
+    def get_reply(self, method, reply, columnar=False):
         """
         Process the I{reply} for the specified I{method} by sax parsing the I{reply}
         and then unmarshalling into python object(s).
@@ -135,13 +180,17 @@ class Binding:
         @type method: str
         @param reply: The reply XML received after invoking the specified method.
         @type reply: str
+        @param columnar: Indicates that a I{list} reply (and lists of
+            objects within the reply) are to be returned as columns when
+            possible.
+        @type columnar: boolean
         @return: The unmarshalled reply.  The returned value is an L{Object} for a
             I{list} depending on whether the service returns a single object or a 
             collection.
         @rtype: tuple ( L{Element}, L{Object} )
         """
         reply = self.replyfilter(reply)
-        sax = Parser()
+        sax = Parser(self.options().parser)
         replyroot = sax.parse(string=reply)
         plugins = PluginContainer(self.options().plugins)
         plugins.message.parsed(reply=replyroot)
@@ -149,23 +198,99 @@ class Binding:
         soapenv.promotePrefixes()
         soapbody = soapenv.getChild('Body')
         self.detect_fault(soapbody)
-        soapbody = self.multiref.process(soapbody)
+        multiref = MultiRef()
+        soapbody = multiref.process(soapbody)
         nodes = self.replycontent(method, soapbody)
         rtypes = self.returned_types(method)
         if len(rtypes) > 1:
-            result = self.replycomposite(rtypes, nodes)
+            result = self.replycomposite(rtypes, nodes, method, columnar)
             return (replyroot, result)
         if len(rtypes) == 1:
             if rtypes[0].unbounded():
-                result = self.replylist(rtypes[0], nodes)
+                result = self.replylist(rtypes[0], nodes, method, columnar)
                 return (replyroot, result)
             if len(nodes):
-                unmarshaller = self.unmarshaller()
+                plan = self.rplan(method, rtypes[0])
+                unmarshaller = self.unmarshaller(plan=plan, columnar=columnar)
                 resolved = rtypes[0].resolve(nobuiltin=True)
                 result = unmarshaller.process(nodes[0], resolved)
                 return (replyroot, result)
         return (replyroot, None)
     
+    def streamable(self, method):
+        """
+        Get whether the reply for the specified I{method} can be streamed.
+        Only replies that are a list (single unbounded return type)
+        can be streamed.
+        @param method: A service method.
+        @type method: I{service.Method}
+        @return: True if the reply can be streamed.
+        @rtype: boolean
+        """
+        rtypes = self.returned_types(method)
+        return ( len(rtypes) == 1 and rtypes[0].unbounded() )
+
+    def replydepth(self, method):
+        """
+        Get the depth (the soap envelope is 1) of the reply body
+        content for the specified I{method}.
+        @param method: A service method.
+        @type method: I{service.Method}
+        @return: The depth of the reply content.
+        @rtype: int
+        """
+        raise Exception, 'not implemented'
+
+    def get_reply_stream(self, method, fp):
+        """
+        Process the I{reply} for the specified I{method} by incrementally
+        sax parsing the reply read from I{fp}.  Each item in the (list)
+        reply is unmarshalled and yielded as soon as it has been parsed
+        and is then discarded.  The message plugins are not notified.
+        @param method: The name of the invoked method.
+        @type method: str
+        @param fp: The reply (file-like) object.
+        @type fp: I{file-like} object.
+        @return: A generator of the unmarshalled reply items.
+        @rtype: generator
+        @raise WebFault: When the reply contains a fault.
+        """
+        rt = self.returned_types(method)[0]
+        resolved = rt.resolve(nobuiltin=True)
+        unmarshaller = self.unmarshaller(plan=self.rplan(method, rt))
+        sax = Parser()
+        stream = sax.stream(fp, self.replydepth(method), self.inbody)
+        try:
+            for node in stream:
+                yield unmarshaller.process(node, resolved)
+        finally:
+            fp.close()
+        soapenv = stream.document.getChild('Envelope')
+        if soapenv is None:
+            return
+        soapbody = soapenv.getChild('Body')
+        if soapbody is not None:
+            self.detect_fault(soapbody)
+
+    def inbody(self, node):
+        """
+        Get whether the I{node} is soap body content that is not
+        part of a soap fault.
+        @param node: An XML node.
+        @type node: L{Element}
+        @return: True if in the body.
+        @rtype: boolean
+        """
+        path = []
+        while node is not None:
+            path.insert(0, node)
+            node = node.parent
+        if len(path) < 3:
+            return False
+        if not path[1].match('Body', envns):
+            return False
+        return ( not path[2].match('Fault', envns) )
+
     def detect_fault(self, body):
         """
         Detect I{hidden} soapenv:Fault element in the soap body.
@@ -183,7 +308,7 @@ class Binding:
         return self
         
     
-    def replylist(self, rt, nodes):
+    def replylist(self, rt, nodes, method=None, columnar=False):
         """
         Construct a I{list} reply.  This mehod is called when it has been detected
         that the reply is a list.
@@ -191,18 +316,26 @@ class Binding:
         @type rt: L{suds.xsd.sxbase.SchemaObject}
         @param nodes: A collection of XML nodes.
         @type nodes: [L{Element},...]
-        @return: A list of I{unmarshalled} objects.
+        @param method: The (optional) invoked method used to select the plan.
+        @type method: I{service.Method}
+        @param columnar: Indicates that the list is to be returned
+            as columns when possible.
+        @type columnar: boolean
+        @return: A list of I{unmarshalled} objects (or an array
+            as specified by the I{arrays} option).  When I{columnar},
+            an object with a list of values for each child.
         @rtype: [L{Object},...]
         """
-        result = []
         resolved = rt.resolve(nobuiltin=True)
-        unmarshaller = self.unmarshaller()
-        for node in nodes:
-            sobject = unmarshaller.process(node, resolved)
-            result.append(sobject)
-        return result
+        plan = self.rplan(method, rt)
+        unmarshaller = self.unmarshaller(plan=plan, columnar=columnar)
+        if columnar:
+            result = unmarshaller.columns(nodes, resolved)
+            if result is not None:
+                return result
+        return unmarshaller.processall(nodes, resolved)
     
-    def replycomposite(self, rtypes, nodes):
+    def replycomposite(self, rtypes, nodes, method=None, columnar=False):
         """
         Construct a I{composite} reply.  This method is called when it has been
         detected that the reply has multiple root nodes.
@@ -210,14 +343,21 @@ class Binding:
         @type rtypes: [L{suds.xsd.sxbase.SchemaObject},...]
         @param nodes: A collection of XML nodes.
         @type nodes: [L{Element},...]
+        @param method: The (optional) invoked method used to select the plan.
+        @type method: I{service.Method}
+        @param columnar: Indicates that lists of objects are to be
+            returned as columns when possible.
+        @type columnar: boolean
         @return: The I{unmarshalled} composite object.
         @rtype: L{Object},...
         """
         dictionary = {}
         for rt in rtypes:
             dictionary[rt.name] = rt
-        unmarshaller = self.unmarshaller()
-        composite = Factory.object('reply')
+        plan = self.rplan(method, None)
+        unmarshaller = self.unmarshaller(plan=plan, columnar=columnar)
+        composite = unmarshaller.newobject('reply')
+        lists = {}
         for node in nodes:
             tag = node.name
             rt = dictionary.get(tag, None)
@@ -227,20 +367,28 @@ class Binding:
                 else:
                     continue
             resolved = rt.resolve(nobuiltin=True)
+            if rt.unbounded():
+                if tag not in lists:
+                    lists[tag] = (resolved, [])
+                    unmarshaller.setvalue(composite, tag, [])
+                lists[tag][1].append(node)
+                continue
             sobject = unmarshaller.process(node, resolved)
-            value = getattr(composite, tag, None)
+            value = unmarshaller.getvalue(composite, tag)
             if value is None:
-                if rt.unbounded():
-                    value = []
-                    setattr(composite, tag, value)
-                    value.append(sobject)
-                else:
-                    setattr(composite, tag, sobject)
+                unmarshaller.setvalue(composite, tag, sobject)
             else:
                 if not isinstance(value, list):
                     value = [value,]
-                    setattr(composite, tag, value)
-                value.append(sobject)          
+                    unmarshaller.setvalue(composite, tag, value)
+                value.append(sobject)
+        for tag, (resolved, tagged) in lists.items():
+            value = None
+            if columnar:
+                value = unmarshaller.columns(tagged, resolved)
+            if value is None:
+                value = unmarshaller.processall(tagged, resolved)
+            unmarshaller.setvalue(composite, tag, value)
         return composite
     
     def get_fault(self, reply):
@@ -254,7 +402,7 @@ class Binding:
         @rtype: tuple ( L{Element}, L{Object} )
         """
         reply = self.replyfilter(reply)
-        sax = Parser()
+        sax = Parser(self.options().parser)
         faultroot = sax.parse(string=reply)
         soapenv = faultroot.getChild('Envelope')
         soapbody = soapenv.getChild('Body')
@@ -278,7 +426,7 @@ class Binding:
         @return: The parameter fragment.
         @rtype: L{Element}
         """
-        marshaller = self.marshaller()
+        marshaller = self.marshaller(self.plan(method, 'mx'))
         content = \
             Content(tag=pdef[0],
                     value=object, 
@@ -299,7 +447,7 @@ class Binding:
         @return: The parameter fragment.
         @rtype: L{Element}
         """
-        marshaller = self.marshaller()
+        marshaller = self.marshaller(self.plan(method, 'mx'))
         if isinstance(object, (list, tuple)):
             tags = []
             for item in object:
@@ -426,6 +574,10 @@ class Binding:
         @return:  A list of parameter definitions
         @rtype: [I{pdef},]
         """
+        plan = self.plan(method, 'parts')
+        return plan.lookup('body', input, self.__bodypart_types, method, input)
+
+    def __bodypart_types(self, method, input):
         result = []
         if input:
             parts = method.soap.input.body.parts
@@ -461,6 +613,10 @@ class Binding:
         @return:  A list of parameter definitions
         @rtype: [I{pdef},]
         """
+        plan = self.plan(method, 'parts')
+        return plan.lookup('header', input, self.__headpart_types, method, input)
+
+    def __headpart_types(self, method, input):
         result = []
         if input:
             headers = method.soap.input.headers
@@ -499,6 +655,15 @@ class Binding:
             result.append(rt)
         return result
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('plans', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.plans = PlanCache()
+
 
 class PartElement(SchemaElement):
     """
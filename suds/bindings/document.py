@@ -38,6 +38,19 @@ class Document(Binding):
     (multiple message parts), must present a I{document} view for that method.
     """
         
+    def wrapped(self, body):
+        """
+        Get whether the message body is I{wrapped}.  When the WSDL
+        was loaded I{lazy}, the flag is set when first needed.
+        @param body: A message body.
+        @type body: L{Facade}
+        @rtype: bool
+        """
+        try:
+            return body.wrapped
+        except AttributeError:
+            return self.wsdl.wrap(body)
+
     def bodycontent(self, method, args, kwargs):
         #
         # The I{wrapped} vs I{bare} style is detected in 2 ways.
@@ -47,7 +60,7 @@ class Document(Binding):
         #
         if not len(method.soap.input.body.parts):
             return ()
-        wrapped = method.soap.input.body.wrapped
+        wrapped = self.wrapped(method.soap.input.body)
         if wrapped:
             pts = self.bodypart_types(method)
             root = self.document(pts[0])
@@ -70,7 +83,7 @@ class Document(Binding):
         return root
 
     def replycontent(self, method, body):
-        wrapped = method.soap.output.body.wrapped
+        wrapped = self.wrapped(method.soap.output.body)
         if wrapped and body:
             return body[0].children
         elif wrapped:
@@ -78,6 +91,12 @@ class Document(Binding):
         else:
             return body.children
         
+    def replydepth(self, method):
+        if self.wrapped(method.soap.output.body):
+            return 4
+        else:
+            return 3
+
     def document(self, wrapper):
         """
         Get the document root.  For I{document/literal}, this is the
@@ -114,8 +133,12 @@ class Document(Binding):
         # If there is only (1) part and that part resolves to a builtin then
         # it is I{bare}.  Otherwise, it is I{wrapped}.
         #
+        plan = self.plan(method, 'parts')
+        return plan.lookup('params', None, self.__param_defs, method)
+
+    def __param_defs(self, method):
         pts = self.bodypart_types(method)
-        wrapped = method.soap.input.body.wrapped
+        wrapped = self.wrapped(method.soap.input.body)
         if not wrapped:
             return pts
         result = []
@@ -136,7 +159,7 @@ class Document(Binding):
     
     def returned_types(self, method):
         result = []
-        wrapped = method.soap.output.body.wrapped
+        wrapped = self.wrapped(method.soap.output.body)
         rts = self.bodypart_types(method, input=False)
         if wrapped:
             for pt in rts:
@@ -61,6 +61,9 @@ class RPC(Binding):
     
     def replycontent(self, method, body):
         return body[0].children
+
+    def replydepth(self, method):
+        return 4
         
     def method(self, method):
         """
@@ -83,16 +86,31 @@ class Encoded(RPC):
     RPC/Encoded (section 5)  binding style.
     """
 
-    def marshaller(self):
-        return MxEncoded(self.schema())
+    def marshaller(self, plan=None):
+        return MxEncoded(self.schema(), plan=plan)
+
+    def streamable(self, method):
+        #
+        # Encoded replies may contain multi-reference values (href)
+        # which can't be resolved until the whole reply is parsed.
+        #
+        return False
 
-    def unmarshaller(self, typed=True):
+    def unmarshaller(self, typed=True, plan=None, columnar=False):
         """
         Get the appropriate XML decoder.
+        @param plan: An (optional) plan used to record schema lookups.
+        @type plan: L{suds.plan.Plan}
+        @param columnar: Indicates that lists of objects are returned
+            as columns when possible.
+        @type columnar: boolean
         @return: Either the (basic|typed) unmarshaller.
         @rtype: L{UmxTyped}
         """
         if typed:
-            return UmxEncoded(self.schema())
+            options = self.options()
+            return UmxEncoded(
+                self.schema(), plan, options.arrays, options.retnative,
+                columnar)
         else:
             return RPC.unmarshaller(self, typed)
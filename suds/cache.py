@@ -20,21 +20,40 @@ Contains basic caching classes.
 
 import os
 import suds
+from time import time
+from threading import RLock, Thread
 from tempfile import gettempdir as tmp
+from tempfile import mkstemp
+from hashlib import md5
 from suds.transport import *
 from suds.sax.parser import Parser
 from suds.sax.element import Element
+from suds.sax.document import Document
 from datetime import datetime as dt
 from datetime import timedelta
 from cStringIO import StringIO
 from logging import getLogger
+from collections import OrderedDict
 try:
     import cPickle as pickle
 except:
     import pickle
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 log = getLogger(__name__)
 
+#
+# The mode of cache files.  The temporary files they are written to
+# are created readable only by the owner so the mode (as open() would
+# create the file under the process umask) is set when written.
+#
+umask = os.umask(0)
+os.umask(umask)
+filemode = 0666 & ~umask
+
 
 class Cache:
     """
@@ -88,6 +107,18 @@ class Cache:
         @type id: str        
         """
         raise Exception('not-implemented')
+
+    def restore(self, id):
+        """
+        Restore an expired (but retained) object so that it may be
+        gotten from the cache again.  Used when the object has been
+        found to be unchanged (revalidated).
+        @param id: The object ID.
+        @type id: str
+        @return: True when the object was restored.
+        @rtype: bool
+        """
+        return False
     
     def clear(self):
         """
@@ -117,16 +148,37 @@ class NoCache(Cache):
 class FileCache(Cache):
     """
     A file-based URL cache.
+    Files are written to a temporary file and renamed into place so
+    that readers (in other processes) never see a partial file.  The
+    files are spread across (2 hex digit) subdirectories named by the
+    leading digits of the md5 of the object ID.  The age of each file
+    is checked as it is read.  Expired files that are not read are
+    removed by a sweep of the whole cache made (at most) every
+    I{sweepinterval} seconds.  The sweep started by reading a file is
+    made by a (daemon) thread so the read does not wait for it.  Expired
+    files are retained (renamed with a I{.stale} suffix) for another
+    I{duration} so they may be L{restore}d.
     @cvar fnprefix: The file name prefix.
     @type fnsuffix: str
+    @cvar sweepinterval: The minimum number of seconds between
+        sweeps for expired files.
+    @type sweepinterval: int
     @ivar duration: The cached file duration which defines how
         long the file will be cached.
     @type duration: (unit, value)
+    @cvar swept: When each cache (location) was last swept for
+        expired files in this process.
+    @type swept: {location:float}
     @ivar location: The directory for the cached files.
     @type location: str
+    @ivar sweeper: The thread making the last (background) sweep.
+    @type sweeper: I{Thread}
     """
     fnprefix = 'suds'
     units = ('months', 'weeks', 'days', 'hours', 'minutes', 'seconds')
+    sweepinterval = 300
+    swept = {}
+    sweeper = None
     
     def __init__(self, location=None, **duration):
         """
@@ -176,23 +228,26 @@ class FileCache(Cache):
         """
         self.location = location
             
-    def mktmp(self):
+    def mktmp(self, path=None):
         """
-        Make the I{location} directory if it doesn't already exits.
+        Make the I{location} (or specified) directory if it
+        doesn't already exits.
+        @param path: An optional directory path.
+        @type path: str
         """
+        if path is None:
+            path = self.location
         try:
-            if not os.path.isdir(self.location):
-                os.makedirs(self.location)
+            if not os.path.isdir(path):
+                os.makedirs(path)
         except:
-            log.debug(self.location, exc_info=1)
+            log.debug(path, exc_info=1)
         return self
     
     def put(self, id, bfr):
         try:
             fn = self.__fn(id)
-            f = self.open(fn, 'w')
-            f.write(bfr)
-            f.close()
+            self.write(fn, bfr)
             return bfr
         except:
             log.debug(id, exc_info=1)
@@ -201,10 +256,8 @@ class FileCache(Cache):
     def putf(self, id, fp):
         try:
             fn = self.__fn(id)
-            f = self.open(fn, 'w')
-            f.write(fp.read())
+            self.write(fn, fp.read())
             fp.close()
-            f.close()
             return open(fn)
         except:
             log.debug(id, exc_info=1)
@@ -221,75 +274,242 @@ class FileCache(Cache):
     
     def getf(self, id):
         try:
+            self.sweep(wait=False)
             fn = self.__fn(id)
             self.validate(fn)
-            return self.open(fn)
+            return open(fn)
         except:
             pass
 
     def validate(self, fn):
         """
         Validate that the file has not expired based on the I{duration}.
+        Expired files are renamed I{stale} and stale files are deleted
+        once expired again.
         @param fn: The file name.
         @type fn: str
         """
         if self.duration[1] < 1:
             return
-        created = dt.fromtimestamp(os.path.getctime(fn))
+        created = dt.fromtimestamp(os.path.getmtime(fn))
         d = { self.duration[0]:self.duration[1] }
         expired = created+timedelta(**d)
+        if fn.endswith('.stale'):
+            expired += timedelta(**d)
+            if expired < dt.now():
+                log.debug('%s expired, deleted', fn)
+                os.remove(fn)
+            return
         if expired < dt.now():
-            log.debug('%s expired, deleted', fn)
-            os.remove(fn)
+            log.debug('%s expired, retained', fn)
+            os.rename(fn, '%s.stale' % fn)
+
+    def sweep(self, force=False, wait=True):
+        """
+        Remove expired files.  Unless I{forced}, this is done at
+        most once every I{sweepinterval} seconds.
+        @param force: Sweep regardless of when last swept.
+        @type force: bool
+        @param wait: Wait for the sweep rather than sweeping
+            in the background (by the I{sweeper} thread).
+        @type wait: bool
+        """
+        if self.duration[1] < 1:
+            return
+        now = time()
+        last = self.swept.get(self.location, 0)
+        if not force and now < last+self.sweepinterval:
+            return
+        self.swept[self.location] = now
+        if wait:
+            self.__sweep()
+        else:
+            self.sweeper = Thread(target=self.__sweep)
+            self.sweeper.setDaemon(True)
+            self.sweeper.start()
+
+    def __sweep(self):
+        for path in self.files():
+            try:
+                self.validate(path)
+            except:
+                pass
+
+    def files(self):
+        """
+        Get the paths of all the cached files.
+        @return: A list of paths.
+        @rtype: [str,..]
+        """
+        result = []
+        if not os.path.isdir(self.location):
+            return result
+        for dn in os.listdir(self.location):
+            path = os.path.join(self.location, dn)
+            if dn.startswith(self.fnprefix):
+                # written before the cache was sharded.
+                result.append(path)
+                continue
+            if not self.shard(dn) or not os.path.isdir(path):
+                continue
+            for fn in os.listdir(path):
+                if fn.startswith(self.fnprefix):
+                    result.append(os.path.join(path, fn))
+        return result
  
     def clear(self):
-        for fn in os.listdir(self.location):
-            path = os.path.join(self.location, fn)
-            if os.path.isdir(path):
-                continue
-            if fn.startswith(self.fnprefix):
+        for path in self.files():
+            try:
                 os.remove(path)
                 log.debug('deleted: %s', path)
+            except:
+                pass
                 
     def purge(self, id):
+        fn = self.__fn(id)
+        for path in (fn, '%s.stale' % fn):
+            try:
+                os.remove(path)
+            except:
+                pass
+
+    def restore(self, id):
         fn = self.__fn(id)
         try:
-            os.remove(fn)
+            os.rename('%s.stale' % fn, fn)
+            os.utime(fn, None)
+            log.debug('%s restored', fn)
+            return True
         except:
-            pass
+            return os.path.exists(fn)
                 
     def open(self, fn, *args):
         """
         Open the cache file making sure the directory is created.
         """
-        self.mktmp()
+        self.mktmp(os.path.dirname(fn))
         return open(fn, *args)
+
+    def write(self, fn, bfr):
+        """
+        Write the cache file.  The content is written to a temporary
+        file (in the same directory) which is renamed to I{fn} so
+        the file is replaced atomically.  The file is given the mode
+        it would have if created by open().  A retained (stale) copy of
+        the file is removed since it has been replaced.
+        @param fn: The file name.
+        @type fn: str
+        @param bfr: The file content.
+        @type bfr: str
+        """
+        dn = os.path.dirname(fn)
+        self.mktmp(dn)
+        fd, tmpfn = mkstemp(prefix='.', dir=dn)
+        try:
+            f = os.fdopen(fd, 'wb')
+            try:
+                f.write(bfr)
+            finally:
+                f.close()
+            os.chmod(tmpfn, filemode)
+            try:
+                os.rename(tmpfn, fn)
+            except OSError:
+                # windows: cannot rename over an existing file.
+                os.remove(fn)
+                os.rename(tmpfn, fn)
+        except:
+            try:
+                os.remove(tmpfn)
+            except:
+                pass
+            raise
+        stale = '%s.stale' % fn
+        if os.path.exists(stale):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
     
     def checkversion(self):
-        path = os.path.join(self.location, 'version')
+        """
+        Clear the cache when it was written by another version.  An
+        (advisory) lock is held so that concurrent processes do not
+        clear what another has just written.
+        """
+        self.mktmp()
+        lock = self.lock()
         try:
-            
-            f = self.open(path)
-            version = f.read()
-            f.close()
-            if version != suds.__version__:
-                raise Exception()
+            path = os.path.join(self.location, 'version')
+            try:
+                f = open(path)
+                version = f.read()
+                f.close()
+                if version != suds.__version__:
+                    raise Exception()
+            except:
+                self.clear()
+                self.write(path, suds.__version__)
+        finally:
+            self.unlock(lock)
+
+    def lock(self):
+        """
+        Acquire the (advisory) lock on the cache directory.
+        @return: The open lock file (or None when locking is
+            not supported).
+        @rtype: file
+        """
+        if fcntl is None:
+            return None
+        try:
+            f = open(os.path.join(self.location, '.lock'), 'a')
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            return f
         except:
-            self.clear()
-            f = self.open(path, 'w')
-            f.write(suds.__version__)
-            f.close()        
+            log.debug(self.location, exc_info=1)
+            return None
+
+    def unlock(self, lock):
+        """
+        Release the lock acquired by L{lock}.
+        @param lock: The open lock file.
+        @type lock: file
+        """
+        if lock is None:
+            return
+        try:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+        finally:
+            lock.close()
+
+    def shard(self, name):
+        """
+        Get whether the directory name is the name of a shard.
+        @param name: A directory name.
+        @type name: str
+        @rtype: bool
+        """
+        if len(name) != 2:
+            return False
+        for c in name:
+            if c not in '0123456789abcdef':
+                return False
+        return True
     
     def __fn(self, id):
         name = id
         suffix = self.fnsuffix()
         fn = '%s-%s.%s' % (self.fnprefix, name, suffix)
-        return os.path.join(self.location, fn)
+        dn = md5(str(id)).hexdigest()[:2]
+        return os.path.join(self.location, dn, fn)
     
     
 class DocumentCache(FileCache):
     """
     Provides xml document caching.
+    Strings (such as the validators used to revalidate documents) are
+    stored as-is following a I{NUL} which cannot occur in xml.
     """
     
     def fnsuffix(self):
@@ -300,13 +520,22 @@ class DocumentCache(FileCache):
             fp = FileCache.getf(self, id)
             if fp is None:
                 return None
+            content = fp.read()
+            fp.close()
+            if content.startswith('\0'):
+                return content[1:]
             p = Parser()
-            return p.parse(fp)
+            return p.parse(string=content)
         except:
             FileCache.purge(self, id)
     
     def put(self, id, object):
-        if isinstance(object, Element):
+        if isinstance(object, basestring):
+            if isinstance(object, unicode):
+                FileCache.put(self, id, '\0%s' % object.encode('utf-8'))
+            else:
+                FileCache.put(self, id, '\0%s' % object)
+        if isinstance(object, (Document, Element)):
             FileCache.put(self, id, str(object))
         return object
 
@@ -336,3 +565,275 @@ class ObjectCache(FileCache):
         bfr = pickle.dumps(object, self.protocol)
         FileCache.put(self, id, bfr)
         return object
+
+
+class MemoryCache(Cache):
+    """
+    An in-process (LRU) object cache.
+    Unless I{copy} is specified, objects are stored as-is and the same
+    object is returned by each get() so that clients share (rather than
+    unpickle) cached WSDL definitions.  Clients never modify shared
+    definitions (each has its own L{suds.wsdl.View} of them).  XML
+    documents (which are modified when loaded) and, with I{copy}, all
+    objects other than strings are stored pickled and a new copy is
+    unpickled on each get() so that callers may safely modify what is
+    returned.  The size of an object stored as-is is the size of its
+    pickle (only computed when I{maxbytes} is specified).
+    Entries are evicted least recently used
+    first when either I{maxitems} or I{maxbytes} is exceeded and are
+    not returned once the I{duration} has elapsed.  Expired entries are
+    retained (until evicted) so they may be L{restore}d.
+    @cvar protocol: The pickling protocol.
+    @type protocol: int
+    @ivar maxitems: The maximum number of entries.  (0=unlimited)
+    @type maxitems: int
+    @ivar maxbytes: The maximum total size of the entries.  (0=unlimited)
+    @type maxbytes: int
+    @ivar copy: Store all objects pickled and return a (new) copy
+        on each get().
+    @type copy: bool
+    @ivar duration: The cached object duration which defines how
+        long the object will be cached.
+    @type duration: (unit, value)
+    @ivar entries: The cached entries by ID.
+    @type entries: OrderedDict
+    @ivar size: The total size of the entries.
+    @type size: int
+    """
+    protocol = 2
+    units = FileCache.units
+    seconds = dict(
+        months=2592000,
+        weeks=604800,
+        days=86400,
+        hours=3600,
+        minutes=60,
+        seconds=1)
+
+    def __init__(self, maxitems=100, maxbytes=0, copy=False, **duration):
+        """
+        @param maxitems: The maximum number of entries.  (0=unlimited)
+        @type maxitems: int
+        @param maxbytes: The maximum total size of the entries.  (0=unlimited)
+        @type maxbytes: int
+        @param copy: Store all objects pickled and return a (new) copy
+            on each get().
+        @type copy: bool
+        @param duration: The cached object duration which defines how
+            long the object will be cached.  A duration=0 means forever.
+            The duration may be: (months|weeks|days|hours|minutes|seconds).
+        @type duration: {unit:value}
+        """
+        self.maxitems = maxitems
+        self.maxbytes = maxbytes
+        self.copy = copy
+        self.duration = (None, 0)
+        self.setduration(**duration)
+        self.entries = OrderedDict()
+        self.size = 0
+        self.lock = RLock()
+
+    def setduration(self, **duration):
+        """
+        Set the caching duration which defines how long the
+        object will be cached.
+        @param duration: The cached object duration which defines how
+            long the object will be cached.  A duration=0 means forever.
+            The duration may be: (months|weeks|days|hours|minutes|seconds).
+        @type duration: {unit:value}
+        """
+        if len(duration) == 1:
+            arg = duration.items()[0]
+            if not arg[0] in self.units:
+                raise Exception('must be: %s' % str(self.units))
+            self.duration = arg
+        return self
+
+    def get(self, id):
+        entry = self.__get(id)
+        if entry is None:
+            return None
+        pickled, bfr = entry[2:]
+        if pickled:
+            return pickle.loads(bfr)
+        else:
+            return bfr
+
+    def getf(self, id):
+        entry = self.__get(id)
+        if entry is None:
+            return None
+        if entry[2] or not isinstance(entry[3], basestring):
+            return None
+        return StringIO(entry[3])
+
+    def put(self, id, object):
+        if isinstance(object, basestring):
+            self.__put(id, False, object, len(object))
+            return object
+        copy = self.copy or isinstance(object, Document)
+        if not (copy or self.maxbytes):
+            self.__put(id, False, object, 0)
+            return object
+        try:
+            bfr = pickle.dumps(object, self.protocol)
+        except:
+            log.debug(id, exc_info=1)
+            return object
+        if copy:
+            self.__put(id, True, bfr, len(bfr))
+        else:
+            self.__put(id, False, object, len(bfr))
+        return object
+
+    def putf(self, id, fp):
+        bfr = fp.read()
+        fp.close()
+        self.__put(id, False, bfr, len(bfr))
+        return StringIO(bfr)
+
+    def purge(self, id):
+        self.lock.acquire()
+        try:
+            entry = self.entries.pop(id, None)
+            if entry is not None:
+                self.size -= entry[1]
+        finally:
+            self.lock.release()
+
+    def clear(self):
+        self.lock.acquire()
+        try:
+            self.entries = OrderedDict()
+            self.size = 0
+        finally:
+            self.lock.release()
+
+    def restore(self, id):
+        self.lock.acquire()
+        try:
+            entry = self.entries.pop(id, None)
+            if entry is None:
+                return False
+            self.entries[id] = (self.expires(),) + entry[1:]
+            return True
+        finally:
+            self.lock.release()
+
+    def expires(self):
+        """
+        Get when an entry put now will expire.
+        @return: The expiration time (0=never).
+        @rtype: float
+        """
+        if self.duration[1] > 0:
+            return time()+self.seconds[self.duration[0]]*self.duration[1]
+        else:
+            return 0
+
+    def __get(self, id):
+        self.lock.acquire()
+        try:
+            entry = self.entries.get(id)
+            if entry is None:
+                return None
+            if entry[0] and entry[0] < time():
+                log.debug('%s expired', id)
+                return None
+            del self.entries[id]
+            self.entries[id] = entry
+            return entry
+        finally:
+            self.lock.release()
+
+    def __put(self, id, pickled, bfr, size):
+        expires = self.expires()
+        if self.maxbytes and size > self.maxbytes:
+            log.debug('%s (%d bytes) not cached', id, size)
+            self.purge(id)
+            return
+        self.lock.acquire()
+        try:
+            self.purge(id)
+            self.entries[id] = (expires, size, pickled, bfr)
+            self.size += size
+            while self.entries and self.__full():
+                evicted = self.entries.popitem(last=False)
+                self.size -= evicted[1][1]
+                log.debug('%s evicted', evicted[0])
+        finally:
+            self.lock.release()
+
+    def __full(self):
+        if self.maxitems and len(self.entries) > self.maxitems:
+            return True
+        if self.maxbytes and self.size > self.maxbytes:
+            return True
+        return False
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class TieredCache(Cache):
+    """
+    A two tier cache.  The (fast) I{memory} cache is consulted first
+    and the I{file} cache only on a miss.  Objects found in the
+    I{file} cache are copied into the I{memory} cache.  Objects are
+    put into both.
+    @ivar memory: The first tier cache.
+    @type memory: L{Cache}
+    @ivar file: The second tier cache.
+    @type file: L{Cache}
+    """
+
+    def __init__(self, memory=None, file=None):
+        """
+        @param memory: The first tier cache.
+        @type memory: L{Cache}
+        @param file: The second tier cache.
+        @type file: L{Cache}
+        """
+        if memory is None:
+            memory = MemoryCache()
+        if file is None:
+            file = ObjectCache(days=1)
+        self.memory = memory
+        self.file = file
+
+    def get(self, id):
+        object = self.memory.get(id)
+        if object is None:
+            object = self.file.get(id)
+            if object is not None:
+                self.memory.put(id, object)
+        return object
+
+    def getf(self, id):
+        fp = self.memory.getf(id)
+        if fp is None:
+            fp = self.file.getf(id)
+            if fp is not None:
+                fp = self.memory.putf(id, fp)
+        return fp
+
+    def put(self, id, object):
+        self.file.put(id, object)
+        self.memory.put(id, object)
+        return object
+
+    def putf(self, id, fp):
+        fp = self.file.putf(id, fp)
+        return self.memory.putf(id, fp)
+
+    def purge(self, id):
+        self.memory.purge(id)
+        self.file.purge(id)
+
+    def restore(self, id):
+        restored = self.memory.restore(id)
+        return self.file.restore(id) or restored
+
+    def clear(self):
+        self.memory.clear()
+        self.file.clear()
@@ -19,12 +19,13 @@ The I{2nd generation} service proxy provides access to web services.
 See I{README.txt}
 """
 
+import sys
 import suds
 import suds.metrics as metrics
 from cookielib import CookieJar
 from suds import *
 from suds.reader import DefinitionsReader
-from suds.transport import TransportError, Request
+from suds.transport import TransportError, Request, AsyncTransport, Future
 from suds.transport.https import HttpAuthenticated
 from suds.servicedefinition import ServiceDefinition
 from suds import sudsobject
@@ -34,13 +35,16 @@ from suds.resolver import PathResolver
 from suds.builder import Builder
 from suds.wsdl import Definitions
 from suds.cache import ObjectCache
-from suds.sax.document import Document
+from suds.snapshot import Snapshot
+from suds.sax.document import Document, Serializer
 from suds.sax.parser import Parser
 from suds.options import Options
 from suds.properties import Unskin
 from urlparse import urlparse
 from copy import deepcopy
+from threading import local
 from suds.plugin import PluginContainer
+from suds.workers import Workers
 from logging import getLogger
 
 log = getLogger(__name__)
@@ -50,13 +54,22 @@ class Client(object):
     """ 
     A lightweight web services client.
     I{(2nd generation)} API.
+    A client may be shared by threads: all per-call state is held by
+    objects created for each invocation and the last sent/received
+    messages are kept per thread.  Options should not be changed while
+    calls are in progress; use L{clone} for a client with different
+    options.
     @ivar wsdl: The WSDL object.
     @type wsdl:L{Definitions}
     @ivar service: The service proxy used to invoke operations.
     @type service: L{Service}
+    @ivar aservice: The service proxy used to invoke operations
+        asynchronously.  Requires an L{AsyncTransport}.
+    @type aservice: L{Service}
     @ivar factory: The factory used to create objects.
     @type factory: L{Factory}
-    @ivar sd: The service definition
+    @ivar sd: The service definition (built when first used
+        when the I{lazy} option is set).
     @type sd: L{ServiceDefinition}
     @ivar messages: The last sent/received messages.
     @type messages: str[2]
@@ -96,28 +109,46 @@ class Client(object):
         """
         return sobject.__metadata__
 
+    @classmethod
+    def from_snapshot(cls, path, **kwargs):
+        """
+        Create a client using a WSDL snapshot file written by
+        L{suds.snapshot.compile}.  Nothing is downloaded or parsed.
+        @param path: The snapshot file path.
+        @type path: str
+        @param kwargs: keyword arguments.
+        @see: L{Options}
+        @return: A client.
+        @rtype: L{Client}
+        """
+        return cls(Snapshot(path), **kwargs)
+
     def __init__(self, url, **kwargs):
         """
-        @param url: The URL for the WSDL.
-        @type url: str
+        @param url: The URL for the WSDL (or a WSDL snapshot).
+        @type url: (str|L{Snapshot})
         @param kwargs: keyword arguments.
         @see: L{Options}
         """
         options = Options()
         options.transport = HttpAuthenticated()
         self.options = options
+        self.__local = local()
         options.cache = ObjectCache(days=1)
         self.set_options(**kwargs)
-        reader = DefinitionsReader(options, Definitions)
-        self.wsdl = reader.open(url)
+        if isinstance(url, Snapshot):
+            self.wsdl = url.open(options)
+        else:
+            reader = DefinitionsReader(options, Definitions)
+            self.wsdl = reader.open(url)
         plugins = PluginContainer(options.plugins)
         plugins.init.initialized(wsdl=self.wsdl)
         self.factory = Factory(self.wsdl)
         self.service = ServiceSelector(self, self.wsdl.services)
-        self.sd = []
-        for s in self.wsdl.services:
-            sd = ServiceDefinition(self.wsdl, s)
-            self.sd.append(sd)
+        self.aservice = ServiceSelector(self, self.wsdl.services, AsyncMethod)
+        self.__sd = None
+        if not options.lazy:
+            self.sd
         self.messages = dict(tx=None, rx=None)
         
     def set_options(self, **kwargs):
@@ -148,6 +179,38 @@ class Client(object):
         if mapped[1] != uri:
             raise Exception('"%s" already mapped as "%s"' % (prefix, mapped))
         
+    def __getsd(self):
+        if self.__sd is None:
+            sd = []
+            for s in self.wsdl.services:
+                sd.append(ServiceDefinition(self.wsdl, s))
+            self.__sd = sd
+        return self.__sd
+
+    def __setsd(self, sd):
+        self.__sd = sd
+
+    sd = property(
+        __getsd,
+        __setsd,
+        doc='The service definitions.')
+
+    def __getmessages(self):
+        try:
+            return self.__local.messages
+        except AttributeError:
+            messages = dict(tx=None, rx=None)
+            self.__local.messages = messages
+            return messages
+
+    def __setmessages(self, messages):
+        self.__local.messages = messages
+
+    messages = property(
+        __getmessages,
+        __setmessages,
+        doc='The last sent (tx) and received (rx) messages (per thread).')
+
     def last_sent(self):
         """
         Get last sent I{soap} message.
@@ -164,6 +227,50 @@ class Client(object):
         """
         return self.messages.get('rx')
     
+    def batch(self, name, arglist, concurrency=4):
+        """
+        Invoke the named method once for each item in I{arglist}
+        using a bounded pool of worker threads sharing the transport.
+        Each item is:
+            - A I{tuple} of positional arguments.
+            - A I{dict} of keyword arguments.
+            - Anything else is passed as the (single) argument.
+        @param name: The name of a method.
+        @type name: str
+        @param arglist: A list of argument items.
+        @type arglist: list
+        @param concurrency: The maximum number of concurrent calls.
+        @type concurrency: int
+        @return: The results in I{arglist} order.  A call that raised
+            an exception (such as a L{WebFault}) is represented by the
+            exception object.
+        @rtype: list
+        """
+        method = getattr(self.service, name)
+        batch = Batch(method, concurrency)
+        return batch(arglist)
+
+    def plans(self):
+        """
+        Get the compiled (per method) marshalling and unmarshalling
+        plans.  Each plan counts the nodes processed and the schema
+        lookups answered by the plan (hits) or made against the
+        schema (misses) and may be used to monitor the hit rate.
+        @return: A list of plans.
+        @rtype: [L{suds.plan.Plan},..]
+        """
+        result = []
+        bindings = []
+        for s in self.wsdl.services:
+            for p in s.ports:
+                for m in p.methods.values():
+                    for b in (m.binding.input, m.binding.output):
+                        if b not in bindings:
+                            bindings.append(b)
+        for b in bindings:
+            result += list(b.plans)
+        return result
+
     def clone(self):
         """
         Get a shallow clone of this object.
@@ -176,6 +283,7 @@ class Client(object):
             def __init__(self):
                 pass
         clone = Uninitialized()
+        clone.__local = local()
         clone.options = Options()
         cp = Unskin(clone.options)
         mp = Unskin(self.options)
@@ -183,7 +291,8 @@ class Client(object):
         clone.wsdl = self.wsdl
         clone.factory = self.factory
         clone.service = ServiceSelector(clone, self.wsdl.services)
-        clone.sd = self.sd
+        clone.aservice = ServiceSelector(clone, self.wsdl.services, AsyncMethod)
+        clone.__sd = self.__sd
         clone.messages = dict(tx=None, rx=None)
         return clone
  
@@ -270,16 +379,21 @@ class ServiceSelector:
     @type __client: L{Client}
     @ivar __services: A list of I{wsdl} services.
     @type __services: list
+    @ivar __wrapper: The method I{execution wrapper} class.
+    @type __wrapper: L{Method}
     """
-    def __init__(self, client, services):
+    def __init__(self, client, services, wrapper=None):
         """
         @param client: A suds client.
         @type client: L{Client}
         @param services: A list of I{wsdl} services.
         @type services: list
+        @param wrapper: The method I{execution wrapper} class.
+        @type wrapper: L{Method}
         """
         self.__client = client
         self.__services = services
+        self.__wrapper = wrapper or Method
     
     def __getattr__(self, name):
         """
@@ -342,7 +456,7 @@ class ServiceSelector:
                     break
         if service is None:
             raise ServiceNotFound, name
-        return PortSelector(self.__client, service.ports, name)
+        return PortSelector(self.__client, service.ports, name, self.__wrapper)
     
     def __ds(self):
         """
@@ -371,8 +485,10 @@ class PortSelector:
     @type __ports: list
     @ivar __qn: The I{qualified} name of the port (used for logging).
     @type __qn: str
+    @ivar __wrapper: The method I{execution wrapper} class.
+    @type __wrapper: L{Method}
     """
-    def __init__(self, client, ports, qn):
+    def __init__(self, client, ports, qn, wrapper=None):
         """
         @param client: A suds client.
         @type client: L{Client}
@@ -380,10 +496,13 @@ class PortSelector:
         @type ports: list
         @param qn: The name of the service.
         @type qn: str
+        @param wrapper: The method I{execution wrapper} class.
+        @type wrapper: L{Method}
         """
         self.__client = client
         self.__ports = ports
         self.__qn = qn
+        self.__wrapper = wrapper or Method
     
     def __getattr__(self, name):
         """
@@ -445,7 +564,7 @@ class PortSelector:
         if port is None:
             raise PortNotFound, qn
         qn = '.'.join((self.__qn, port.name))
-        return MethodSelector(self.__client, port.methods, qn)
+        return MethodSelector(self.__client, port.methods, qn, self.__wrapper)
     
     def __dp(self):
         """
@@ -469,8 +588,10 @@ class MethodSelector:
     @type __methods: dict
     @ivar __qn: The I{qualified} name of the method (used for logging).
     @type __qn: str
+    @ivar __wrapper: The method I{execution wrapper} class.
+    @type __wrapper: L{Method}
     """
-    def __init__(self, client, methods, qn):
+    def __init__(self, client, methods, qn, wrapper=None):
         """
         @param client: A suds client.
         @type client: L{Client}
@@ -478,10 +599,13 @@ class MethodSelector:
         @type methods: dict
         @param qn: The I{qualified} name of the port.
         @type qn: str
+        @param wrapper: The method I{execution wrapper} class.
+        @type wrapper: L{Method}
         """
         self.__client = client
         self.__methods = methods
         self.__qn = qn
+        self.__wrapper = wrapper or Method
     
     def __getattr__(self, name):
         """
@@ -505,7 +629,7 @@ class MethodSelector:
         if m is None:
             qn = '.'.join((self.__qn, name))
             raise MethodNotFound, qn
-        return Method(self.__client, m)
+        return self.__wrapper(self.__client, m)
 
 
 class Method:
@@ -553,6 +677,68 @@ class Method:
             return SoapClient
 
 
+class AsyncMethod(Method):
+    """
+    The I{asynchronous method} (namespace) object.
+    Invoking the method returns a L{Future} which is completed with
+    the result once the reply has been received.
+    """
+
+    def __call__(self, *args, **kwargs):
+        """
+        Invoke the method.
+        @return: A future completed with the result.
+        @rtype: L{Future}
+        """
+        client = AsyncSoapClient(self.client, self.method)
+        return client.invoke(args, kwargs)
+
+
+class Batch:
+    """
+    Invokes a method concurrently for a list of argument items.
+    @ivar method: The method (execution wrapper).
+    @type method: L{Method}
+    @ivar concurrency: The maximum number of concurrent calls.
+    @type concurrency: int
+    """
+
+    def __init__(self, method, concurrency):
+        """
+        @param method: The method (execution wrapper).
+        @type method: L{Method}
+        @param concurrency: The maximum number of concurrent calls.
+        @type concurrency: int
+        """
+        self.method = method
+        self.concurrency = max(1, concurrency)
+
+    def __call__(self, arglist):
+        """
+        Invoke the method for each item in I{arglist}.
+        @param arglist: A list of argument items.
+        @type arglist: list
+        @return: The results in I{arglist} order.
+        @rtype: list
+        """
+        workers = Workers(self.invoke, self.concurrency, 'batch item')
+        return workers(arglist)
+
+    def invoke(self, item):
+        """
+        Invoke the method for an argument item.
+        @param item: An argument item.
+        @type item: (tuple|dict|object)
+        @return: The result of the method invocation.
+        @rtype: I{builtin}|I{subclass of} L{Object}
+        """
+        if isinstance(item, tuple):
+            return self.method(*item)
+        if isinstance(item, dict):
+            return self.method(**item)
+        return self.method(item)
+
+
 class SoapClient:
     """
     A lightweight soap based web client B{**not intended for external use}
@@ -560,11 +746,23 @@ class SoapClient:
     @type service: L{Service}
     @ivar method: A target method.
     @type method: L{Method}
+    @cvar colkey: The keyword argument used to specify the
+        I{columnar} option for a single call.
+    @type colkey: str
     @ivar options: A dictonary of options.
     @type options: dict
     @ivar cookiejar: A cookie jar.
     @type cookiejar: libcookie.CookieJar
+    @ivar columnar: Indicates that a list reply is to be
+        returned as columns.
+    @type columnar: boolean
+    @ivar messages: The last sent/received messages of the thread
+        that invoked the method (even when the reply is processed
+        by another thread).
+    @type messages: dict
     """
+    
+    colkey = '__columnar'
 
     def __init__(self, client, method):
         """
@@ -577,6 +775,8 @@ class SoapClient:
         self.method = method
         self.options = client.options
         self.cookiejar = CookieJar()
+        self.columnar = self.options.columnar
+        self.messages = client.messages
         
     def invoke(self, args, kwargs):
         """
@@ -588,6 +788,7 @@ class SoapClient:
         @return: The result of the method invocation.
         @rtype: I{builtin}|I{subclass of} L{Object}
         """
+        self.columnar = kwargs.get(self.colkey, self.columnar)
         timer = metrics.Timer()
         timer.start()
         result = None
@@ -619,43 +820,117 @@ class SoapClient:
         location = self.location()
         binding = self.method.binding.input
         transport = self.options.transport
-        retxml = self.options.retxml
         nosend = self.options.nosend
-        prettyxml = self.options.prettyxml
         timer = metrics.Timer()
         log.debug('sending to (%s)\nmessage:\n%s', location, soapenv)
         try:
-            self.last_sent(soapenv)
-            plugins = PluginContainer(self.options.plugins)
-            plugins.message.marshalled(envelope=soapenv.root())
-            if prettyxml:
-                soapenv = soapenv.str()
-            else:
-                soapenv = soapenv.plain()
-            soapenv = soapenv.encode('utf-8')
-            ctx = plugins.message.sending(envelope=soapenv)
-            soapenv = ctx.envelope
+            soapenv = self.encode(soapenv)
             if nosend:
-                return RequestContext(self, binding, soapenv)
+                return RequestContext(self, binding, str(soapenv))
             request = Request(location, soapenv)
             request.headers = self.headers()
+            if self.streaming(binding):
+                reply = transport.stream(request)
+                return self.streamed(binding, reply)
             timer.start()
             reply = transport.send(request)
             timer.stop()
             metrics.log.debug('waited %s on server reply', timer)
-            ctx = plugins.message.received(reply=reply.message)
-            reply.message = ctx.reply
-            if retxml:
-                result = reply.message
-            else:
-                result = self.succeeded(binding, reply.message)
+            result = self.received(binding, reply)
         except TransportError, e:
-            if e.httpcode in (202,204):
-                result = None
-            else:
-                log.error(self.last_sent())
-                result = self.failed(binding, e)
+            result = self.error(binding, e)
         return result
+
+    def encode(self, soapenv):
+        """
+        Encode the soap envelope to be sent.
+        The message plugins are notified that the envelope has
+        been I{marshalled} and is I{sending}.
+        @param soapenv: A soap envelope to send.
+        @type soapenv: L{Document}
+        @return: The encoded envelope.  When the envelope is streamed and
+            no plugin has accessed it, the envelope is rendered as it is sent.
+        @rtype: (str|L{Serializer})
+        """
+        self.last_sent(soapenv)
+        plugins = PluginContainer(self.options.plugins)
+        plugins.message.marshalled(envelope=soapenv.root())
+        if self.options.prettyxml:
+            soapenv = soapenv.str().encode('utf-8')
+        elif self.options.streamrequest:
+            soapenv = Serializer(soapenv)
+        else:
+            soapenv = soapenv.plain().encode('utf-8')
+        ctx = plugins.message.sending(envelope=soapenv)
+        #
+        # Bypass the context I{envelope} property which would
+        # render a streamed envelope.
+        #
+        return ctx.__dict__.get('envelope')
+
+    def received(self, binding, reply):
+        """
+        The transport reply has been received, process it.
+        @param binding: The binding to be used to process the reply.
+        @type binding: L{bindings.binding.Binding}
+        @param reply: The transport reply.
+        @type reply: L{suds.transport.Reply}
+        @return: The method result.
+        @rtype: I{builtin}, L{Object}
+        """
+        plugins = PluginContainer(self.options.plugins)
+        ctx = plugins.message.received(reply=reply.message)
+        reply.message = ctx.reply
+        if self.options.retxml:
+            return reply.message
+        else:
+            return self.succeeded(binding, reply.message)
+
+    def streaming(self, binding):
+        """
+        Get whether the reply is to be streamed.
+        @param binding: The binding to be used to process the reply.
+        @type binding: L{bindings.binding.Binding}
+        @return: True when streamed.
+        @rtype: boolean
+        """
+        if not self.options.streamreply or self.options.retxml:
+            return False
+        return binding.streamable(self.method)
+
+    def streamed(self, binding, reply):
+        """
+        The transport reply is being received, process it incrementally.
+        @param binding: The binding to be used to process the reply.
+        @type binding: L{bindings.binding.Binding}
+        @param reply: The transport reply (the message is file-like).
+        @type reply: L{suds.transport.Reply}
+        @return: A generator of the method result (list) items.
+        @rtype: generator
+        """
+        if reply is None:
+            return None
+        self.messages.pop('rx', None)
+        result = binding.get_reply_stream(self.method, reply.message)
+        if self.options.faults:
+            return result
+        else:
+            return (200, result)
+
+    def error(self, binding, error):
+        """
+        The transport raised an error, process it.
+        @param binding: The binding to be used to process the reply.
+        @type binding: L{bindings.binding.Binding}
+        @param error: The transport error.
+        @type error: L{transport.TransportError}
+        @return: The method result.
+        @rtype: I{builtin}, L{Object}
+        """
+        if error.httpcode in (202,204):
+            return None
+        log.error(self.last_sent())
+        return self.failed(binding, error)
     
     def headers(self):
         """
@@ -685,7 +960,8 @@ class SoapClient:
         log.debug('http succeeded:\n%s', reply)
         plugins = PluginContainer(self.options.plugins)
         if len(reply) > 0:
-            reply, result = binding.get_reply(self.method, reply)
+            reply, result = binding.get_reply(
+                self.method, reply, self.columnar)
             self.last_received(reply)
         else:
             result = None
@@ -725,7 +1001,7 @@ class SoapClient:
     
     def last_sent(self, d=None):
         key = 'tx'
-        messages = self.client.messages
+        messages = self.messages
         if d is None:
             return messages.get(key)
         else:
@@ -733,13 +1009,78 @@ class SoapClient:
         
     def last_received(self, d=None):
         key = 'rx'
-        messages = self.client.messages
+        messages = self.messages
         if d is None:
             return messages.get(key)
         else:
             messages[key] = d
 
 
+class AsyncSoapClient(SoapClient):
+    """
+    A lightweight asynchronous soap based web client
+    B{**not intended for external use}
+    The message is built and the reply processed as for the
+    L{SoapClient} but is sent using the L{AsyncTransport}.  The reply
+    is processed by the transport thread but the messages are recorded
+    for the thread that invoked the method.
+    """
+
+    def send(self, soapenv):
+        """
+        Send soap message.
+        @param soapenv: A soap envelope to send.
+        @type soapenv: L{Document}
+        @return: A future completed with the reply to the sent message.
+        @rtype: L{Future}
+        """
+        future = Future()
+        location = self.location()
+        binding = self.method.binding.input
+        transport = self.options.transport
+        if not isinstance(transport, AsyncTransport):
+            raise Exception('transport must be an AsyncTransport')
+        log.debug('sending to (%s)\nmessage:\n%s', location, soapenv)
+        soapenv = self.encode(soapenv)
+        if self.options.nosend:
+            future.set_result(RequestContext(self, binding, str(soapenv)))
+            return future
+        request = Request(location, soapenv)
+        request.headers = self.headers()
+        def done(pending):
+            self.complete(binding, pending, future)
+        transport.asend(request).add_done_callback(done)
+        return future
+
+    def complete(self, binding, pending, future):
+        """
+        The transport has completed, process the reply
+        and complete the I{future}.
+        @param binding: The binding to be used to process the reply.
+        @type binding: L{bindings.binding.Binding}
+        @param pending: The transport future.
+        @type pending: L{Future}
+        @param future: The future to be completed with the result.
+        @type future: L{Future}
+        """
+        try:
+            try:
+                reply = pending.result()
+                result = self.received(binding, reply)
+            except TransportError, e:
+                result = self.error(binding, e)
+        except WebFault, e:
+            if self.options.faults:
+                future.set_exception(sys.exc_info())
+            else:
+                future.set_result((500, e))
+            return
+        except:
+            future.set_exception(sys.exc_info())
+            return
+        future.set_result(result)
+
+
 class SimClient(SoapClient):
     """
     Loopback client used for message/reply simulation.
@@ -762,6 +1103,7 @@ class SimClient(SoapClient):
         @return: The result of the method invocation.
         @rtype: I{builtin} or I{subclass of} L{Object}
         """
+        self.columnar = kwargs.get(self.colkey, self.columnar)
         simulation = kwargs[self.injkey]
         msg = simulation.get('msg')
         reply = simulation.get('reply')
@@ -51,20 +51,25 @@ class Typed(Core):
     @type schema: L{xsd.schema.Schema}
     @ivar resolver: A schema type resolver.
     @type resolver: L{GraphResolver}
+    @ivar plan: An (optional) plan used to record schema lookups.
+    @type plan: L{suds.plan.Plan}
     """
 
-    def __init__(self, schema, xstq=True):
+    def __init__(self, schema, xstq=True, plan=None):
         """
         @param schema: A schema object
         @type schema: L{xsd.schema.Schema}
         @param xstq: The B{x}ml B{s}chema B{t}ype B{q}ualified flag indicates
             that the I{xsi:type} attribute values should be qualified by namespace.
         @type xstq: bool
+        @param plan: An (optional) plan used to record schema lookups.
+        @type plan: L{suds.plan.Plan}
         """
         Core.__init__(self)
         self.schema = schema
         self.xstq = xstq
-        self.resolver = GraphResolver(self.schema)
+        self.plan = plan
+        self.resolver = GraphResolver(self.schema, plan)
     
     def reset(self):
         self.resolver.reset()
@@ -92,11 +97,15 @@ class Typed(Core):
                 if known is None:
                     log.debug('object has no type information', content.value)
                     known = content.type
+            else:
+                known = self.resolver.resolve(content.type)
             frame = Frame(content.type, resolved=known)
             self.resolver.push(frame)
         frame = self.resolver.top()
         content.real = frame.resolved
         content.ancestry = frame.ancestry
+        if self.plan is not None:
+            self.plan.nodes += 1
         self.translate(content)
         self.sort(content)
         if self.skip(content):
@@ -142,8 +151,8 @@ class Typed(Core):
         # Create an XML node and namespace qualify as defined
         # by the schema (elementFormDefault).
         #
-        ns = content.type.namespace()
-        if content.type.form_qualified:
+        ns, qualified = self.qualification(content.type)
+        if qualified:
             node = Element(content.tag, ns=ns)
             if ns[0]:
                 node.addPrefix(ns[0], ns[1])
@@ -152,6 +161,22 @@ class Typed(Core):
         self.encode(node, content)
         log.debug('created - node:\n%s', node)
         return node
+
+    def qualification(self, type):
+        """
+        Get the namespace and whether the element is namespace
+        qualified as defined by the schema (elementFormDefault).
+        @param type: An XSD type object.
+        @type type: SchemaObject
+        @return: The (namespace, qualified).
+        @rtype: tuple
+        """
+        if self.plan is None:
+            return (type.namespace(), type.form_qualified)
+        return self.plan.lookup('qualification', type, self.__qualification, type)
+
+    def __qualification(self, type):
+        return (type.namespace(), type.form_qualified)
     
     def setnil(self, node, content):
         #
@@ -190,7 +215,7 @@ class Typed(Core):
             return
         if not content.real.extension():
             return
-        if content.type.resolve() == content.real:
+        if self.resolver.resolve(content.type) == content.real:
             return
         ns = None
         name = content.real.name
@@ -272,6 +297,11 @@ class Typed(Core):
         @return: An ordered list of attribute names.
         @rtype: list
         """
+        if self.plan is None:
+            return self.__ordering(type)
+        return self.plan.lookup('ordering', type, self.__ordering, type)
+
+    def __ordering(self, type):
         result = []
         for child, ancestry in type.resolve():
             name = child.name
@@ -97,6 +97,26 @@ class Options(Skin):
                   - 0 = Cache XML documents.
                   - 1 = Cache WSDL (pickled) object.
                 - default: 0
+        - B{revalidate} - Flag that causes the (ETag and Last-Modified) validators
+            received with each XML document to be cached so that once the cached
+            document has expired, it is requested conditionally and reused when
+            not modified.  Only used when I{cachingpolicy} = B{0}.
+                - type: I{bool}
+                - default: False
+        - B{prefetch} - The number of threads used to download the WSDL and
+            the WSDLs and schemas it imports (or includes) concurrently before
+            they are loaded.  The imports are found breadth first.  The loaded
+            WSDL is the same as when not prefetched.  (0=not prefetched)
+                - type: I{int}
+                - default: 0
+        - B{lazy} - Flag that causes the schema types to be built (and
+            dereferenced) when first used, as when a method is first invoked
+            or an object first created, rather than when the WSDL is loaded.
+            Startup time and memory grow with the methods and types used rather
+            than the size of the WSDL.  Schema errors are reported when the
+            type is first used.
+                - type: I{bool}
+                - default: False
         - B{plugins} - A plugin container.
                 - type: I{list}
         - B{nosend} - Create the soap envelope but don't send.
@@ -104,6 +124,57 @@ class Options(Skin):
             instead of sending it.
                 - type: I{bool}
                 - default: False
+        - B{streamreply} - Flag that causes replies that are a list (unbounded
+            return type) to be parsed incrementally as the reply is received.
+            When specified, method invocation returns a I{generator} that yields
+            each item as soon as it has been unmarshalled.  The message plugins
+            are not notified of streamed replies.
+                - type: I{bool}
+                - default: False
+        - B{streamrequest} - Flag that causes the outbound soap envelope to be
+            rendered incrementally as it is sent instead of as a whole.  The
+            envelope is rendered twice (the first time to get the length).
+            Message plugins that access the I{sending} envelope get it rendered
+            as a whole.  Ignored when I{prettyxml} is specified.
+                - type: I{bool}
+                - default: False
+        - B{arrays} - Unbounded elements of the numeric builtin types
+            (I{int}, I{long} and I{float}) received in replies are returned as
+            compact arrays rather than lists.  Either B{array} for an
+            I{array.array} or B{numpy} for a I{numpy.array} (an I{array.array}
+            when numpy is not installed).  A list is returned when the values
+            cannot be stored in an array, as when an element is nil.
+            (None=list)
+                - type: I{str}
+                - default: None
+        - B{columnar} - Flag that causes replies that are a list of objects
+            with only (bounded) builtin children and no attributes, to be
+            returned as columns.  The result is a single object with a list
+            of the (translated) values of each child in schema order.  The
+            lists are stored as arrays as specified by I{arrays}.  Lists of
+            such objects within the reply, as in an I{ArrayOf} wrapper (an
+            object with an unbounded child), are returned as columns too.
+            May also be specified for a single call using the I{__columnar}
+            keyword argument.
+                - type: I{bool}
+                - default: False
+        - B{retnative} - Flag that causes replies to be unmarshalled into
+            plain python dictionaries, lists, (unicode) strings and other
+            native values instead of suds objects.  Attributes are keyed
+            by name prefixed with (_) as for suds objects.  Faults are
+            still unmarshalled into suds objects.  Not every value is a
+            JSON type: I{date}, I{time} and I{dateTime} values are python
+            I{datetime} objects, mixed content (children and text) is the
+            XML element and numeric lists are arrays when I{arrays} is
+            specified.  These need a I{default} function for I{json.dumps()}.
+                - type: I{bool}
+                - default: False
+        - B{parser} - The backend used to parse replies (and faults).  Either
+            B{sax} for the xml.sax reader or B{expat} to drive pyexpat directly
+            (see L{suds.sax.parser.Parser}).  Streamed replies are always parsed
+            by the xml.sax reader.  (None=the default backend)
+                - type: I{str}
+                - default: None
     """    
     def __init__(self, **kwargs):
         domain = __name__
@@ -123,7 +194,16 @@ class Options(Skin):
             Definition('prettyxml', bool, False),
             Definition('autoblend', bool, False),
             Definition('cachingpolicy', int, 0),
+            Definition('revalidate', bool, False),
+            Definition('prefetch', int, 0),
+            Definition('lazy', bool, False),
             Definition('plugins', (list, tuple), []),
             Definition('nosend', bool, False),
+            Definition('streamreply', bool, False),
+            Definition('streamrequest', bool, False),
+            Definition('arrays', basestring, None),
+            Definition('columnar', bool, False),
+            Definition('retnative', bool, False),
+            Definition('parser', basestring, None),
         ]
         Skin.__init__(self, domain, definitions, kwargs)
@@ -0,0 +1,166 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+"""
+The I{plan} module provides compiled (memoized) schema resolution
+plans used by the (un)marshallers.
+"""
+
+from suds.xsd import sxbase
+from logging import getLogger
+
+log = getLogger(__name__)
+
+
+class Plan:
+    """
+    A compiled schema resolution plan.
+    The plan is created (empty) for a method and filled in as the
+    first message is processed: each schema lookup made by the
+    resolver and (un)marshaller is recorded by I{kind} and I{key} so
+    that processing later messages for the method only repeats lookups
+    for paths not seen before.  The recorded lookups are discarded
+    when schema objects have been (lazily) loaded or merged since they
+    were recorded.  The counters are not locked and are approximate
+    when the plan is used by concurrent threads.
+    @ivar name: The plan name (used for logging).
+    @type name: str
+    @ivar tables: The recorded lookups by kind.
+    @type tables: {kind: {key: value}}
+    @ivar version: The schema version (see: L{sxbase.version}) when
+        the lookups were recorded.
+    @type version: int
+    @ivar hits: The number of lookups answered by the plan.
+    @type hits: int
+    @ivar misses: The number of lookups made against the schema.
+    @type misses: int
+    @ivar nodes: The number of nodes (or objects) processed.
+    @type nodes: int
+    """
+
+    def __init__(self, name):
+        """
+        @param name: The plan name (used for logging).
+        @type name: str
+        """
+        self.name = name
+        self.tables = {}
+        self.version = sxbase.version
+        self.hits = 0
+        self.misses = 0
+        self.nodes = 0
+
+    def lookup(self, kind, key, fn, *args):
+        """
+        Get the recorded result of a lookup.  When not recorded,
+        I{fn} is called with I{args} and the result recorded.
+        @param kind: The kind of lookup.
+        @type kind: str
+        @param key: The (hashable) lookup key.
+        @type key: any
+        @param fn: The lookup function.
+        @type fn: callable
+        @param args: The lookup function arguments.
+        @type args: list
+        @return: The (recorded) lookup result.
+        @rtype: any
+        """
+        if self.version != sxbase.version:
+            self.version = sxbase.version
+            self.tables = {}
+            log.debug('plan "%s" discarded, schema changed', self.name)
+        table = self.tables.get(kind)
+        if table is None:
+            table = self.tables.setdefault(kind, {})
+        try:
+            result = table[key]
+            self.hits += 1
+            return result
+        except KeyError:
+            self.misses += 1
+            result = fn(*args)
+            table[key] = result
+            return result
+
+    def clear(self):
+        """
+        Discard all recorded lookups and reset the counters.
+        """
+        self.tables = {}
+        self.version = sxbase.version
+        self.hits = 0
+        self.misses = 0
+        self.nodes = 0
+
+    def ratio(self):
+        """
+        Get the fraction of lookups answered by the plan.
+        @return: The hit ratio (0.0 - 1.0).
+        @rtype: float
+        """
+        total = self.hits + self.misses
+        if total:
+            return float(self.hits) / total
+        return 0.0
+
+    def __len__(self):
+        n = 0
+        for table in self.tables.values():
+            n += len(table)
+        return n
+
+    def __str__(self):
+        return '%s: entries=%d, nodes=%d, hits=%d, misses=%d' % \
+            (self.name, len(self), self.nodes, self.hits, self.misses)
+
+
+class PlanCache:
+    """
+    A collection of plans keyed by method (and reply shape).
+    @ivar plans: The plans by key.
+    @type plans: dict
+    """
+
+    def __init__(self):
+        self.plans = {}
+
+    def get(self, name, *key):
+        """
+        Get (or create) the plan for the specified key.
+        @param name: The plan name (used for logging).
+        @type name: str
+        @param key: The plan key.
+        @type key: tuple
+        @return: The plan.
+        @rtype: L{Plan}
+        """
+        plan = self.plans.get(key)
+        if plan is None:
+            plan = self.plans.setdefault(key, Plan(name))
+            log.debug('plan "%s" created', name)
+        return plan
+
+    def clear(self):
+        """
+        Discard all plans.
+        """
+        self.plans = {}
+
+    def __iter__(self):
+        return iter(self.plans.values())
+
+    def __len__(self):
+        return len(self.plans)
@@ -20,6 +20,7 @@ of suds plugins.
 """
 
 from suds import *
+from suds.sax.document import Serializer
 from logging import getLogger
 
 log = getLogger(__name__)
@@ -55,12 +56,25 @@ class DocumentContext(Context):
 class MessageContext(Context):
     """
     The context for sending the soap envelope.
+    When the envelope to be sent is streamed, it is only rendered
+    when I{envelope} is accessed.
     @ivar envelope: The soap envelope to be sent.
     @type envelope: (str|L{sax.element.Element})
     @ivar reply: The reply.
     @type reply: (str|L{sax.element.Element}|object)
     """
-    pass
+
+    def __getenvelope(self):
+        envelope = self.__dict__.get('envelope')
+        if isinstance(envelope, Serializer):
+            envelope = str(envelope)
+            self.__dict__['envelope'] = envelope
+        return envelope
+
+    def __setenvelope(self, envelope):
+        self.__dict__['envelope'] = envelope
+
+    envelope = property(__getenvelope, __setenvelope)
 
 
 class Plugin:
@@ -19,11 +19,17 @@ Contains xml document reader classes.
 """
 
 
+import suds
+from hashlib import sha1
+from urlparse import urljoin
+from threading import Lock
 from suds.sax.parser import Parser
-from suds.transport import Request
+from suds.transport import Request, TransportError
 from suds.cache import Cache, NoCache
 from suds.store import DocumentStore
 from suds.plugin import PluginContainer
+from suds.xsd.doctor import Doctor
+from suds.workers import Workers
 from logging import getLogger
 
 
@@ -48,10 +54,33 @@ class Reader:
     def mangle(self, name, x):
         """
         Mangle the name by hashing the I{name} and appending I{x}.
+        The (sha1) digest includes the options that affect what is
+        cached (doctor, plugins and autoblend) and the suds version so
+        the name is the same in every process.  The configuration of
+        doctors (such as the imports added) is included.
         @return: the mangled name.
         """
-        h = abs(hash(name))
-        return '%s-%s' % (h, x)
+        if isinstance(name, unicode):
+            name = name.encode('utf-8')
+        h = sha1(name)
+        for part in self.key():
+            h.update('\0')
+            h.update(part)
+        return '%s-%s' % (h.hexdigest(), x)
+
+    def key(self):
+        """
+        Get the options (as strings) that affect what is cached.
+        @return: A list of strings.
+        @rtype: [str,..]
+        """
+        key = [suds.__version__]
+        key.append(str(self.options.autoblend))
+        for object in [self.options.doctor]+self.options.plugins:
+            key.append(classname(object))
+            if isinstance(object, Doctor):
+                key += object.key()
+        return key
 
 
 class DocumentReader(Reader):
@@ -76,29 +105,140 @@ class DocumentReader(Reader):
         id = self.mangle(url, 'document')
         d = cache.get(id)
         if d is None:
-            d = self.download(url)
+            d = Prefetcher.take(self.options, url)
+            if d is not None:
+                cache.put(id, d)
+        if d is None and self.options.revalidate:
+            d = self.revalidate(url, cache, id)
+        if d is None:
+            d = self.download(url, cache)
             cache.put(id, d)
         self.plugins.document.parsed(url=url, document=d.root())
         return d
     
-    def download(self, url):
+    def download(self, url, cache=None, headers={}):
+        """
+        Download the docuemnt.  When I{revalidate} is specified, the
+        (ETag and Last-Modified) validators received are put into
+        the I{cache}.
+        @param url: A document url.
+        @type url: str.
+        @param cache: The cache used to store the validators.
+        @type cache: L{Cache}
+        @param headers: Additional http request headers.
+        @type headers: dict
+        @return: The parsed docuemnt.
+        @rtype: L{Document}
+        """
+        content = self.read(url, cache, headers)
+        return self.parse(url, content)
+
+    def read(self, url, cache=None, headers={}):
         """
-        Download the docuemnt.
+        Read (download) the document content.
         @param url: A document url.
         @type url: str.
-        @return: A file pointer to the docuemnt.
-        @rtype: file-like
+        @param cache: The cache used to store the validators.
+        @type cache: L{Cache}
+        @param headers: Additional http request headers.
+        @type headers: dict
+        @return: The document content.
+        @rtype: str
         """
         store = DocumentStore()
         fp = store.open(url)
         if fp is None:
-            fp = self.options.transport.open(Request(url))
+            request = Request(url)
+            request.headers.update(headers)
+            fp = self.options.transport.open(request)
+            if cache is not None and self.options.revalidate:
+                self.putvalidators(url, cache, fp)
         content = fp.read()
         fp.close()
+        return content
+
+    def parse(self, url, content):
+        """
+        Parse the (downloaded) document content.  The I{loaded}
+        plugins are notified first.
+        @param url: A document url.
+        @type url: str.
+        @param content: The document content.
+        @type content: str
+        @return: The parsed docuemnt.
+        @rtype: L{Document}
+        """
         ctx = self.plugins.document.loaded(url=url, document=content)
         content = ctx.document 
         sax = Parser()
         return sax.parse(string=content)
+
+    def revalidate(self, url, cache, id):
+        """
+        Revalidate an expired document using the validators received
+        when it was downloaded.  The document is requested
+        (conditionally) and when the server replies I{304 (Not Modified)}
+        the expired document is restored in the cache.  When the request
+        fails, the expired document is left (expired) in the cache.
+        @param url: A document url.
+        @type url: str.
+        @param cache: The document cache.
+        @type cache: L{Cache}
+        @param id: The document cache ID.
+        @type id: str
+        @return: The document or None when not revalidated (or the
+            expired document is no longer retained).
+        @rtype: L{Document}
+        """
+        vid = self.mangle(url, 'validators')
+        validators = cache.get(vid)
+        if validators is None and cache.restore(vid):
+            validators = cache.get(vid)
+        if not validators:
+            return None
+        headers = {}
+        for line in validators.splitlines():
+            name, value = line.split(':', 1)
+            if name == 'ETag':
+                headers['If-None-Match'] = value.strip()
+            if name == 'Last-Modified':
+                headers['If-Modified-Since'] = value.strip()
+        try:
+            d = self.download(url, cache, headers)
+            cache.put(id, d)
+            return d
+        except TransportError, e:
+            if e.httpcode != 304:
+                raise
+        log.debug('%s not modified', url)
+        if not cache.restore(id):
+            return None
+        cache.restore(vid)
+        return cache.get(id)
+
+    def putvalidators(self, url, cache, fp):
+        """
+        Put the (ETag and Last-Modified) validators in the
+        http reply headers into the cache.
+        @param url: A document url.
+        @type url: str.
+        @param cache: The document cache.
+        @type cache: L{Cache}
+        @param fp: The opened document.
+        @type fp: file-like
+        """
+        try:
+            info = fp.info()
+        except AttributeError:
+            return
+        validators = []
+        for name in ('ETag', 'Last-Modified'):
+            value = info.getheader(name)
+            if value:
+                validators.append('%s: %s' % (name, value))
+        if validators:
+            vid = self.mangle(url, 'validators')
+            cache.put(vid, '\n'.join(validators))
     
     def cache(self):
         """
@@ -136,8 +276,9 @@ class DefinitionsReader(Reader):
         """
         Open a WSDL at the specified I{url}.
         First, the WSDL attempted to be retrieved from
-        the I{object cache}.  After unpickled from the cache, the
-        I{options} attribute is restored.
+        the I{object cache}.  The cached WSDL (which may be shared
+        with other clients) is not modified: a view of it with the
+        I{options} is returned.
         If not found, it is downloaded and instantiated using the 
         I{fn} constructor and added to the cache for the next open().
         @param url: A WSDL url.
@@ -149,12 +290,15 @@ class DefinitionsReader(Reader):
         id = self.mangle(url, 'wsdl')
         d = cache.get(id)
         if d is None:
-            d = self.fn(url, self.options)
+            prefetcher = Prefetcher(self.options)
+            prefetcher.start(url)
+            try:
+                d = self.fn(url, self.options)
+            finally:
+                prefetcher.stop()
             cache.put(id, d)
         else:
-            d.options = self.options
-            for imp in d.imports:
-                imp.imported.options = self.options
+            d = d.bind(self.options)
         return d
 
     def cache(self):
@@ -166,4 +310,212 @@ class DefinitionsReader(Reader):
         if self.options.cachingpolicy == 1:
             return self.options.cache
         else:
-            return NoCache()
\ No newline at end of file
+            return NoCache()
+
+
+class Prefetcher:
+    """
+    Downloads the WSDL and all of the WSDLs and schemas it imports
+    (or includes) concurrently before the WSDL is loaded.  The import
+    graph is discovered breadth first: each level is downloaded by up
+    to I{prefetch} threads and then parsed (in order) to find the next
+    level.  Loading the WSDL takes the prefetched documents (by url)
+    rather than downloading them so the result is the same as without
+    prefetching.  A document taken again (the loader may open a
+    schema more than once) is parsed again from the prefetched
+    content.  Documents are downloaded as the reader would download
+    them: the validators received are cached and expired documents
+    are revalidated (when I{revalidate} is specified).  Documents
+    that fail to download or parse are left to the loader to report.
+    @cvar active: The running prefetchers by options.
+    @type active: {int:L{Prefetcher}}
+    @ivar options: An options object.
+    @type options: I{Options}
+    @ivar reader: The document reader.
+    @type reader: L{DocumentReader}
+    @ivar documents: The prefetched (document, content) by url.
+    @type documents: {str:[L{Document},str]}
+    """
+
+    active = {}
+    lock = Lock()
+
+    @classmethod
+    def take(cls, options, url):
+        """
+        Take the prefetched document.
+        @param options: An options object.
+        @type options: I{Options}
+        @param url: A document url.
+        @type url: str
+        @return: The prefetched document, else None.
+        @rtype: L{Document}
+        """
+        cls.lock.acquire()
+        try:
+            prefetcher = cls.active.get(id(options))
+            if prefetcher is None:
+                return None
+            prefetched = prefetcher.documents.get(url)
+            if prefetched is None:
+                return None
+            d, content = prefetched
+            prefetched[0] = None
+        finally:
+            cls.lock.release()
+        if d is None:
+            d = prefetcher.reader.parse(url, content)
+        return d
+
+    def __init__(self, options):
+        """
+        @param options: An options object.
+        @type options: I{Options}
+        """
+        self.options = options
+        self.reader = DocumentReader(options)
+        self.documents = {}
+
+    def start(self, url):
+        """
+        Prefetch the WSDL at the specified I{url} and the documents
+        it imports.  Nothing is done unless the I{prefetch} option
+        is specified.
+        @param url: A WSDL url.
+        @type url: str
+        """
+        if self.options.prefetch < 1:
+            return
+        self.lock.acquire()
+        try:
+            if id(self.options) in self.active:
+                return
+            self.active[id(self.options)] = self
+        finally:
+            self.lock.release()
+        seen = set()
+        pending = [url]
+        while pending:
+            level = []
+            for url in pending:
+                if url in seen:
+                    continue
+                seen.add(url)
+                level.append(url)
+            pending = self.prefetch(level)
+        log.debug('%d documents prefetched', len(self.documents))
+
+    def stop(self):
+        """
+        Stop prefetching and discard documents not taken.
+        """
+        self.lock.acquire()
+        try:
+            if self.active.get(id(self.options)) is self:
+                del self.active[id(self.options)]
+        finally:
+            self.lock.release()
+        self.documents = {}
+
+    def prefetch(self, level):
+        """
+        Prefetch one level of the import graph.
+        @param level: A list of document urls.
+        @type level: [str,..]
+        @return: The urls of the documents referenced by the level.
+        @rtype: [str,..]
+        """
+        result = []
+        cache = self.reader.cache()
+        urls = []
+        for url in level:
+            d = cache.get(self.reader.mangle(url, 'document'))
+            if d is None:
+                urls.append(url)
+            else:
+                result += self.references(url, d.root())
+        workers = Workers(self.fetch, self.options.prefetch, 'prefetch')
+        fetched = workers(urls)
+        for url, content in zip(urls, fetched):
+            if isinstance(content, Exception):
+                continue
+            if not isinstance(content, basestring):
+                result += self.references(url, content.root())
+                continue
+            try:
+                d = self.reader.parse(url, content)
+            except Exception:
+                log.debug('prefetched (%s) not parsed', url, exc_info=True)
+                continue
+            self.documents[url] = [d, content]
+            result += self.references(url, d.root())
+        return result
+
+    def fetch(self, url):
+        """
+        Fetch a document as the reader would when opened.  The
+        (revalidation) validators received are put into the cache
+        and an expired document is revalidated.  A revalidated
+        document is (restored) in the cache.
+        @param url: A document url.
+        @type url: str
+        @return: The revalidated document or the downloaded content.
+        @rtype: (L{Document}|str)
+        """
+        cache = self.reader.cache()
+        if self.options.revalidate:
+            id = self.reader.mangle(url, 'document')
+            d = self.reader.revalidate(url, cache, id)
+            if d is not None:
+                return d
+        return self.reader.read(url, cache)
+
+    def references(self, url, root):
+        """
+        Get the urls of the WSDLs and schemas imported (or included)
+        by a document.
+        @param url: The document url.
+        @type url: str
+        @param root: The document root.
+        @type root: L{Element}
+        @return: A list of urls.
+        @rtype: [str,..]
+        """
+        from suds.xsd.sxbasic import Import
+        result = []
+        if root.name == 'definitions':
+            for imp in root.getChildren('import'):
+                result.append(imp.get('location'))
+            for types in root.getChildren('types'):
+                for schema in types.getChildren('schema'):
+                    result += self.references(url, schema)
+        if root.name == 'schema':
+            for imp in root.getChildren('import'):
+                location = imp.get('schemaLocation')
+                if location is None:
+                    location = Import.locations.get(imp.get('namespace'))
+                result.append(location)
+            for inc in root.getChildren('include'):
+                result.append(inc.get('schemaLocation'))
+        urls = []
+        for location in result:
+            if location is None:
+                continue
+            if '://' not in location:
+                location = urljoin(url, location)
+            urls.append(location)
+        return urls
+
+
+def classname(object):
+    """
+    Get the (qualified) class name of an object.
+    @param object: An object.
+    @type object: any
+    @return: The class name.
+    @rtype: str
+    """
+    if object is None:
+        return ''
+    cls = object.__class__
+    return '.'.join((cls.__module__, cls.__name__))
@@ -226,15 +226,20 @@ class TreeResolver(Resolver):
     context.
     @ivar stack: The context stack.
     @type stack: list
+    @ivar plan: An (optional) plan used to record lookups.
+    @type plan: L{suds.plan.Plan}
     """
     
-    def __init__(self, schema):
+    def __init__(self, schema, plan=None):
         """
         @param schema: A schema object.
         @type schema: L{xsd.schema.Schema}
+        @param plan: An (optional) plan used to record lookups.
+        @type plan: L{suds.plan.Plan}
         """
         Resolver.__init__(self, schema)
         self.stack = Stack()
+        self.plan = plan
         
     def reset(self):
         """
@@ -293,6 +298,18 @@ class TreeResolver(Resolver):
     
     def getchild(self, name, parent):
         """ get a child by name """
+        if self.plan is None:
+            return self.__getchild(name, parent)
+        key = (parent, name)
+        return self.plan.lookup('child', key, self.__getchild, name, parent)
+
+    def resolve(self, type):
+        """ get the resolved type """
+        if self.plan is None:
+            return type.resolve()
+        return self.plan.lookup('resolved', type, type.resolve)
+
+    def __getchild(self, name, parent):
         log.debug('searching parent (%s) for (%s)', Repr(parent), name)
         if name.startswith('@'):
             return parent.get_attribute(name[1:])
@@ -308,12 +325,14 @@ class NodeResolver(TreeResolver):
     context.
     """
     
-    def __init__(self, schema):
+    def __init__(self, schema, plan=None):
         """
         @param schema: A schema object.
         @type schema: L{xsd.schema.Schema}
+        @param plan: An (optional) plan used to record lookups.
+        @type plan: L{suds.plan.Plan}
         """
-        TreeResolver.__init__(self, schema)
+        TreeResolver.__init__(self, schema, plan)
         
     def find(self, node, resolved=False, push=True):
         """
@@ -338,10 +357,12 @@ class NodeResolver(TreeResolver):
         if result is None:
             return result
         if push:
+            if known is None:
+                known = self.resolve(result)
             frame = Frame(result, resolved=known, ancestry=ancestry)
             pushed = self.push(frame)
         if resolved:
-            result = result.resolve()
+            result = self.resolve(result)
         return result
     
     def findattr(self, name, resolved=True):
@@ -364,16 +385,14 @@ class NodeResolver(TreeResolver):
         if result is None:
             return result
         if resolved:
-            result = result.resolve()
+            result = self.resolve(result)
         return result
     
     def query(self, name, node):
         """ blindly query the schema by name """
         log.debug('searching schema for (%s)', name)
         qref = qualify(name, node, node.namespace())
-        query = BlindQuery(qref)
-        result = query.execute(self.schema)
-        return (result, [])
+        return (self.execute(qref), [])
     
     def known(self, node):
         """ resolve type referenced by @xsi:type """
@@ -381,6 +400,15 @@ class NodeResolver(TreeResolver):
         if ref is None:
             return None
         qref = qualify(ref, node, node.namespace())
+        return self.execute(qref)
+
+    def execute(self, qref):
+        """ blindly query the schema by qualified reference """
+        if self.plan is None:
+            return self.__execute(qref)
+        return self.plan.lookup('query', qref, self.__execute, qref)
+
+    def __execute(self, qref):
         query = BlindQuery(qref)
         return query.execute(self.schema)
         
@@ -393,12 +421,14 @@ class GraphResolver(TreeResolver):
     context.
     """
     
-    def __init__(self, schema):
+    def __init__(self, schema, plan=None):
         """
         @param schema: A schema object.
         @type schema: L{xsd.schema.Schema}
+        @param plan: An (optional) plan used to record lookups.
+        @type plan: L{suds.plan.Plan}
         """
-        TreeResolver.__init__(self, schema)
+        TreeResolver.__init__(self, schema, plan)
         
     def find(self, name, object, resolved=False, push=True):
         """
@@ -425,18 +455,22 @@ class GraphResolver(TreeResolver):
             return None
         if isinstance(object, Object):
             known = self.known(object)
+        if known is None:
+            known = self.resolve(result)
         if push:
             frame = Frame(result, resolved=known, ancestry=ancestry)
             pushed = self.push(frame)
         if resolved:
-            if known is None:
-                result = result.resolve()
-            else:
-                result = known
+            result = known
         return result
     
     def query(self, name):
         """ blindly query the schema by name """
+        if self.plan is None:
+            return self.__query(name)
+        return self.plan.lookup('query', name, self.__query, name)
+
+    def __query(self, name):
         log.debug('searching schema for (%s)', name)
         schema = self.schema
         wsdl = self.wsdl()
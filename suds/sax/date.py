@@ -29,6 +29,18 @@ import re
 log = getLogger(__name__)
 
 
+#
+# The (compiled) patterns for the canonical forms which are parsed
+# in one step.  Other forms are parsed by splitting.
+#
+DATE = re.compile(r'(\d{4})-(\d{2})-(\d{2})')
+TIME = re.compile(
+    r'(\d{2}):(\d{2}):(\d{2})(?:\.(\d+))?(?:([zZ])|([\-\+]\d{2}):\d{2})?$')
+DATETIME = re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})T'
+    r'(\d{2}):(\d{2}):(\d{2})(?:\.(\d+))?(?:([zZ])|([\-\+]\d{2}):\d{2})?$')
+
+
 class Date:
     """
     An XML date object.
@@ -94,7 +106,11 @@ class Date:
         @rtype: I{date}
         """
         try:
-            year, month, day = s[:10].split('-', 2)
+            m = DATE.match(s)
+            if m is not None:
+                year, month, day = m.groups()
+            else:
+                year, month, day = s[:10].split('-', 2)
             year = int(year)
             month = int(month)
             day = int(day)
@@ -204,6 +220,9 @@ class Time:
         @rtype: B{datetime}.I{time}
         """
         try:
+            m = TIME.match(s)
+            if m is not None:
+                return self.fromparts(*m.groups())
             offset = None
             part = Timezone.split(s)
             hour, minute, second = part[0].split(':', 2)
@@ -220,6 +239,34 @@ class Time:
             log.debug(s, exec_info=True)
             raise ValueError, 'Invalid format "%s"' % s
         
+    def fromparts(self, hour, minute, second, fraction, zone, offset):
+        """
+        Get the time for the (string) parts matched by the I{TIME}
+        pattern.  The I{offset} is set when the TZ is specified.
+        The microseconds are truncated to 6 digits (see L{__second}).
+        @param hour: The hour.
+        @type hour: str
+        @param minute: The minute.
+        @type minute: str
+        @param second: The second.
+        @type second: str
+        @param fraction: The (optional) fraction of the second.
+        @type fraction: str
+        @param zone: The (optional) (z|Z) TZ.
+        @type zone: str
+        @param offset: The (optional) signed TZ offset hours.
+        @type offset: str
+        @return: A time object.
+        @rtype: B{datetime}.I{time}
+        """
+        if zone is not None:
+            self.offset = 0
+        elif offset is not None:
+            self.offset = int(offset)
+        if fraction is None:
+            return dt.time(int(hour), int(minute), int(second))
+        return dt.time(int(hour), int(minute), int(second), int(fraction[:6]))
+        
     def __second(self, s):
         """
         Parse the seconds and microseconds.
@@ -256,11 +303,7 @@ class Time:
         return unicode(self)
     
     def __unicode__(self):
-        time = self.time.isoformat()
-        if self.tz.local:
-            return '%s%+.2d:00' % (time, self.tz.local)
-        else:
-            return '%sZ' % time
+        return self.time.isoformat() + self.tz.suffix()
 
 
 class DateTime(Date,Time):
@@ -289,6 +332,10 @@ class DateTime(Date,Time):
                 dt.datetime.combine(self.date, self.time)
             return
         if isinstance(date, basestring):
+            m = DATETIME.match(date)
+            if m is not None:
+                self.__parse(date, m.groups())
+                return
             part = date.split('T')
             Date.__init__(self, part[0])
             Time.__init__(self, part[1], 0)
@@ -297,6 +344,27 @@ class DateTime(Date,Time):
             self.__adjust()
             return
         raise ValueError, type(date)
+
+    def __parse(self, s, parts):
+        """
+        Set the date, time and datetime (adjusted for the TZ offset)
+        using the (string) parts matched by the I{DATETIME} pattern.
+        @param s: A datetime string.
+        @type s: str
+        @param parts: The matched parts.
+        @type parts: tuple
+        @raise ValueError: When I{s} is invalid.
+        """
+        self.tz = Timezone()
+        try:
+            year, month, day = parts[:3]
+            self.date = dt.date(int(year), int(month), int(day))
+            self.time = self.fromparts(*parts[3:])
+        except:
+            log.debug(s, exc_info=True)
+            raise ValueError, 'Invalid format "%s"' % s
+        self.datetime = dt.datetime.combine(self.date, self.time)
+        self.__adjust()
     
     def __adjust(self):
         """
@@ -317,10 +385,8 @@ class DateTime(Date,Time):
         return unicode(self)
     
     def __unicode__(self):
-        s = []
-        s.append(Date.__unicode__(self))
-        s.append(Time.__unicode__(self))
-        return 'T'.join(s)
+        return '%sT%s%s' % (
+            self.date.isoformat(), self.time.isoformat(), self.tz.suffix())
     
     
 class UTC(DateTime):
@@ -342,12 +408,19 @@ class Timezone:
     @type local: int
     @cvar patten: The regex patten to match TZ.
     @type patten: re.Pattern
+    @cvar adjustments: The cached adjustments by (local, offset).
+    @type adjustments: {(int,int):B{datetime}.I{timedelta}}
+    @cvar suffixes: The cached TZ suffixes by I{local} offset.
+    @type suffixes: {int:str}
     """
     
     pattern = re.compile('([zZ])|([\-\+][0-9]{2}:[0-9]{2})')
     
     LOCAL = ( 0-time.timezone/60/60 ) + time.daylight
 
+    adjustments = {}
+    suffixes = {}
+
     def __init__(self, offset=None):
         if offset is None:
             offset = self.LOCAL
@@ -374,5 +447,25 @@ class Timezone:
         @return: The delta between I{offset} and local TZ.
         @rtype: B{datetime}.I{timedelta}
         """
-        delta = ( self.local - offset )
-        return dt.timedelta(hours=delta)
+        key = (self.local, offset)
+        adjustment = self.adjustments.get(key)
+        if adjustment is None:
+            delta = ( self.local - offset )
+            adjustment = dt.timedelta(hours=delta)
+            self.adjustments[key] = adjustment
+        return adjustment
+
+    def suffix(self):
+        """
+        Get the TZ suffix for the I{local} TZ.
+        @return: The suffix: (+|-)HH:00 or Z for UTC.
+        @rtype: str
+        """
+        suffix = self.suffixes.get(self.local)
+        if suffix is None:
+            if self.local:
+                suffix = '%+.2d:00' % self.local
+            else:
+                suffix = 'Z'
+            self.suffixes[self.local] = suffix
+        return suffix
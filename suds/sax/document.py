@@ -174,8 +174,75 @@ class Document:
             s.append(root.plain())
         return ''.join(s)
 
+    def iterplain(self):
+        """
+        Get a string representation of this XML document incrementally.
+        Joined, the fragments are the same as L{plain}.
+        @return: A generator of I{plain} string fragments.
+        @rtype: generator
+        """
+        yield self.DECL
+        root = self.root()
+        if root is not None:
+            for s in root.iterplain():
+                yield s
+
     def __str__(self):
         return unicode(self).encode('utf-8')
     
     def __unicode__(self):
-        return self.str()
\ No newline at end of file
+        return self.str()
+
+class Serializer:
+    """
+    An encoded XML document that is rendered incrementally as it
+    is iterated.  The document is never rendered as a whole unless
+    converted to I{str}.
+    @cvar blocksize: The (approximate) number of characters in each block.
+    @type blocksize: int
+    @ivar document: The XML document.
+    @type document: L{Document}
+    @ivar encoding: The character encoding.
+    @type encoding: str
+    """
+
+    blocksize = 64*1024
+
+    def __init__(self, document, encoding='utf-8'):
+        """
+        @param document: The XML document.
+        @type document: L{Document}
+        @param encoding: The character encoding.
+        @type encoding: str
+        """
+        self.document = document
+        self.encoding = encoding
+        self.__length = None
+
+    def __iter__(self):
+        buffer = []
+        n = 0
+        for s in self.document.iterplain():
+            buffer.append(s)
+            n += len(s)
+            if n >= self.blocksize:
+                yield u''.join(buffer).encode(self.encoding)
+                buffer = []
+                n = 0
+        if buffer:
+            yield u''.join(buffer).encode(self.encoding)
+
+    def __len__(self):
+        #
+        # The encoded length requires rendering the document
+        # which is done once (block by block) and remembered.
+        #
+        if self.__length is None:
+            n = 0
+            for block in self:
+                n += len(block)
+            self.__length = n
+        return self.__length
+
+    def __str__(self):
+        return ''.join(self)
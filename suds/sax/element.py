@@ -30,9 +30,21 @@ if sys.version_info < (2, 4, 0):
 
 log = getLogger(__name__)
 
-class Element:
+#
+# Shared (empty) containers used until the element's children,
+# attributes or prefix mappings are first written.  They must
+# never be modified.
+#
+EMPTY = ()
+NOPREFIXES = {}
+
+
+class Element(object):
     """
     An XML element object.
+    The I{nsprefixes}, I{attributes} and I{children} containers are
+    allocated when first accessed.  Until then, (internally) empty
+    containers are shared.
     @ivar parent: The node containing this attribute
     @type parent: L{Element}
     @ivar prefix: The I{optional} namespace prefix.
@@ -62,6 +74,17 @@ class Element:
     }
     
     specialprefixes = { Namespace.xmlns[0] : Namespace.xmlns[1]  }
+
+    __slots__ = (
+        'prefix',
+        'name',
+        'expns',
+        'text',
+        'parent',
+        '__nsprefixes',
+        '__attributes',
+        '__children',
+    )
     
     @classmethod
     def buildPath(self, parent, path):
@@ -94,8 +117,8 @@ class Element:
         
         self.rename(name)
         self.expns = None
-        self.nsprefixes = {}
-        self.attributes = []
+        self.__nsprefixes = NOPREFIXES
+        self.__attributes = EMPTY
         self.text = None
         if parent is not None:
             if isinstance(parent, Element):
@@ -104,9 +127,60 @@ class Element:
                 raise Exception('parent (%s) not-valid', parent.__class__.__name__)
         else:
             self.parent = None
-        self.children = []
+        self.__children = EMPTY
         self.applyns(ns)
         
+    def __getnsprefixes(self):
+        if self.__nsprefixes is NOPREFIXES:
+            self.__nsprefixes = {}
+        return self.__nsprefixes
+
+    def __setnsprefixes(self, nsprefixes):
+        self.__nsprefixes = nsprefixes
+
+    nsprefixes = property(__getnsprefixes, __setnsprefixes)
+
+    def __getattributes(self):
+        if self.__attributes is EMPTY:
+            self.__attributes = []
+        return self.__attributes
+
+    def __setattributes(self, attributes):
+        self.__attributes = attributes
+
+    attributes = property(__getattributes, __setattributes)
+
+    def __getchildren(self):
+        if self.__children is EMPTY:
+            self.__children = []
+        return self.__children
+
+    def __setchildren(self, children):
+        self.__children = children
+
+    children = property(__getchildren, __setchildren)
+
+    def __getstate__(self):
+        state = dict(getattr(self, '__dict__', {}))
+        state.update(
+            prefix=self.prefix,
+            name=self.name,
+            expns=self.expns,
+            text=self.text,
+            parent=self.parent,
+            nsprefixes=(self.__nsprefixes or None),
+            attributes=(self.__attributes or None),
+            children=(self.__children or None))
+        return state
+
+    def __setstate__(self, state):
+        state = dict(state)
+        self.__nsprefixes = ( state.pop('nsprefixes', None) or NOPREFIXES )
+        self.__attributes = ( state.pop('attributes', None) or EMPTY )
+        self.__children = ( state.pop('children', None) or EMPTY )
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def rename(self, name):
         """
         Rename the element.
@@ -165,11 +239,11 @@ class Element:
         @rtype: I{Element}
         """
         root = Element(self.qname(), parent, self.namespace())
-        for a in self.attributes:
+        for a in self.__attributes:
             root.append(a.clone(self))
-        for c in self.children:
+        for c in self.__children:
             root.append(c.clone(self))
-        for item in self.nsprefixes.items():
+        for item in self.__nsprefixes.items():
             root.addPrefix(item[0], item[1])
         return root
     
@@ -181,8 +255,8 @@ class Element:
         @rtype: L{Element}
         """
         if self.parent is not None:
-            if self in self.parent.children:
-                self.parent.children.remove(self)
+            if self in self.parent.__children:
+                self.parent.__children.remove(self)
             self.parent = None
         return self
         
@@ -378,9 +452,9 @@ class Element:
         @param content: An element or collection of elements.
         @type content: L{Element} or [L{Element},]
         """
-        if child not in self.children:
+        if child not in self.__children:
             raise Exception('child not-found')
-        index = self.children.index(child)
+        index = self.__children.index(child)
         self.remove(child)
         if not isinstance(content, (list, tuple)):
             content = (content,)
@@ -407,7 +481,7 @@ class Element:
                 ns = None
             else:
                 ns = self.resolvePrefix(prefix)
-        for a in self.attributes:
+        for a in self.__attributes:
             if a.match(name, ns):
                 return a
         return default
@@ -430,7 +504,7 @@ class Element:
                 ns = None
             else:
                 ns = self.resolvePrefix(prefix)
-        for c in self.children:
+        for c in self.__children:
             if c.match(name, ns):
                 return c
         return default
@@ -492,7 +566,7 @@ class Element:
                 ns = None
             else:
                 ns = self.resolvePrefix(prefix)
-        return [c for c in self.children if c.match(name, ns)]
+        return [c for c in self.__children if c.match(name, ns)]
     
     def detachChildren(self):
         """
@@ -500,8 +574,8 @@ class Element:
         @return: The element's children (detached).
         @rtype: [L{Element},...]
         """
-        detached = self.children
-        self.children = []
+        detached = list(self.__children)
+        self.__children = EMPTY
         for child in detached:
             child.parent = None
         return detached
@@ -522,8 +596,8 @@ class Element:
         """
         n = self
         while n is not None:
-            if prefix in n.nsprefixes:
-                return (prefix, n.nsprefixes[prefix])
+            if prefix in n.__nsprefixes:
+                return (prefix, n.__nsprefixes[prefix])
             if prefix in self.specialprefixes:
                 return (prefix, self.specialprefixes[prefix])
             n = n.parent
@@ -553,9 +627,9 @@ class Element:
         @rtype: L{Element}
         @note: This method traverses down the entire branch!
         """
-        if p in self.nsprefixes:
-            self.nsprefixes[p] = u
-        for c in self.children:
+        if p in self.__nsprefixes:
+            self.__nsprefixes[p] = u
+        for c in self.__children:
             c.updatePrefix(p, u)
         return self
             
@@ -567,8 +641,8 @@ class Element:
         @return: self
         @rtype: L{Element}
         """
-        if prefix in self.nsprefixes:
-            del self.nsprefixes[prefix]
+        if prefix in self.__nsprefixes:
+            del self.__nsprefixes[prefix]
         return self
     
     def findPrefix(self, uri, default=None):
@@ -583,7 +657,7 @@ class Element:
         @return: A mapped prefix.
         @rtype: basestring
         """
-        for item in self.nsprefixes.items():
+        for item in self.__nsprefixes.items():
             if item[1] == uri:
                 prefix = item[0]
                 return prefix
@@ -609,7 +683,7 @@ class Element:
         @rtype: [basestring,...]
         """
         result = []
-        for item in self.nsprefixes.items():
+        for item in self.__nsprefixes.items():
             if self.matcher[match](item[1], uri):
                 prefix = item[0]
                 result.append(prefix)
@@ -630,19 +704,19 @@ class Element:
         @return: self
         @rtype: L{Element}
         """
-        for c in self.children:
+        for c in self.__children:
             c.promotePrefixes()
         if self.parent is None:
             return
-        for p,u in self.nsprefixes.items():
-            if p in self.parent.nsprefixes:
-                pu = self.parent.nsprefixes[p]
+        for p,u in self.__nsprefixes.items():
+            if p in self.parent.__nsprefixes:
+                pu = self.parent.__nsprefixes[p]
                 if pu == u:
-                    del self.nsprefixes[p]
+                    del self.__nsprefixes[p]
                 continue
             if p != self.parent.prefix:
                 self.parent.nsprefixes[p] = u
-                del self.nsprefixes[p]
+                del self.__nsprefixes[p]
         return self
     
     def refitPrefixes(self):
@@ -652,14 +726,14 @@ class Element:
         @return: self
         @rtype: L{Element}
         """
-        for c in self.children:
+        for c in self.__children:
             c.refitPrefixes()
         if self.prefix is not None:
             ns = self.resolvePrefix(self.prefix)
             if ns[1] is not None:
                 self.expns = ns[1]
         self.prefix = None
-        self.nsprefixes = {}
+        self.__nsprefixes = NOPREFIXES
         return self
                 
     def normalizePrefixes(self):
@@ -682,8 +756,8 @@ class Element:
         @return: True when element has not children.
         @rtype: boolean
         """
-        noattrs = not len(self.attributes)
-        nochildren = not len(self.children)
+        noattrs = not len(self.__attributes)
+        nochildren = not len(self.__children)
         notext = ( self.text is None )
         nocontent = ( nochildren and notext )
         if content:
@@ -752,7 +826,7 @@ class Element:
         result = []
         result.append('%s<%s' % (tab, self.qname()))
         result.append(self.nsdeclarations())
-        for a in [unicode(a) for a in self.attributes]:
+        for a in [unicode(a) for a in self.__attributes]:
             result.append(' %s' % a)
         if self.isempty():
             result.append('/>')
@@ -760,14 +834,36 @@ class Element:
         result.append('>')
         if self.hasText():
             result.append(self.text.escape())
-        for c in self.children:
+        for c in self.__children:
             result.append('\n')
             result.append(c.str(indent+1))
-        if len(self.children):
+        if len(self.__children):
             result.append('\n%s' % tab)
         result.append('</%s>' % self.qname())
         result = ''.join(result)
         return result
+
+    def iterplain(self):
+        """
+        Get a string representation of this XML fragment incrementally.
+        Joined, the fragments are the same as L{plain}.
+        @return: A generator of I{plain} string fragments.
+        @rtype: generator
+        """
+        yield '<%s' % self.qname()
+        yield self.nsdeclarations()
+        for a in self.__attributes:
+            yield ' %s' % unicode(a)
+        if self.isempty():
+            yield '/>'
+            return
+        yield '>'
+        if self.hasText():
+            yield self.text.escape()
+        for c in self.__children:
+            for s in c.iterplain():
+                yield s
+        yield '</%s>' % self.qname()
     
     def plain(self):
         """
@@ -778,7 +874,7 @@ class Element:
         result = []
         result.append('<%s' % self.qname())
         result.append(self.nsdeclarations())
-        for a in [unicode(a) for a in self.attributes]:
+        for a in [unicode(a) for a in self.__attributes]:
             result.append(' %s' % a)
         if self.isempty():
             result.append('/>')
@@ -786,7 +882,7 @@ class Element:
         result.append('>')
         if self.hasText():
             result.append(self.text.escape())
-        for c in self.children:
+        for c in self.__children:
             result.append(c.plain())
         result.append('</%s>' % self.qname())
         result = ''.join(result)
@@ -809,7 +905,7 @@ class Element:
             if self.expns is not None:
                 d = ' xmlns="%s"' % self.expns
                 s.append(d)
-        for item in self.nsprefixes.items():
+        for item in self.__nsprefixes.items():
             (p,u) = item
             if self.parent is not None:
                 ns = self.parent.resolvePrefix(p)
@@ -845,7 +941,7 @@ class Element:
         @rtype: [L{Element},..]
         """
         branch = [self]
-        for c in self.children:
+        for c in self.__children:
             branch += c.branch()
         return branch
     
@@ -871,7 +967,7 @@ class Element:
         @rtype: L{Element}
         """
         visitor(self)
-        for c in self.children:
+        for c in self.__children:
             c.walk(visitor)
         return self
     
@@ -880,12 +976,12 @@ class Element:
         Prune the branch of empty nodes.
         """
         pruned = []
-        for c in self.children:
+        for c in self.__children:
             c.prune()
             if c.isempty(False):
                 pruned.append(c)
         for p in pruned:
-            self.children.remove(p)
+            self.__children.remove(p)
                 
             
     def __childrenAtPath(self, parts):
@@ -913,14 +1009,14 @@ class Element:
         return result
     
     def __len__(self):
-        return len(self.children)
+        return len(self.__children)
                 
     def __getitem__(self, index):
         if isinstance(index, basestring):
             return self.get(index)
         else:
-            if index < len(self.children):
-                return self.children[index]
+            if index < len(self.__children):
+                return self.__children[index]
             else:
                 return None
         
@@ -928,7 +1024,7 @@ class Element:
         if isinstance(index, basestring):
             self.set(index, value)
         else:
-            if index < len(self.children) and \
+            if index < len(self.__children) and \
                 isinstance(value, Element):
                 self.children.insert(index, value)
 
@@ -949,7 +1045,7 @@ class Element:
         return self.str()
     
     def __iter__(self):
-        return NodeIterator(self)
+        return iter(self.__children)
     
 
 class NodeIterator:
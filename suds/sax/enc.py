@@ -23,12 +23,22 @@ import re
 class Encoder:
     """
     An XML special character encoder/decoder.
+    The I{encodings} and I{decodings} are compiled when the encoder is
+    created.  Strings without special characters are detected by a
+    single (compiled) I{probe} and returned unchanged.  Otherwise, each
+    encoding found in the string is applied in turn (single character
+    encodings by replacement).
     @cvar encodings: A mapping of special characters encoding.
     @type encodings: [(str,str)]
     @cvar decodings: A mapping of special characters decoding.
     @type decodings: [(str,str)]
     @cvar special: A list of special characters
     @type special: [char]
+    @ivar probe: Matches any special character.
+    @type probe: I{Pattern}
+    @ivar compiled: The I{encodings} as (char|pattern, replacement).
+        Single character encodings are kept as the character.
+    @type compiled: [(str|I{Pattern}, str)]
     """
     
     encodings = \
@@ -37,6 +47,15 @@ class Encoder:
         (( '&lt;', '<' ),( '&gt;', '>' ),( '&quot;', '"' ),( '&apos;', "'" ),( '&amp;', '&' ))
     special = \
         ('&', '<', '>', '"', "'")
+
+    def __init__(self):
+        self.probe = re.compile('[%s]' % re.escape(''.join(self.special)))
+        self.compiled = []
+        for x in self.encodings:
+            if len(x[0]) == 1:
+                self.compiled.append(x)
+            else:
+                self.compiled.append((re.compile(x[0]), x[1]))
     
     def needsEncoding(self, s):
         """
@@ -47,9 +66,7 @@ class Encoder:
         @rtype: boolean
         """
         if isinstance(s, basestring):
-            for c in self.special:
-                if c in s:
-                    return True
+            return ( self.probe.search(s) is not None )
         return False
     
     def encode(self, s):
@@ -57,12 +74,16 @@ class Encoder:
         Encode special characters found in string I{s}.
         @param s: A string to encode.
         @type s: str
-        @return: The encoded string.
+        @return: The encoded string (I{s} when nothing is encoded).
         @rtype: str
         """
-        if isinstance(s, basestring) and self.needsEncoding(s):
-            for x in self.encodings:
-                s = re.sub(x[0], x[1], s)
+        if isinstance(s, basestring) and self.probe.search(s) is not None:
+            for x in self.compiled:
+                if isinstance(x[0], basestring):
+                    if x[0] in s:
+                        s = s.replace(x[0], x[1])
+                else:
+                    s = x[0].sub(x[1], s)
         return s
     
     def decode(self, s):
@@ -70,10 +91,11 @@ class Encoder:
         Decode special characters encodings found in string I{s}.
         @param s: A string to decode.
         @type s: str
-        @return: The decoded string.
+        @return: The decoded string (I{s} when nothing is decoded).
         @rtype: str
         """
         if isinstance(s, basestring) and '&' in s:
             for x in self.decodings:
-                s = s.replace(x[0], x[1])
+                if x[0] in s:
+                    s = s.replace(x[0], x[1])
         return s
@@ -36,7 +36,10 @@ from suds.sax.text import Text
 from suds.sax.attribute import Attribute
 from xml.sax import make_parser, InputSource, ContentHandler
 from xml.sax.handler import feature_external_ges
+from xml.parsers import expat
 from cStringIO import StringIO
+from collections import deque
+from threading import local
 
 log = getLogger(__name__)
 
@@ -46,6 +49,7 @@ class Handler(ContentHandler):
     
     def __init__(self):
         self.nodes = [Document()]
+        self.text = [None]
  
     def startElement(self, name, attrs):
         top = self.top()
@@ -57,9 +61,9 @@ class Handler(ContentHandler):
             if self.mapPrefix(node, attribute):
                 continue
             node.append(attribute)
-        node.charbuffer = []
         top.append(node)
         self.push(node)
+        self.text.append([])
         
     def mapPrefix(self, node, attribute):
         skip = False
@@ -76,9 +80,9 @@ class Handler(ContentHandler):
     def endElement(self, name):
         name = unicode(name)
         current = self.top()
-        if len(current.charbuffer):
-            current.text = Text(u''.join(current.charbuffer))
-        del current.charbuffer
+        text = self.text.pop()
+        if len(text):
+            current.text = Text(u''.join(text))
         if len(current):
             current.trim()
         currentqname = current.qname()
@@ -89,8 +93,7 @@ class Handler(ContentHandler):
  
     def characters(self, content):
         text = unicode(content)
-        node = self.top()
-        node.charbuffer.append(text)
+        self.text[-1].append(text)
 
     def push(self, node):
         self.nodes.append(node)
@@ -103,16 +106,208 @@ class Handler(ContentHandler):
         return self.nodes[len(self.nodes)-1]
 
 
+class ExpatHandler:
+    """
+    A handler that drives I{pyexpat} directly (bypassing xml.sax).
+    Builds the same tree as L{Handler} with less overhead per node:
+    the pyexpat strings are already unicode, the character data is
+    buffered by expat and collected on a stack rather than on the node.
+    """
+
+    def __init__(self):
+        self.nodes = [Document()]
+        self.text = [None]
+
+    def bind(self, parser):
+        """
+        Bind this handler to the specified pyexpat parser.
+        @param parser: A pyexpat parser.
+        @type parser: I{xmlparser}
+        """
+        parser.buffer_text = True
+        parser.StartElementHandler = self.startElement
+        parser.EndElementHandler = self.endElement
+        parser.CharacterDataHandler = self.characters
+        parser.ExternalEntityRefHandler = self.entity
+        parser.SetParamEntityParsing(
+            expat.XML_PARAM_ENTITY_PARSING_UNLESS_STANDALONE)
+
+    def startElement(self, name, attrs):
+        node = Element(name)
+        for n, v in attrs.items():
+            if n == 'xmlns':
+                if len(v):
+                    node.expns = v
+                continue
+            if n.startswith('xmlns:'):
+                node.nsprefixes[n[6:]] = v
+                continue
+            node.append(Attribute(n, v))
+        self.nodes[-1].append(node)
+        self.nodes.append(node)
+        self.text.append([])
+
+    def endElement(self, name):
+        current = self.nodes.pop()
+        text = self.text.pop()
+        if len(text):
+            current.text = Text(u''.join(text))
+        if len(current):
+            current.trim()
+        if name != current.qname():
+            raise Exception('malformed document')
+
+    def characters(self, content):
+        self.text[-1].append(content)
+
+    def entity(self, context, base, sysid, pubid):
+        # external entities are not processed (feature_external_ges).
+        return 1
+
+
+class StreamHandler(Handler):
+    """
+    A sax handler used for incremental parsing.  Elements completed
+    at the specified I{depth} (and accepted) are detached from their
+    parent and queued.  The detached element keeps the reference to
+    the parent so that namespace prefixes can still be resolved.  The
+    text of the elements above I{depth} (such as the whitespace between
+    the queued elements) is discarded so it does not accumulate.
+    @ivar depth: The depth (the document root is 1) of queued elements.
+    @type depth: int
+    @ivar accept: An (optional) function used to select elements.
+    @type accept: callable(L{Element})
+    @ivar ready: The queue of completed elements.
+    @type ready: deque
+    """
+
+    def __init__(self, depth, accept=None):
+        Handler.__init__(self)
+        self.depth = depth
+        self.accept = accept
+        self.ready = deque()
+
+    def endElement(self, name):
+        depth = len(self.nodes)-1
+        Handler.endElement(self, name)
+        if depth != self.depth:
+            return
+        parent = self.top()
+        node = parent.children[-1]
+        if self.accept is None or self.accept(node):
+            parent.children.pop()
+            self.ready.append(node)
+
+    def characters(self, content):
+        if len(self.nodes)-1 < self.depth:
+            return
+        Handler.characters(self, content)
+
+
+class Stream:
+    """
+    An incremental parse of an XML I{file}.  Iterating the stream
+    feeds the file into the sax parser block by block and yields each
+    element completed at I{depth} as soon as it has been parsed.
+    Elements yielded are not part of the document (tree).
+    @cvar blocksize: The number of bytes read (and fed) at a time.
+    @type blocksize: int
+    @ivar file: The file-like object to be parsed.
+    @type file: I{file-like} object.
+    @ivar document: The (partial) document.
+    @type document: L{Document}
+    """
+
+    blocksize = 64*1024
+
+    def __init__(self, file, depth, accept=None):
+        """
+        @param file: The file-like object to be parsed.
+        @type file: I{file-like} object.
+        @param depth: The depth (the document root is 1) of elements
+            to be yielded.
+        @type depth: int
+        @param accept: An (optional) function used to select elements.
+        @type accept: callable(L{Element})
+        """
+        self.file = file
+        self.handler = StreamHandler(depth, accept)
+        self.document = self.handler.nodes[0]
+
+    def __iter__(self):
+        sax = make_parser()
+        sax.setFeature(feature_external_ges, 0)
+        sax.setContentHandler(self.handler)
+        ready = self.handler.ready
+        while True:
+            data = self.file.read(self.blocksize)
+            if not data:
+                break
+            sax.feed(data)
+            while ready:
+                yield ready.popleft()
+        sax.close()
+        while ready:
+            yield ready.popleft()
+
+
 class Parser:
-    """ SAX Parser """
+    """
+    SAX Parser
+    @cvar backend: The default parser backend.
+        - I{sax} - The xml.sax (expat) reader.
+        - I{expat} - Drive pyexpat directly; builds the same tree
+          with less overhead.  Errors are raised as I{ExpatError}
+          instead of I{SAXParseException}.
+    @type backend: str
+    @cvar backends: The names of the parser backends.
+    @type backends: (str,...)
+    @ivar backend: The parser backend.
+    @type backend: str
+    """
+
+    backend = 'sax'
+    backends = ('sax', 'expat')
+
+    readers = local()
+
+    def __init__(self, backend=None):
+        """
+        @param backend: The (optional) parser backend.
+        @type backend: str
+        @raise Exception: When the backend is unknown.
+        """
+        if backend is not None:
+            self.backend = backend
+        if self.backend not in self.backends:
+            raise Exception(
+                'parser backend (%s) must be: %s' %
+                (self.backend, str(self.backends)))
     
     @classmethod
     def saxparser(cls):
-        p = make_parser()
-        p.setFeature(feature_external_ges, 0)
+        #
+        # The xml.sax reader creates a new expat parser on each parse()
+        # so it is reused (by thread) rather than created per document.
+        #
+        p = getattr(cls.readers, 'sax', None)
+        if p is None:
+            p = make_parser()
+            p.setFeature(feature_external_ges, 0)
+            cls.readers.sax = p
         h = Handler()
         p.setContentHandler(h)
         return (p, h)
+
+    @classmethod
+    def expatparser(cls):
+        #
+        # A pyexpat parser can only parse one document.
+        #
+        p = expat.ParserCreate()
+        h = ExpatHandler()
+        h.bind(p)
+        return (p, h)
         
     def parse(self, file=None, string=None):
         """
@@ -124,16 +319,58 @@ class Parser:
         """
         timer = metrics.Timer()
         timer.start()
-        sax, handler = self.saxparser()
+        if self.backend == 'expat':
+            root = self.__expat(file, string)
+        else:
+            root = self.__sax(file, string)
+        timer.stop()
         if file is not None:
-            sax.parse(file)
-            timer.stop()
             metrics.log.debug('sax (%s) duration: %s', file, timer)
+        else:
+            metrics.log.debug('%s\nsax duration: %s', string, timer)
+        return root
+
+    def __sax(self, file, string):
+        sax, handler = self.saxparser()
+        try:
+            if file is not None:
+                sax.parse(file)
+                return handler.nodes[0]
+            if string is not None:
+                source = InputSource(None)
+                source.setByteStream(StringIO(string))
+                sax.parse(source)
+                return handler.nodes[0]
+        finally:
+            sax.setContentHandler(ContentHandler())
+
+    def __expat(self, file, string):
+        parser, handler = self.expatparser()
+        if file is not None:
+            if isinstance(file, basestring):
+                fp = open(file)
+                try:
+                    parser.ParseFile(fp)
+                finally:
+                    fp.close()
+            else:
+                parser.ParseFile(file)
             return handler.nodes[0]
         if string is not None:
-            source = InputSource(None)
-            source.setByteStream(StringIO(string))
-            sax.parse(source)
-            timer.stop()
-            metrics.log.debug('%s\nsax duration: %s', string, timer)
-            return handler.nodes[0]
\ No newline at end of file
+            parser.Parse(string, True)
+            return handler.nodes[0]
+
+    def stream(self, file, depth, accept=None):
+        """
+        SAX parse XML text incrementally.
+        @param file: Parse a python I{file-like} object.
+        @type file: I{file-like} object.
+        @param depth: The depth (the document root is 1) of elements
+            to be yielded as they are completed.
+        @type depth: int
+        @param accept: An (optional) function used to select elements.
+        @type accept: callable(L{Element})
+        @return: A stream of completed elements.
+        @rtype: L{Stream}
+        """
+        return Stream(file, depth, accept)
\ No newline at end of file
@@ -50,13 +50,15 @@ class Text(unicode):
     def escape(self):
         """
         Encode (escape) special XML characters.
-        @return: The text with XML special characters escaped.
+        @return: The text with XML special characters escaped
+            (or self when there are none).
         @rtype: L{Text}
         """
         if not self.escaped:
             post = sax.encoder.encode(self)
-            escaped = ( post != self )
-            return Text(post, lang=self.lang, escaped=escaped)
+            if post is self or post == self:
+                return self
+            return Text(post, lang=self.lang, escaped=True)
         return self
     
     def unescape(self):
@@ -0,0 +1,263 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+"""
+The I{snapshot} module provides for compiling a WSDL (and the schemas
+it imports) into a snapshot file that is loaded by L{Client.from_snapshot}
+without downloading or parsing anything.  Only the (resolved) WSDL and
+schema objects are kept.  The XML nodes they were built from are reduced
+to the nodes themselves (and their ancestors) without children or text,
+which is all that is needed to resolve namespace prefixes and read
+attributes at runtime.
+A snapshot file is a header line followed by the pickled objects.
+"""
+
+import os
+import gc
+import suds
+from copy import deepcopy
+from tempfile import mkstemp
+from suds.options import Options
+from suds.properties import Unskin
+from suds.reader import DefinitionsReader
+from suds.transport.https import HttpAuthenticated
+from suds.wsdl import Definitions, View
+from suds.sax.element import Element
+from suds.cache import NoCache
+from logging import getLogger
+try:
+    import cPickle as pickle
+except:
+    import pickle
+
+log = getLogger(__name__)
+
+
+MAGIC = 'suds-snapshot/1'
+
+
+class SnapshotError(Exception):
+    pass
+
+
+class Snapshot:
+    """
+    A compiled WSDL snapshot file.
+    @cvar protocol: The pickling protocol.
+    @type protocol: int
+    @ivar path: The snapshot file path.
+    @type path: str
+    """
+    protocol = 2
+
+    def __init__(self, path):
+        """
+        @param path: The snapshot file path.
+        @type path: str
+        """
+        self.path = path
+
+    def write(self, wsdl):
+        """
+        Write a (stripped) copy of the WSDL object to the snapshot file.
+        The WSDL object is not modified.  The file is written to a
+        temporary file which is renamed so that the snapshot is
+        replaced atomically.
+        @param wsdl: A WSDL object.
+        @type wsdl: L{Definitions}
+        """
+        if isinstance(wsdl, View):
+            wsdl = wsdl.definitions
+        wsdl = Stripper().strip(wsdl)
+        dn = os.path.dirname(os.path.abspath(self.path))
+        fd, tmpfn = mkstemp(prefix='.', dir=dn)
+        try:
+            f = os.fdopen(fd, 'wb')
+            try:
+                f.write(self.header(wsdl.url))
+                pickle.dump(wsdl, f, self.protocol)
+            finally:
+                f.close()
+            os.rename(tmpfn, self.path)
+        except:
+            os.remove(tmpfn)
+            raise
+        log.debug('snapshot of "%s" written to: %s', wsdl.url, self.path)
+
+    def open(self, options):
+        """
+        Load the WSDL object from the snapshot file.
+        @param options: An options object.
+        @type options: L{Options}
+        @return: The WSDL object.
+        @rtype: L{Definitions}
+        @raise SnapshotError: When not a snapshot written by
+            this version of suds.
+        """
+        f = open(self.path, 'rb')
+        try:
+            header = f.readline().split()
+            if header[:2] != [MAGIC, suds.__version__]:
+                raise SnapshotError(
+                    '%s: not a (suds %s) snapshot' % (self.path, suds.__version__))
+            d = self.load(f)
+        finally:
+            f.close()
+        d.options = options
+        for imp in d.imports:
+            imp.imported.options = options
+        return d
+
+    def load(self, f):
+        """
+        Unpickle the WSDL object.  The (cyclic) garbage collector is
+        disabled while loading since none of the many objects created
+        are garbage and each collection would traverse all of them.
+        @param f: The open snapshot file.
+        @type f: file
+        @return: The WSDL object.
+        @rtype: L{Definitions}
+        """
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return pickle.load(f)
+        finally:
+            if enabled:
+                gc.enable()
+
+    def header(self, url):
+        """
+        Get the snapshot file header line.
+        @param url: The WSDL url.
+        @type url: str
+        @return: The header line.
+        @rtype: str
+        """
+        return '%s %s %s\n' % (MAGIC, suds.__version__, url)
+
+    def __str__(self):
+        return self.path
+
+
+class Stripper:
+    """
+    Copies WSDL objects replacing the XML nodes they reference
+    with childless copies.
+    @ivar stripped: The copies by id of the original node.
+    @type stripped: {int:L{Element}}
+    """
+
+    def __init__(self):
+        self.stripped = {}
+
+    def strip(self, wsdl):
+        """
+        Get a copy of the WSDL object (and all of the objects reachable
+        from it) in which the XML nodes are replaced with childless
+        copies.  The WSDL object is not modified.
+        @param wsdl: A WSDL object.
+        @type wsdl: L{Definitions}
+        @return: The stripped copy.
+        @rtype: L{Definitions}
+        """
+        memo = {}
+        visited = set()
+        pending = [wsdl]
+        while pending:
+            x = pending.pop()
+            if id(x) in visited:
+                continue
+            visited.add(id(x))
+            if isinstance(x, Element):
+                memo[id(x)] = self.node(x)
+                continue
+            if isinstance(x, dict):
+                pending.extend(x.values())
+                continue
+            if isinstance(x, (list, tuple)):
+                pending.extend(x)
+                continue
+            if self.skipped(x):
+                continue
+            pending.append(x.__dict__)
+        log.debug('%d nodes kept', len(self.stripped))
+        return deepcopy(wsdl, memo)
+
+    def node(self, node):
+        """
+        Get the childless copy of the specified node.  The (copied)
+        ancestors are kept for namespace prefix resolution.
+        @param node: An XML node.
+        @type node: L{Element}
+        @return: The copy.
+        @rtype: L{Element}
+        """
+        if node is None:
+            return None
+        key = id(node)
+        copy = self.stripped.get(key)
+        if copy is None:
+            copy = Element(node.name, self.node(node.parent))
+            copy.prefix = node.prefix
+            copy.expns = node.expns
+            for a in node.attributes:
+                copy.append(a.clone())
+            for p, u in node.nsprefixes.items():
+                copy.addPrefix(p, u)
+            self.stripped[key] = copy
+        return copy
+
+    def skipped(self, x):
+        """
+        Get whether the object is not searched for XML nodes.
+        Only suds objects (other than options) are searched.
+        @param x: An object.
+        @type x: any
+        @rtype: bool
+        """
+        if isinstance(x, Options):
+            return True
+        if not hasattr(x, '__dict__'):
+            return True
+        module = getattr(x.__class__, '__module__', '')
+        return not module.startswith('suds.')
+
+
+def compile(url, path, **kwargs):
+    """
+    Compile the WSDL at the specified I{url} (and the schemas it
+    imports) into a snapshot file.  The schemas are always fully
+    built (the I{lazy} option is ignored).
+    @param url: The URL for the WSDL.
+    @type url: str
+    @param path: The snapshot file path.
+    @type path: str
+    @param kwargs: keyword arguments.
+    @see: L{Options}
+    @return: The snapshot.
+    @rtype: L{Snapshot}
+    """
+    options = Options()
+    options.transport = HttpAuthenticated()
+    options.cache = NoCache()
+    Unskin(options).update(kwargs)
+    options.lazy = False
+    reader = DefinitionsReader(options, Definitions)
+    wsdl = reader.open(url)
+    snapshot = Snapshot(path)
+    snapshot.write(wsdl)
+    return snapshot
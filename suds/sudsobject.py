@@ -95,13 +95,31 @@ class Factory:
     def subclass(cls, name, bases, dict={}):
         if not isinstance(bases, tuple):
             bases = (bases,)
-        name = name.encode('utf-8')
-        key = '.'.join((name, str(bases)))
+        key = (name, bases)
         subclass = cls.cache.get(key)
         if subclass is None:
-            subclass = classobj(name, bases, dict)
-            cls.cache[key] = subclass
+            subclass = classobj(name.encode('utf-8'), bases, dict)
+            subclass = cls.cache.setdefault(key, subclass)
         return subclass
+
+    @classmethod
+    def typed(cls, name, sxtype):
+        """
+        Generate a subclass of the (named) L{Object} subclass for
+        objects of the specified schema type.  The I{sxtype} is set
+        in the metadata of its instances (when first used) so that
+        the metadata need not be created for each object.  The class
+        is not cached here since it references the schema.
+        @param name: The class name.
+        @type name: str
+        @param sxtype: The schema type.
+        @type sxtype: L{suds.xsd.sxbase.SchemaObject}
+        @return: The generated class.
+        @rtype: classobj
+        """
+        base = cls.subclass(name, Object)
+        return classobj(base.__name__, (base,),
+            dict(__metadata__=LazyMetadata(sxtype=sxtype)))
     
     @classmethod
     def object(cls, classname=None, dict={}):
@@ -124,19 +142,42 @@ class Factory:
         return subclass(value)
 
 
+class LazyMetadata(object):
+    """
+    A (class) descriptor that creates the L{Metadata} of an object
+    when first used.  The metadata is stored in the object which
+    hides the descriptor.
+    @ivar sxtype: An (optional) schema type set in the metadata.
+    @type sxtype: L{suds.xsd.sxbase.SchemaObject}
+    """
+
+    def __init__(self, sxtype=None):
+        self.sxtype = sxtype
+
+    def __get__(self, inst, cls=None):
+        if inst is None:
+            return self
+        md = Metadata()
+        if self.sxtype is not None:
+            md.sxtype = self.sxtype
+        inst.__dict__['__metadata__'] = md
+        return md
+
+
 class Object:
 
+    __metadata__ = LazyMetadata()
+
     def __init__(self):
-        self.__keylist__ = []
-        self.__printer__ = Printer()
-        self.__metadata__ = Metadata()
+        self.__dict__['__keylist__'] = []
 
     def __setattr__(self, name, value):
-        builtin =  name.startswith('__') and name.endswith('__')
-        if not builtin and \
-            name not in self.__keylist__:
-            self.__keylist__.append(name)
-        self.__dict__[name] = value
+        d = self.__dict__
+        if name not in d:
+            builtin =  name.startswith('__') and name.endswith('__')
+            if not builtin:
+                d['__keylist__'].append(name)
+        d[name] = value
         
     def __delattr__(self, name):
         try:
@@ -197,7 +238,7 @@ class Iter:
         keylist = sobject.__keylist__
         try:
             keyset = set(keylist)
-            ordering = sobject.__metadata__.ordering
+            ordering = sobject.__dict__['__metadata__'].ordering
             ordered = set(ordering)
             if not ordered.issuperset(keyset):
                 log.debug(
@@ -214,9 +255,7 @@ class Iter:
 
 
 class Metadata(Object):
-    def __init__(self):
-        self.__keylist__ = []
-        self.__printer__ = Printer()
+    pass
 
 
 class Facade(Object):
@@ -285,7 +324,6 @@ class Printer:
         """ print complex using the specified indent (n) and newline (nl). """
         s = []
         cls = d.__class__
-        md = d.__metadata__
         if d in h:
             s.append('(')
             s.append(cls.__name__)
@@ -299,7 +337,7 @@ class Printer:
         if cls != Object:
             s.append('(')
             if isinstance(d, Facade):
-                s.append(md.facade)
+                s.append(d.__metadata__.facade)
             else:
                 s.append(cls.__name__)
             s.append(')')
@@ -365,7 +403,7 @@ class Printer:
         """ translate (unwrap) using an optional wrapper function """
         nopt = ( lambda x: x )
         try:
-            md = d.__metadata__
+            md = d.__dict__.get('__metadata__')
             pmd = getattr(md, '__print__', None)
             if pmd is None:
                 return item
@@ -379,7 +417,7 @@ class Printer:
     def exclude(self, d, item):
         """ check metadata for excluded items """
         try:
-            md = d.__metadata__
+            md = d.__dict__.get('__metadata__')
             pmd = getattr(md, '__print__', None)
             if pmd is None:
                 return False
@@ -387,4 +425,8 @@ class Printer:
             return ( item[0] in excludes ) 
         except:
             pass
-        return False
\ No newline at end of file
+        return False
+
+
+# The (stateless) printer shared by all objects.
+Object.__printer__ = Printer()
@@ -18,6 +18,12 @@
 Contains transport interface (classes).
 """
 
+from threading import Lock, Event
+from cStringIO import StringIO
+from logging import getLogger
+
+log = getLogger(__name__)
+
 
 class TransportError(Exception):
     def __init__(self, reason, httpcode, fp=None):
@@ -30,8 +36,10 @@ class Request:
     A transport request
     @ivar url: The url for the request.
     @type url: str
-    @ivar message: The message to be sent in a POST request.
-    @type message: str
+    @ivar message: The message to be sent in a POST request.  The
+        message is either a string or an iterable (with len()) of
+        strings that is sent incrementally.
+    @type message: (str|iterable)
     @ivar headers: The http headers to be used for the request.
     @type headers: dict
     """
@@ -41,7 +49,7 @@ class Request:
         @param url: The url for the request.
         @type url: str
         @param message: The (optional) message to be send in the request.
-        @type message: str
+        @type message: (str|iterable)
         """
         self.url = url
         self.headers = {}
@@ -52,10 +60,64 @@ class Request:
         s.append('URL:%s' % self.url)
         s.append('HEADERS: %s' % self.headers)
         s.append('MESSAGE:')
-        s.append(self.message)
+        if isinstance(self.message, basestring):
+            s.append(self.message)
+        else:
+            s.append('<streamed>')
         return '\n'.join(s)
 
 
+class Body:
+    """
+    A file-like object used to read (and send) a request
+    message that is an iterable of strings incrementally.
+    @ivar message: The request message.
+    @type message: iterable
+    """
+
+    def __init__(self, message):
+        """
+        @param message: The request message.
+        @type message: iterable
+        """
+        self.message = message
+        self.seek(0)
+
+    def read(self, size=-1):
+        """
+        Read up to I{size} bytes (or all remaining when negative).
+        @param size: The number of bytes to read.
+        @type size: int
+        @return: The bytes read, empty when exhausted.
+        @rtype: str
+        """
+        if size < 0:
+            data = self.buffer + ''.join(self.blocks)
+            self.buffer = ''
+            return data
+        while len(self.buffer) < size:
+            try:
+                self.buffer += self.blocks.next()
+            except StopIteration:
+                break
+        data = self.buffer[:size]
+        self.buffer = self.buffer[size:]
+        return data
+
+    def seek(self, offset, whence=0):
+        """
+        Rewind so the message can be sent again (such as
+        when a connection is retried).  Only seek(0) is supported.
+        """
+        if offset or whence:
+            raise IOError('only rewind supported')
+        self.blocks = iter(self.message)
+        self.buffer = ''
+
+    def __len__(self):
+        return len(self.message)
+
+
 class Reply:
     """
     A transport reply
@@ -128,3 +190,169 @@ class Transport:
         @raise TransportError: On all transport errors.
         """
         raise Exception('not-implemented')
+
+    def stream(self, request):
+        """
+        Send soap message without reading the reply.  Same as
+        L{send} except that the I{message} of the returned reply is
+        a file-like object from which the reply is read as needed.
+        By default, the reply is read by L{send} and wrapped.
+        @param request: A transport request.
+        @type request: L{Request}
+        @return: The reply
+        @rtype: L{Reply}
+        @raise TransportError: On all transport errors.
+        """
+        reply = self.send(request)
+        if reply is not None:
+            reply.message = StringIO(reply.message)
+        return reply
+
+
+
+class Future:
+    """
+    The pending result of an asynchronous operation.
+    The result (or exception) is set exactly once by the producer.
+    Consumers either wait for it using L{result} or register a
+    callback using L{add_done_callback}.
+    """
+
+    def __init__(self):
+        self.__lock = Lock()
+        self.__event = Event()
+        self.__result = None
+        self.__exc_info = None
+        self.__callbacks = []
+
+    def set_result(self, result):
+        """
+        Set the result and notify waiting consumers.
+        @param result: The result.
+        @type result: any
+        """
+        self.__result = result
+        self.__complete()
+
+    def set_exception(self, exc_info):
+        """
+        Set the exception and notify waiting consumers.
+        @param exc_info: The exception information as
+            returned by I{sys.exc_info()} or an exception.
+        @type exc_info: (tuple|Exception)
+        """
+        if isinstance(exc_info, BaseException):
+            exc_info = (exc_info.__class__, exc_info, None)
+        self.__exc_info = exc_info
+        self.__complete()
+
+    def done(self):
+        """
+        Get whether the operation has completed.
+        @rtype: bool
+        """
+        return self.__event.isSet()
+
+    def result(self, timeout=None):
+        """
+        Get the result, waiting for the operation to complete.
+        An exception set by the producer is raised here.
+        @param timeout: The (optional) number of seconds to wait.
+        @type timeout: float
+        @return: The result.
+        @rtype: any
+        @raise Exception: When the I{timeout} expired.
+        """
+        self.__event.wait(timeout)
+        if not self.done():
+            raise Exception('timeout: %s seconds' % timeout)
+        if self.__exc_info is not None:
+            raise self.__exc_info[0], self.__exc_info[1], self.__exc_info[2]
+        return self.__result
+
+    def exception(self, timeout=None):
+        """
+        Get the exception, waiting for the operation to complete.
+        @param timeout: The (optional) number of seconds to wait.
+        @type timeout: float
+        @return: The exception or None when succeeded.
+        @rtype: Exception
+        """
+        self.__event.wait(timeout)
+        if self.__exc_info is None:
+            return None
+        return self.__exc_info[1]
+
+    def add_done_callback(self, fn):
+        """
+        Add a callback to be called (with this future) once the
+        operation has completed.  The callback is called immediately
+        when the operation has already completed.
+        @param fn: A callable.
+        @type fn: callable
+        """
+        self.__lock.acquire()
+        try:
+            if not self.done():
+                self.__callbacks.append(fn)
+                return
+        finally:
+            self.__lock.release()
+        self.__notify(fn)
+
+    def __complete(self):
+        self.__lock.acquire()
+        try:
+            if self.done():
+                raise Exception('already completed')
+            self.__event.set()
+            callbacks = self.__callbacks
+            self.__callbacks = []
+        finally:
+            self.__lock.release()
+        for fn in callbacks:
+            self.__notify(fn)
+
+    def __notify(self, fn):
+        try:
+            fn(self)
+        except Exception, e:
+            log.exception(e)
+
+
+class AsyncTransport(Transport):
+    """
+    The asynchronous transport I{interface}.
+    The L{aopen} and L{asend} methods return a L{Future} immediately
+    and complete it when the reply has been received so that many
+    requests may be in flight without a thread for each.  The
+    blocking L{open} and L{send} wait for the future so that an
+    asynchronous transport may be used wherever a transport is.
+    """
+
+    def aopen(self, request):
+        """
+        Open the url in the specified request.
+        @param request: A transport request.
+        @type request: L{Request}
+        @return: A future completed with an input stream.
+        @rtype: L{Future}
+        """
+        raise Exception('not-implemented')
+
+    def asend(self, request):
+        """
+        Send soap message.
+        @param request: A transport request.
+        @type request: L{Request}
+        @return: A future completed with the L{Reply} or
+            failed with a L{TransportError}.
+        @rtype: L{Future}
+        """
+        raise Exception('not-implemented')
+
+    def open(self, request):
+        return self.aopen(request).result()
+
+    def send(self, request):
+        return self.asend(request).result()
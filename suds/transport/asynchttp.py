@@ -0,0 +1,548 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+"""
+Contains classes for an asynchronous HTTP transport.
+All requests are multiplexed by a single (asyncore) event loop
+running in a background thread.
+"""
+
+import os
+import sys
+import socket
+import asyncore
+import httplib
+import base64
+import urllib2 as u2
+from time import time
+from threading import Thread, Lock
+from StringIO import StringIO
+from urlparse import urlparse
+from cookielib import CookieJar
+from suds.transport import *
+from suds.properties import Unskin
+from logging import getLogger
+
+try:
+    import ssl
+except ImportError:
+    ssl = None
+
+log = getLogger(__name__)
+
+
+class AsyncHttpTransport(AsyncTransport):
+    """
+    Asynchronous HTTP transport.  Provides for cookies, (http) proxies,
+    https and basic http authentication (when credentials are specified).
+    @ivar cookiejar: The cookie jar.
+    @type cookiejar: I{CookieJar}
+    @ivar loop: The event loop.
+    @type loop: L{Loop}
+    """
+
+    def __init__(self, **kwargs):
+        """
+        @param kwargs: Keyword arguments.
+            - B{proxy} - An http proxy to be specified on requests.
+                 The proxy is defined as {protocol:proxy,}
+                    - type: I{dict}
+                    - default: {}
+            - B{timeout} - Set the url open timeout (seconds).
+                    - type: I{float}
+                    - default: 90
+            - B{username} - The username used for http authentication.
+                    - type: I{str}
+                    - default: None
+            - B{password} - The password used for http authentication.
+                    - type: I{str}
+                    - default: None
+        """
+        AsyncTransport.__init__(self)
+        Unskin(self.options).update(kwargs)
+        self.cookiejar = CookieJar()
+        self.loop = Loop()
+
+    def aopen(self, request):
+        future = Future()
+        def done(pending):
+            try:
+                url, status, reason, headers, body = pending.result()
+                fp = u2.addinfourl(StringIO(body), headers, url)
+                fp.code = status
+                fp.msg = reason
+                if status >= 300:
+                    raise TransportError(reason, status, fp)
+                future.set_result(fp)
+            except:
+                future.set_exception(sys.exc_info())
+        self.submit('GET', request).add_done_callback(done)
+        return future
+
+    def asend(self, request):
+        future = Future()
+        def done(pending):
+            try:
+                url, status, reason, headers, body = pending.result()
+                if status >= 300:
+                    raise TransportError(reason, status, StringIO(body))
+                reply = Reply(status, headers.dict, body)
+                log.debug('received:\n%s', reply)
+                future.set_result(reply)
+            except:
+                future.set_exception(sys.exc_info())
+        log.debug('sending:\n%s', request)
+        self.submit('POST', request).add_done_callback(done)
+        return future
+
+    def submit(self, method, request):
+        """
+        Submit the request to the event loop.
+        @param method: The http method.
+        @type method: str
+        @param request: A transport request.
+        @type request: L{Request}
+        @return: A future completed with the tuple:
+            (url, status, reason, headers, body).
+        @rtype: L{Future}
+        """
+        future = Future()
+        url = request.url
+        headers = dict(self.options.headers)
+        headers.update(request.headers)
+        self.addcredentials(headers)
+        u2request = u2.Request(url, request.message, headers)
+        self.cookiejar.add_cookie_header(u2request)
+        def done(pending):
+            try:
+                result = pending.result()
+                fp = u2.addinfourl(StringIO(), result[3], url)
+                self.cookiejar.extract_cookies(fp, u2request)
+                future.set_result(result)
+            except:
+                future.set_exception(sys.exc_info())
+        channel = Channel(
+            u2request,
+            method,
+            self.proxy(u2request.get_type()),
+            self.options.timeout,
+            self.loop.map)
+        channel.future.add_done_callback(done)
+        self.loop.submit(channel)
+        return future
+
+    def addcredentials(self, headers):
+        """
+        Add the basic http I{Authorization} header when
+        credentials have been specified.
+        @param headers: The http headers.
+        @type headers: dict
+        """
+        credentials = (self.options.username, self.options.password)
+        if not (None in credentials):
+            encoded = base64.encodestring(':'.join(credentials))
+            headers['Authorization'] = 'Basic %s' % encoded[:-1]
+
+    def proxy(self, protocol):
+        """
+        Get the proxy (host, port) for the specified I{protocol}.
+        @param protocol: A protocol (http|https).
+        @type protocol: str
+        @return: The (host, port) or None when not specified.
+        @rtype: tuple
+        """
+        proxy = self.options.proxy.get(protocol)
+        if proxy is None:
+            return None
+        if '://' in proxy:
+            proxy = urlparse(proxy)[1]
+        return split(proxy, 80)
+
+    def __deepcopy__(self, memo={}):
+        clone = self.__class__()
+        p = Unskin(self.options)
+        cp = Unskin(clone.options)
+        cp.update(p)
+        return clone
+
+
+def split(netloc, port):
+    """
+    Split a network location into (host, port).
+    @param netloc: A network location: host[:port].
+    @type netloc: str
+    @param port: The default port.
+    @type port: int
+    @return: (host, port)
+    @rtype: tuple
+    """
+    netloc = netloc.split('@')[-1]
+    host, sep, n = netloc.rpartition(':')
+    if sep and n.isdigit():
+        return (host.strip('[]'), int(n))
+    return (netloc.strip('[]'), port)
+
+
+class Loop:
+    """
+    An asyncore event loop run by a (daemon) thread.
+    The thread is started when a channel is submitted and exits
+    once all channels have completed.  Channels are only registered
+    (and the socket map only changed) by the loop thread.
+    @ivar map: The asyncore socket map.
+    @type map: dict
+    @ivar pending: Submitted channels not yet started.
+    @type pending: [L{Channel},...]
+    """
+
+    interval = 0.5
+
+    def __init__(self):
+        self.map = {}
+        self.pending = []
+        self.lock = Lock()
+        self.thread = None
+        self.waker = None
+        if hasattr(asyncore, 'file_dispatcher'):
+            self.waker = Waker(self.map)
+
+    def submit(self, channel):
+        """
+        Submit a channel to be run by the event loop.
+        @param channel: The channel to run.
+        @type channel: L{Channel}
+        """
+        self.lock.acquire()
+        try:
+            self.pending.append(channel)
+            if self.thread is None:
+                self.thread = Thread(target=self.run, name='suds-async')
+                self.thread.setDaemon(True)
+                self.thread.start()
+            else:
+                self.wake()
+        finally:
+            self.lock.release()
+
+    def run(self):
+        """
+        The main loop.
+        """
+        while True:
+            self.lock.acquire()
+            try:
+                pending = self.pending
+                self.pending = []
+                if not (len(pending) or len(self.channels())):
+                    self.thread = None
+                    return
+            finally:
+                self.lock.release()
+            for channel in pending:
+                channel.start()
+            if self.waker is None:
+                interval = 0.01
+            else:
+                interval = self.interval
+            asyncore.loop(timeout=interval, map=self.map, count=1)
+            now = time()
+            for channel in self.channels():
+                if channel.deadline < now:
+                    channel.fail(socket.timeout('timed out'))
+
+    def channels(self):
+        """
+        Get the running channels.
+        @return: The running channels.
+        @rtype: [L{Channel},...]
+        """
+        return [c for c in self.map.values() if isinstance(c, Channel)]
+
+    def wake(self):
+        """
+        Wake the event loop so submitted channels are started.
+        """
+        if self.waker is not None:
+            self.waker.wake()
+
+
+if hasattr(asyncore, 'file_dispatcher'):
+    class Waker(asyncore.file_dispatcher):
+        """
+        A (pipe) dispatcher used to interrupt the event loop.
+        """
+
+        def __init__(self, map):
+            r, self.w = os.pipe()
+            asyncore.file_dispatcher.__init__(self, r, map)
+
+        def wake(self):
+            os.write(self.w, 'x')
+
+        def writable(self):
+            return False
+
+        def handle_read(self):
+            self.recv(512)
+
+
+class Channel(asyncore.dispatcher):
+    """
+    A single http request/reply exchange.  The connection is closed
+    by the server (I{Connection: close}) once the reply is sent.
+    @ivar future: The future completed with the tuple:
+        (url, status, reason, headers, body).
+    @type future: L{Future}
+    @ivar deadline: The time by which the exchange must complete.
+    @type deadline: float
+    """
+
+    def __init__(self, u2request, method, proxy, timeout, map):
+        """
+        @param u2request: A urllib2 request.
+        @type u2request: I{urllib2.Request}
+        @param method: The http method.
+        @type method: str
+        @param proxy: The proxy (host, port) or None.
+        @type proxy: tuple
+        @param timeout: The timeout (seconds).
+        @type timeout: float
+        @param map: The asyncore socket map.
+        @type map: dict
+        """
+        asyncore.dispatcher.__init__(self, map=map)
+        self.future = Future()
+        self.url = u2request.get_full_url()
+        self.method = method
+        self.tls = ( u2request.get_type() == 'https' )
+        self.host = u2request.get_host()
+        if self.tls:
+            self.address = split(self.host, 443)
+        else:
+            self.address = split(self.host, 80)
+        self.tunnel = None
+        self.state = None
+        selector = u2request.get_selector()
+        if proxy is not None:
+            if self.tls:
+                self.tunnel = self.address
+            else:
+                selector = self.url
+            self.address = proxy
+        self.outbuf = self.request(u2request, selector)
+        self.inbuf = []
+        self.want = None
+        self.deadline = time()+timeout
+
+    def request(self, u2request, selector):
+        """
+        Build the http request.
+        @param u2request: A urllib2 request.
+        @type u2request: I{urllib2.Request}
+        @param selector: The request selector.
+        @type selector: str
+        @return: The request.
+        @rtype: str
+        """
+        data = u2request.get_data()
+        headers = dict(u2request.header_items())
+        headers['Host'] = self.host
+        headers['Connection'] = 'close'
+        headers['Accept-Encoding'] = 'identity'
+        if data is not None:
+            headers['Content-Length'] = str(len(data))
+        s = []
+        s.append('%s %s HTTP/1.1' % (self.method, selector))
+        for h in headers.items():
+            s.append('%s: %s' % (h[0].title(), h[1]))
+        s.append('')
+        s.append('')
+        s = '\r\n'.join(s)
+        if data is not None:
+            s += str(data)
+        return s
+
+    def start(self):
+        """
+        Start the exchange by connecting.
+        """
+        try:
+            self.create_socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.add_channel()
+            self.connect(self.address)
+        except:
+            self.fail(sys.exc_info())
+
+    def create_socket(self, family, type):
+        sock = socket.socket(family, type)
+        sock.setblocking(0)
+        self.socket = sock
+        self._fileno = sock.fileno()
+
+    def handle_connect(self):
+        if self.tunnel is not None:
+            request = self.outbuf
+            self.outbuf = 'CONNECT %s:%d HTTP/1.1\r\n\r\n' % self.tunnel
+            self.state = ('tunnel', request)
+            return
+        if self.tls:
+            self.starttls()
+
+    def starttls(self):
+        """
+        Wrap the socket and begin the (non-blocking) TLS handshake.
+        """
+        host = self.tunnel or self.address
+        if hasattr(ssl, 'create_default_context'):
+            context = ssl.create_default_context()
+            self.socket = context.wrap_socket(
+                self.socket,
+                server_hostname=host[0],
+                do_handshake_on_connect=False)
+        else:
+            self.socket = ssl.wrap_socket(
+                self.socket,
+                do_handshake_on_connect=False)
+        self.want = ssl.SSL_ERROR_WANT_WRITE
+        self.handshake()
+
+    def handshake(self):
+        """
+        Continue the TLS handshake.
+        """
+        try:
+            self.socket.do_handshake()
+            self.want = None
+        except ssl.SSLError, e:
+            if e.args[0] in (ssl.SSL_ERROR_WANT_READ, ssl.SSL_ERROR_WANT_WRITE):
+                self.want = e.args[0]
+            else:
+                raise
+
+    def readable(self):
+        return True
+
+    def writable(self):
+        if self.connecting:
+            return True
+        if self.want is not None:
+            return ( self.want == ssl.SSL_ERROR_WANT_WRITE )
+        return ( len(self.outbuf) > 0 )
+
+    def handle_write(self):
+        if self.want is not None:
+            self.handshake()
+            return
+        try:
+            sent = self.socket.send(self.outbuf)
+            self.outbuf = self.outbuf[sent:]
+        except socket.error, e:
+            if not self.retry(e):
+                raise
+
+    def handle_read(self):
+        if self.want is not None:
+            self.handshake()
+            return
+        while True:
+            try:
+                data = self.socket.recv(65536)
+            except socket.error, e:
+                if self.retry(e):
+                    return
+                raise
+            if not data:
+                self.handle_close()
+                return
+            self.inbuf.append(data)
+            if self.state is not None:
+                self.tunneled()
+                return
+            if not (self.tls and self.socket.pending()):
+                return
+
+    def tunneled(self):
+        """
+        Process the proxy reply to the I{CONNECT} request.
+        """
+        reply = ''.join(self.inbuf)
+        if '\r\n\r\n' not in reply:
+            return
+        status = reply.split(None, 2)[1]
+        if status != '200':
+            raise TransportError('proxy CONNECT failed: %s' % status, int(status))
+        self.outbuf = self.state[1]
+        self.state = None
+        self.inbuf = []
+        self.tunnel = None
+        self.starttls()
+
+    def retry(self, e):
+        """
+        Get whether the socket error indicates the operation
+        should be retried once the socket is ready.
+        @param e: A socket error.
+        @type e: socket.error
+        @rtype: bool
+        """
+        if ssl is not None and isinstance(e, ssl.SSLError):
+            return e.args[0] in (ssl.SSL_ERROR_WANT_READ, ssl.SSL_ERROR_WANT_WRITE)
+        return e.args[0] in (asyncore.EWOULDBLOCK, asyncore.EAGAIN)
+
+    def handle_close(self):
+        self.close()
+        if self.future.done():
+            return
+        try:
+            self.future.set_result(self.reply())
+        except:
+            self.future.set_exception(sys.exc_info())
+
+    def handle_error(self):
+        self.fail(sys.exc_info())
+
+    def fail(self, exc_info):
+        """
+        Fail the exchange.
+        @param exc_info: The exception information or exception.
+        @type exc_info: (tuple|Exception)
+        """
+        self.close()
+        if not self.future.done():
+            self.future.set_exception(exc_info)
+
+    def reply(self):
+        """
+        Parse the received http reply.
+        @return: (url, status, reason, headers, body)
+        @rtype: tuple
+        """
+        response = httplib.HTTPResponse(Buffer(''.join(self.inbuf)), method=self.method)
+        response.begin()
+        body = response.read()
+        return (self.url, response.status, response.reason, response.msg, body)
+
+
+class Buffer:
+    """
+    A (fake) socket used to parse a received http reply.
+    """
+
+    def __init__(self, data):
+        self.data = data
+
+    def makefile(self, *args, **kwargs):
+        return StringIO(self.data)
@@ -22,6 +22,7 @@ import urllib2 as u2
 import base64
 import socket
 from suds.transport import *
+from suds.transport.pool import *
 from suds.properties import Unskin
 from urlparse import urlparse
 from cookielib import CookieJar
@@ -46,38 +47,60 @@ class HttpTransport(Transport):
             - B{timeout} - Set the url open timeout (seconds).
                     - type: I{float}
                     - default: 90
+            - B{keepalive} - Keep http connections open and reuse them.
+                    - type: I{bool}
+                    - default: False
+            - B{poolsize} - The maximum number of idle connections.
+                    - type: I{int}
+                    - default: 10
+            - B{idletimeout} - Seconds an idle connection is kept open.
+                    - type: I{float}
+                    - default: 60
+            - B{maxrequests} - Requests sent on a connection before
+                it is closed.
+                    - type: I{int}
+                    - default: 100
         """
         Transport.__init__(self)
         Unskin(self.options).update(kwargs)
         self.cookiejar = CookieJar()
-        self.proxy = {}
+        self.pool = ConnectionPool(self.options)
         self.urlopener = None
         
     def open(self, request):
         try:
             url = request.url
             log.debug('opening (%s)', url)
-            u2request = u2.Request(url)
-            self.proxy = self.options.proxy
+            u2request = u2.Request(url, None, request.headers)
             return self.u2open(u2request)
         except u2.HTTPError, e:
             raise TransportError(str(e), e.code, e.fp)
 
     def send(self, request):
+        result = self.__send(request)
+        if result is not None:
+            result.message = result.message.read()
+            log.debug('received:\n%s', result)
+        return result
+
+    def stream(self, request):
+        return self.__send(request)
+
+    def __send(self, request):
         result = None
         url = request.url
         msg = request.message
         headers = request.headers
+        if not (msg is None or isinstance(msg, basestring)):
+            msg = Body(msg)
         try:
-            u2request = u2.Request(url, msg, headers)
+            u2request = U2Request(url, msg, headers)
             self.addcookies(u2request)
-            self.proxy = self.options.proxy
             request.headers.update(u2request.headers)
             log.debug('sending:\n%s', request)
             fp = self.u2open(u2request)
             self.getcookies(fp, u2request)
-            result = Reply(200, fp.headers.dict, fp.read())
-            log.debug('received:\n%s', result)
+            result = Reply(200, fp.headers.dict, fp)
         except u2.HTTPError, e:
             if e.code in (202,204):
                 result = None
@@ -135,7 +158,11 @@ class HttpTransport(Transport):
         @rtype: [Handler,...]
         """
         handlers = []
-        handlers.append(u2.ProxyHandler(self.proxy))
+        handlers.append(u2.ProxyHandler(self.options.proxy))
+        if self.options.keepalive:
+            handlers.append(KeepAliveHandler(self.pool))
+            if hasattr(u2, 'HTTPSHandler'):
+                handlers.append(KeepAliveSSLHandler(self.pool))
         return handlers
             
     def u2ver(self):
@@ -160,6 +187,20 @@ class HttpTransport(Transport):
         return clone
 
 
+class U2Request(u2.Request):
+    """
+    A urllib2 request that rewinds a (streamed) message L{Body} each
+    time the request is sent.  The urllib2 handlers send the same request
+    again, as when credentials are sent after an authentication challenge.
+    """
+
+    def get_data(self):
+        data = u2.Request.get_data(self)
+        if hasattr(data, 'seek'):
+            data.seek(0)
+        return data
+
+
 class HttpAuthenticated(HttpTransport):
     """
     Provides basic http authentication for servers that don't follow
@@ -175,6 +216,10 @@ class HttpAuthenticated(HttpTransport):
     def send(self, request):
         self.addcredentials(request)
         return HttpTransport.send(self, request)
+
+    def stream(self, request):
+        self.addcredentials(request)
+        return HttpTransport.stream(self, request)
     
     def addcredentials(self, request):
         credentials = self.credentials()
@@ -44,6 +44,22 @@ class Options(Skin):
         - B{password} - The password used for http authentication.
                 - type: I{str}
                 - default: None
+        - B{keepalive} - Keep http connections open and reuse them
+            for subsequent requests to the same host.
+                - type: I{bool}
+                - default: False
+        - B{poolsize} - The maximum number of idle (keep-alive)
+            connections held open.
+                - type: I{int}
+                - default: 10
+        - B{idletimeout} - The number of seconds an idle (keep-alive)
+            connection is kept open.
+                - type: I{float}
+                - default: 60
+        - B{maxrequests} - The maximum number of requests sent on
+            a (keep-alive) connection before it is closed.
+                - type: I{int}
+                - default: 100
     """    
     def __init__(self, **kwargs):
         domain = __name__
@@ -53,5 +69,9 @@ class Options(Skin):
             Definition('headers', dict, {}),
             Definition('username', basestring, None),
             Definition('password', basestring, None),
+            Definition('keepalive', bool, False),
+            Definition('poolsize', int, 10),
+            Definition('idletimeout', (int,float), 60),
+            Definition('maxrequests', int, 100),
         ]
         Skin.__init__(self, domain, definitions, kwargs)
\ No newline at end of file
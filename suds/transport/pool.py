@@ -0,0 +1,406 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+"""
+Contains classes for persistent (keep-alive) http connections.
+"""
+
+import urllib2 as u2
+import httplib
+import socket
+from select import select
+from time import time
+from threading import Lock
+from logging import getLogger
+
+log = getLogger(__name__)
+
+
+class ConnectionPool:
+    """
+    A thread-safe pool of idle (keep-alive) http connections keyed
+    by (scheme, host, tunnel host).  The limits are read from the
+    transport options each time they are needed so they may be
+    changed after the transport has been created.
+    @ivar options: The transport options.
+    @type options: L{suds.transport.options.Options}
+    @ivar idle: The idle connections by key.
+    @type idle: {key: [L{Entry},...]}
+    """
+
+    def __init__(self, options):
+        """
+        @param options: The transport options.
+        @type options: L{suds.transport.options.Options}
+        """
+        self.options = options
+        self.idle = {}
+        self.lock = Lock()
+
+    def get(self, key):
+        """
+        Get an idle connection for the specified I{key}.  Connections
+        that have been idle longer than the I{idletimeout} or that have
+        been L{Entry.dropped} are closed and discarded.
+        @param key: A connection key.
+        @type key: tuple
+        @return: An idle pool entry or None when none are available.
+        @rtype: L{Entry}
+        """
+        expired = []
+        found = None
+        self.lock.acquire()
+        try:
+            entries = self.idle.get(key, [])
+            while len(entries):
+                entry = entries.pop()
+                if entry.expired(self.options.idletimeout) or entry.dropped():
+                    expired.append(entry)
+                    continue
+                found = entry
+                break
+        finally:
+            self.lock.release()
+        for entry in expired:
+            entry.close()
+        return found
+
+    def put(self, key, entry):
+        """
+        Return a connection to the pool.  The connection is closed
+        instead when it has served I{maxrequests} requests or when the
+        pool already holds I{poolsize} idle connections.
+        @param key: A connection key.
+        @type key: tuple
+        @param entry: A pool entry.
+        @type entry: L{Entry}
+        """
+        if entry.count >= self.options.maxrequests:
+            entry.close()
+            return
+        self.lock.acquire()
+        try:
+            if self.size() < self.options.poolsize:
+                entry.used = time()
+                self.idle.setdefault(key, []).append(entry)
+                return
+        finally:
+            self.lock.release()
+        entry.close()
+
+    def size(self):
+        """
+        Get the number of idle connections.
+        @return: The number of idle connections.
+        @rtype: int
+        """
+        n = 0
+        for entries in self.idle.values():
+            n += len(entries)
+        return n
+
+    def clear(self):
+        """
+        Close and discard all idle connections.
+        """
+        self.lock.acquire()
+        try:
+            idle = self.idle
+            self.idle = {}
+        finally:
+            self.lock.release()
+        for entries in idle.values():
+            for entry in entries:
+                entry.close()
+
+    def __len__(self):
+        return self.size()
+
+
+class Entry:
+    """
+    A pooled connection.
+    @ivar connection: The http connection.
+    @type connection: I{httplib.HTTPConnection}
+    @ivar count: The number of requests sent on the connection.
+    @type count: int
+    @ivar used: The time the connection was last returned to the pool.
+    @type used: float
+    """
+
+    def __init__(self, connection):
+        """
+        @param connection: The http connection.
+        @type connection: I{httplib.HTTPConnection}
+        """
+        self.connection = connection
+        self.count = 0
+        self.used = time()
+
+    def expired(self, timeout):
+        """
+        Get whether the connection has been idle longer than I{timeout}.
+        @param timeout: The idle timeout (seconds).
+        @type timeout: (int|float)
+        @rtype: bool
+        """
+        return ( time()-self.used > timeout )
+
+    def dropped(self):
+        """
+        Get whether the (idle) connection can no longer be used.  An idle
+        connection is readable only when the server has closed it (or
+        sent something unexpected).
+        @rtype: bool
+        """
+        sock = self.connection.sock
+        if sock is None:
+            return False
+        try:
+            readable = select([sock], [], [], 0)[0]
+            return bool(readable)
+        except Exception:
+            return True
+
+    def close(self):
+        """
+        Close the connection.
+        """
+        try:
+            self.connection.close()
+        except Exception, e:
+            log.debug(e)
+
+
+class KeepAlive:
+    """
+    The keep-alive urllib2 handler mixin.  Connections are taken
+    from the pool when available and returned to the pool once the
+    reply (L{Response}) has been completely read or closed so the reply
+    may be streamed.  A request that cannot be sent on a reused
+    connection (that the server has closed in the meantime) is sent
+    again on a new connection.  Requests are never sent again once
+    sent since the server may have processed them.
+    @ivar pool: The connection pool.
+    @type pool: L{ConnectionPool}
+    """
+
+    def __init__(self, pool):
+        """
+        @param pool: The connection pool.
+        @type pool: L{ConnectionPool}
+        """
+        self.pool = pool
+
+    def do_open(self, http_class, req, **kwargs):
+        key = (req.get_type(), req.get_host(), req._tunnel_host)
+        headers = self.headers(req)
+        tunnel = {}
+        if req._tunnel_host:
+            tunnel = self.tunnel(headers)
+        entry = self.pool.get(key)
+        if entry is not None:
+            try:
+                self.send(entry, req, headers)
+            except socket.timeout, e:
+                entry.close()
+                raise u2.URLError(e)
+            except (socket.error, httplib.HTTPException), e:
+                log.debug('reused connection failed: %s, retrying', e)
+                entry.close()
+                entry = None
+        try:
+            if entry is None:
+                connection = http_class(req.get_host(), timeout=req.timeout, **kwargs)
+                connection.set_debuglevel(self._debuglevel)
+                if req._tunnel_host:
+                    connection.set_tunnel(req._tunnel_host, headers=tunnel)
+                entry = Entry(connection)
+                self.send(entry, req, headers)
+            return self.reply(key, entry, req)
+        except (socket.error, httplib.HTTPException), e:
+            entry.close()
+            raise u2.URLError(e)
+
+    def send(self, entry, req, headers):
+        """
+        Send the request on the connection in the pool I{entry}.
+        @param entry: A pool entry.
+        @type entry: L{Entry}
+        @param req: A urllib2 request.
+        @type req: I{urllib2.Request}
+        @param headers: The http headers.
+        @type headers: dict
+        """
+        connection = entry.connection
+        connection.timeout = req.timeout
+        if connection.sock is not None:
+            connection.sock.settimeout(req.timeout)
+        if hasattr(req.data, 'seek'):
+            req.data.seek(0)
+        connection.request(req.get_method(), req.get_selector(), req.data, headers)
+        entry.count += 1
+
+    def reply(self, key, entry, req):
+        """
+        Get the reply to the request sent on the connection in the
+        pool I{entry}.  The connection is released by the reply L{Response}.
+        @param key: The connection key.
+        @type key: tuple
+        @param entry: A pool entry.
+        @type entry: L{Entry}
+        @param req: A urllib2 request.
+        @type req: I{urllib2.Request}
+        @return: The reply.
+        @rtype: I{urllib2.addinfourl}
+        """
+        r = entry.connection.getresponse()
+        body = Response(self.pool, key, entry, r)
+        fp = socket._fileobject(body, close=True)
+        reply = u2.addinfourl(fp, r.msg, req.get_full_url())
+        reply.code = r.status
+        reply.msg = r.reason
+        return reply
+
+    def headers(self, req):
+        """
+        Get the http headers for the request (as urllib2 does) but
+        requesting that the connection be kept open.
+        @param req: A urllib2 request.
+        @type req: I{urllib2.Request}
+        @return: The headers.
+        @rtype: dict
+        """
+        headers = dict(req.unredirected_hdrs)
+        for k,v in req.headers.items():
+            if k not in headers:
+                headers[k] = v
+        headers['Connection'] = 'keep-alive'
+        return dict([(k.title(), v) for k,v in headers.items()])
+
+    def tunnel(self, headers):
+        """
+        Move the proxy authorization header (when specified)
+        from the request I{headers} into the tunnel headers.
+        @param headers: The http headers.
+        @type headers: dict
+        @return: The tunnel headers.
+        @rtype: dict
+        """
+        tunnel = {}
+        auth = 'Proxy-Authorization'
+        if auth in headers:
+            tunnel[auth] = headers.pop(auth)
+        return tunnel
+
+
+class Response:
+    """
+    The (file-like) body of a reply received on a pooled connection.
+    The connection is returned to the pool once the body has been
+    completely read (or closed).  A body closed before it has been
+    completely read leaves unread data on the connection so the
+    connection is closed instead.
+    @ivar pool: The connection pool.
+    @type pool: L{ConnectionPool}
+    @ivar key: The connection key.
+    @type key: tuple
+    @ivar entry: The pool entry (None once released).
+    @type entry: L{Entry}
+    @ivar response: The http response.
+    @type response: I{httplib.HTTPResponse}
+    """
+
+    def __init__(self, pool, key, entry, response):
+        """
+        @param pool: The connection pool.
+        @type pool: L{ConnectionPool}
+        @param key: The connection key.
+        @type key: tuple
+        @param entry: The pool entry.
+        @type entry: L{Entry}
+        @param response: The http response.
+        @type response: I{httplib.HTTPResponse}
+        """
+        self.pool = pool
+        self.key = key
+        self.entry = entry
+        self.response = response
+
+    def read(self, amt=None):
+        """
+        Read (up to I{amt} bytes of) the body.
+        @param amt: The maximum number of bytes.
+        @type amt: int
+        @return: The data read.
+        @rtype: str
+        """
+        try:
+            data = self.response.read(amt)
+        except:
+            self.release(False)
+            raise
+        if self.response.isclosed():
+            self.release(True)
+        return data
+
+    recv = read
+
+    def close(self):
+        """
+        Close the body and release the connection.
+        """
+        done = ( self.response.isclosed() or self.response.length == 0 )
+        self.response.close()
+        self.release(done)
+
+    def release(self, done):
+        """
+        Release the connection.  The connection is returned to the pool
+        when the body has been completely read and the server has not
+        indicated that it will close the connection.
+        @param done: The body has been completely read.
+        @type done: bool
+        """
+        entry = self.entry
+        if entry is None:
+            return
+        self.entry = None
+        if done and not self.response.will_close:
+            self.pool.put(self.key, entry)
+        else:
+            entry.close()
+
+
+class KeepAliveHandler(KeepAlive, u2.HTTPHandler):
+    """
+    The keep-alive I{http} handler.
+    """
+
+    def __init__(self, pool):
+        u2.HTTPHandler.__init__(self)
+        KeepAlive.__init__(self, pool)
+
+
+if hasattr(u2, 'HTTPSHandler'):
+    class KeepAliveSSLHandler(KeepAlive, u2.HTTPSHandler):
+        """
+        The keep-alive I{https} handler.
+        """
+
+        def __init__(self, pool):
+            u2.HTTPSHandler.__init__(self)
+            KeepAlive.__init__(self, pool)
@@ -34,7 +34,13 @@ class Core:
     """
     The abstract XML I{node} unmarshaller.  This class provides the
     I{core} unmarshalling functionality.
+    @cvar native: Indicates that plain python dictionaries and (unicode)
+        strings are built instead of suds objects and L{Text}.  Other
+        values (such as dates and mixed content) are unchanged.
+    @type native: boolean
     """
+    
+    native = False
         
     def process(self, content):
         """
@@ -79,12 +85,15 @@ class Core:
         @rtype: I{any}
         """
         node = content.node
-        if len(node.children) and node.hasText():
+        if len(node) and node.hasText():
             return node
         attributes = AttrList(node.attributes)
         if attributes.rlen() and \
-            not len(node.children) and \
+            not len(node) and \
             node.hasText():
+                if self.native:
+                    content.data['value'] = self.plain(node.getText())
+                    return content.data
                 p = Factory.property(node.name, node.getText())
                 return merge(content.data, p)
         if len(content.data):
@@ -92,12 +101,14 @@ class Core:
         lang = attributes.lang()
         if content.node.isnil():
             return None
-        if not len(node.children) and content.text is None:
+        if not len(node) and content.text is None:
             if self.nillable(content):
                 return None
             else:
-                return Text('', lang=lang)
+                return self.plain(Text('', lang=lang))
         if isinstance(content.text, basestring):
+            if self.native:
+                return self.plain(content.text)
             return Text(content.text, lang=lang)
         else:
             return content.text
@@ -127,7 +138,7 @@ class Core:
         """
         key = name
         key = '_%s' % reserved.get(key, key)
-        setattr(content.data, key, value)
+        self.setvalue(content.data, key, self.plain(value))
             
     def append_children(self, content):
         """
@@ -136,23 +147,35 @@ class Core:
         @type content: L{Content}
         """
         for child in content.node:
-            cont = Content(child)
-            cval = self.append(cont)
-            key = reserved.get(child.name, child.name)
-            if key in content.data:
-                v = getattr(content.data, key)
-                if isinstance(v, list):
-                    v.append(cval)
-                else:
-                    setattr(content.data, key, [v, cval])
-                continue
-            if self.unbounded(cont):
-                if cval is None:
-                    setattr(content.data, key, [])
-                else:
-                    setattr(content.data, key, [cval,])
+            self.append_child(content, child)
+            
+    def append_child(self, content, child, type=None):
+        """
+        Append a child node into L{Content.data}
+        @param content: The current content being unmarshalled.
+        @type content: L{Content}
+        @param child: A child node.
+        @type child: L{sax.element.Element}
+        @param type: The (already found) schema type of the child node.
+        @type type: L{xsd.sxbase.SchemaObject}
+        """
+        cont = Content(child, type=type)
+        cval = self.append(cont)
+        key = reserved.get(child.name, child.name)
+        if key in content.data:
+            v = self.getvalue(content.data, key)
+            if isinstance(v, list):
+                v.append(cval)
             else:
-                setattr(content.data, key, cval)
+                self.setvalue(content.data, key, [v, cval])
+            return
+        if self.unbounded(cont):
+            if cval is None:
+                self.setvalue(content.data, key, [])
+            else:
+                self.setvalue(content.data, key, [cval,])
+        else:
+            self.setvalue(content.data, key, cval)
     
     def append_text(self, content):
         """
@@ -175,7 +198,62 @@ class Core:
         @return: A subclass of Object.
         @rtype: L{Object}
         """
-        content.data = Factory.object(content.node.name)
+        content.data = self.newobject(content.node.name)
+    
+    def newobject(self, name):
+        """
+        Create an (empty) object: a dictionary when I{native}.
+        @param name: The object (class) name.
+        @type name: str
+        @return: The new object.
+        @rtype: (L{Object}|dict)
+        """
+        if self.native:
+            return {}
+        return Factory.object(name)
+    
+    def getvalue(self, data, key, default=None):
+        """
+        Get the value of I{key} in an object (or dictionary).
+        @param data: An object (or dictionary).
+        @type data: (L{Object}|dict)
+        @param key: The attribute name.
+        @type key: str
+        @param default: The value returned when not found.
+        @type default: any
+        @return: The value, else I{default}.
+        @rtype: any
+        """
+        if isinstance(data, dict):
+            return data.get(key, default)
+        return getattr(data, key, default)
+    
+    def setvalue(self, data, key, value):
+        """
+        Set the value of I{key} in an object (or dictionary).
+        @param data: An object (or dictionary).
+        @type data: (L{Object}|dict)
+        @param key: The attribute name.
+        @type key: str
+        @param value: The value.
+        @type value: any
+        """
+        if isinstance(data, dict):
+            data[key] = value
+        else:
+            setattr(data, key, value)
+    
+    def plain(self, value):
+        """
+        Get the plain (unicode) string for L{Text} when I{native}.
+        @param value: A value.
+        @type value: any
+        @return: The plain string, else I{value}.
+        @rtype: any
+        """
+        if self.native and isinstance(value, Text):
+            return unicode(value)
+        return value
     
     def end(self, content):
         """
@@ -121,7 +121,10 @@ class Encoded(Typed):
         @param content: An array content.
         @type content: L{Content}
         """
-        for n,v in content.data:
+        data = content.data
+        if isinstance(data, dict):
+            data = data.items()
+        for n,v in data:
             if isinstance(v, list):
                 content.data = v
                 return
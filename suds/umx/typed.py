@@ -19,11 +19,17 @@ Provides typed unmarshaller classes.
 """
 
 from logging import getLogger
+from array import array
 from suds import *
 from suds.umx import *
-from suds.umx.core import Core
+from suds.umx.core import Core, reserved
 from suds.resolver import NodeResolver, Frame
-from suds.sudsobject import Factory
+from suds.sudsobject import Factory, Object
+from suds.sax.text import Text
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 log = getLogger(__name__)
 
@@ -42,14 +48,41 @@ class Typed(Core):
     A I{typed} XML unmarshaller
     @ivar resolver: A schema type resolver.
     @type resolver: L{NodeResolver}
+    @ivar plan: An (optional) plan used to record schema lookups.
+    @type plan: L{suds.plan.Plan}
+    @ivar arrays: The kind of array (array|numpy) used for lists
+        of numeric builtin values, else None.
+    @type arrays: str
+    @ivar native: Indicates that plain python dictionaries and (unicode)
+        strings are built instead of suds objects and L{Text}.
+    @type native: boolean
+    @ivar columnar: Indicates that runs of (unbounded) complex child
+        nodes are processed into L{columns} when possible.
+    @type columnar: boolean
     """
     
-    def __init__(self, schema):
+    def __init__(self, schema, plan=None, arrays=None, native=False,
+                 columnar=False):
         """
         @param schema: A schema object.
         @type schema: L{xsd.schema.Schema}
+        @param plan: An (optional) plan used to record schema lookups.
+        @type plan: L{suds.plan.Plan}
+        @param arrays: The kind of array (array|numpy) used for lists
+            of numeric builtin values, else None.
+        @type arrays: str
+        @param native: Indicates that plain python dictionaries and
+            (unicode) strings are built.
+        @type native: boolean
+        @param columnar: Indicates that runs of (unbounded) complex
+            child nodes are processed into columns when possible.
+        @type columnar: boolean
         """
-        self.resolver = NodeResolver(schema)
+        self.plan = plan
+        self.arrays = arrays
+        self.native = native
+        self.columnar = columnar
+        self.resolver = NodeResolver(schema, plan)
         
     def process(self, node, type):
         """
@@ -64,6 +97,138 @@ class Typed(Core):
         content = Content(node)
         content.type = type
         return Core.process(self, content)
+    
+    def processall(self, nodes, type):
+        """
+        Process a list of xml L{nodes} of the same schema type.  When
+        the nodes are simple and the type is builtin, the values are
+        translated in one batch.
+        @param nodes: A list of XML trees.
+        @type nodes: [L{sax.element.Element},...]
+        @param type: The schema type.
+        @type type: L{xsd.sxbase.SchemaObject}
+        @return: A list of suds objects (or an array).
+        @rtype: [L{Object},...]
+        """
+        self.reset()
+        real = self.resolver.resolve(type)
+        if real.builtin():
+            for node in nodes:
+                if not self.simple(node):
+                    break
+            else:
+                values = self.translateall(self.texts(nodes), type, real)
+                return self.packed(values, real)
+        return [self.process(node, type) for node in nodes]
+    
+    def columns(self, nodes, type):
+        """
+        Process a list of xml L{nodes} of the same (complex) schema type
+        into columns.  Each column is the list of translated values of
+        a child in schema order, None where the child is missing.  Only
+        types that have (bounded) children of builtin types and no
+        attributes can be processed into columns.  The columns are
+        stored in arrays as specified by I{arrays}.
+        @param nodes: A list of XML trees.
+        @type nodes: [L{sax.element.Element},...]
+        @param type: The schema type.
+        @type type: L{xsd.sxbase.SchemaObject}
+        @return: An object with an attribute for each column, else
+            None when the type or a node cannot be processed
+            into columns.
+        @rtype: L{Object}
+        """
+        self.reset()
+        real = self.resolver.resolve(type)
+        return self.tabulate(nodes, type, real)
+    
+    def tabulate(self, nodes, type, real):
+        """
+        Process a list of xml L{nodes} of the same (complex) schema type
+        into columns as described for L{columns}.  The resolver is used
+        in its current state (not reset).
+        @param nodes: A list of XML trees.
+        @type nodes: [L{sax.element.Element},...]
+        @param type: The schema type.
+        @type type: L{xsd.sxbase.SchemaObject}
+        @param real: The resolved schema type.
+        @type real: L{xsd.sxbase.SchemaObject}
+        @return: An object with an attribute for each column, else
+            None when the type or a node cannot be processed
+            into columns.
+        @rtype: L{Object}
+        """
+        fields = self.getfields(real)
+        if fields is None:
+            return None
+        index = {}
+        for i, (child, childreal) in enumerate(fields):
+            index[child.name] = i
+        missing = object()
+        rows = [[] for f in fields]
+        for node in nodes:
+            if node.attributes:
+                return None
+            row = [missing]*len(fields)
+            for child in node.children:
+                i = index.get(child.name)
+                if i is None or \
+                    row[i] is not missing or \
+                    not self.simple(child):
+                        return None
+                row[i] = child.text or None
+            for i, text in enumerate(row):
+                if text is missing:
+                    text = None
+                rows[i].append(text)
+        name = real.name
+        if name is None:
+            name = type.name
+        result = self.newobject(name)
+        for (child, childreal), texts in zip(fields, rows):
+            values = self.translateall(texts, child, childreal)
+            key = reserved.get(child.name, child.name)
+            self.setvalue(result, key, self.packed(values, childreal))
+        return result
+    
+    def getfields(self, type):
+        """
+        Get the L{fields} of a complex schema type (recorded in
+        the plan).
+        @param type: A (resolved) schema type.
+        @type type: L{xsd.sxbase.SchemaObject}
+        @return: The fields, else None.
+        @rtype: [(L{xsd.sxbase.SchemaObject}, L{xsd.sxbase.XBuiltin}),...]
+        """
+        if self.plan is None:
+            return self.fields(type)
+        return self.plan.lookup('fields', type, self.fields, type)
+    
+    def fields(self, type):
+        """
+        Get the fields (columns) of a complex schema type.
+        @param type: A (resolved) schema type.
+        @type type: L{xsd.sxbase.SchemaObject}
+        @return: A list of (child, real) for each child in schema
+            order, else None when the type has attributes or a child
+            that is unbounded or not of a builtin type.
+        @rtype: [(L{xsd.sxbase.SchemaObject}, L{xsd.sxbase.XBuiltin}),...]
+        """
+        if type.builtin():
+            return None
+        result = []
+        for child, ancestry in type:
+            if child.isattr() or child.name is None:
+                return None
+            if child.unbounded():
+                return None
+            childreal = self.resolver.resolve(child)
+            if not childreal.builtin():
+                return None
+            result.append((child, childreal))
+        if not len(result):
+            return None
+        return result
 
     def reset(self):
         log.debug('reset')
@@ -81,6 +246,8 @@ class Typed(Core):
             content.type = found
         else:
             known = self.resolver.known(content.node)
+            if known is None:
+                known = self.resolver.resolve(content.type)
             frame = Frame(content.type, resolved=known)
             self.resolver.push(frame)
         real = self.resolver.top().resolved
@@ -88,18 +255,232 @@ class Typed(Core):
         cls_name = real.name
         if cls_name is None:
             cls_name = content.node.name
-        content.data = Factory.object(cls_name)
-        md = content.data.__metadata__
-        md.sxtype = real
+        if self.native:
+            content.data = {}
+            if self.plan is not None:
+                self.plan.nodes += 1
+        elif self.plan is None:
+            content.data = Factory.subclass(cls_name, Object)()
+            md = content.data.__metadata__
+            md.sxtype = real
+        else:
+            content.data = self.subclass(cls_name, real)()
+            self.plan.nodes += 1
+
+    def subclass(self, name, sxtype):
+        """
+        Get the (generated) L{Object} subclass for the specified name
+        and schema type.  Instances get the I{sxtype} metadata when
+        the metadata is first used.  The class is recorded in the plan.
+        @param name: The class name.
+        @type name: str
+        @param sxtype: The schema type.
+        @type sxtype: L{SchemaObject}
+        @return: The class.
+        @rtype: classobj
+        """
+        key = (name, sxtype)
+        return self.plan.lookup('class', key, Factory.typed, name, sxtype)
         
     def end(self, content):
         self.resolver.pop()
+    
+    def append_children(self, content):
+        """
+        Append child nodes into L{Content.data}.
+        Runs of simple child nodes of an unbounded builtin type are
+        translated in one batch rather than unmarshalled one at a time.
+        When I{columnar}, runs of child nodes of an unbounded complex
+        type are processed into L{columns} (as an I{ArrayOf} wrapper
+        would be) when possible.
+        @param content: The current content being unmarshalled.
+        @type content: L{Content}
+        """
+        children = content.node.children
+        batched = {}
+        i = 0
+        while i < len(children):
+            child = children[i]
+            type, real, end = self.run(children, i)
+            if end is None:
+                self.append_child(content, child, type)
+                i += 1
+                continue
+            key = reserved.get(child.name, child.name)
+            if not real.builtin():
+                value = None
+                if key not in content.data:
+                    value = self.tabulate(children[i:end], type, real)
+                if value is None:
+                    for child in children[i:end]:
+                        self.append_child(content, child, type)
+                else:
+                    self.setvalue(content.data, key, value)
+                i = end
+                continue
+            texts = self.texts(children[i:end])
+            values = self.translateall(texts, type, real)
+            self.extend(content, key, values)
+            batched[key] = real
+            i = end
+        for key, real in batched.items():
+            values = self.getvalue(content.data, key)
+            self.setvalue(content.data, key, self.packed(values, real))
+    
+    def run(self, nodes, i):
+        """
+        Find the run of simple nodes of an unbounded builtin type that
+        starts at the specified index.  The run ends at the first node
+        with a different name or that is not simple.  When I{columnar},
+        the run of nodes of an unbounded complex type that has L{fields}
+        is also found.  It ends at the first node with a different name.
+        @param nodes: A list of sibling nodes.
+        @type nodes: [L{sax.element.Element},...]
+        @param i: The index of the first node.
+        @type i: int
+        @return: A tuple of (type, real, end) where I{end} is the index
+            following the last node in the run.  When there is no run,
+            I{end} is None and I{type} is the type of the node (so it is
+            not found again) when it has been found, else None.
+        @rtype: tuple
+        """
+        node = nodes[i]
+        simple = self.simple(node)
+        if not (simple or self.columnar):
+            return (None, None, None)
+        type = self.resolver.find(node, push=False)
+        if type is None or not type.unbounded():
+            return (type, None, None)
+        real = self.resolver.resolve(type)
+        if real.builtin():
+            if not simple:
+                return (type, real, None)
+            match = self.simple
+        else:
+            if not self.columnar or self.getfields(real) is None:
+                return (type, real, None)
+            match = lambda n: True
+        name = node.name
+        end = i + 1
+        while end < len(nodes):
+            node = nodes[end]
+            if node.name != name or not match(node):
+                break
+            end += 1
+        return (type, real, end)
+    
+    def simple(self, node):
+        """
+        Get whether a node is simple (has no children or attributes).
+        @param node: An XML node.
+        @type node: L{sax.element.Element}
+        @rtype: boolean
+        """
+        return ( not node.children and not node.attributes )
+    
+    def texts(self, nodes):
+        """
+        Get the text of a list of simple nodes.
+        @param nodes: A list of simple nodes.
+        @type nodes: [L{sax.element.Element},...]
+        @return: The text of each node, None when it has no text.
+        @rtype: [L{Text},...]
+        """
+        return [n.text or None for n in nodes]
+    
+    def translateall(self, texts, type, real):
+        """
+        Translate the text of a list of simple nodes using the
+        (builtin) schema type.  Nodes without text are translated as
+        they would be one at a time: None when nillable, else an empty
+        L{Text}.
+        @param texts: The text of each node (None when no text).
+        @type texts: [L{Text},...]
+        @param type: The expected schema type.
+        @type type: L{xsd.sxbase.SchemaObject}
+        @param real: The (builtin) resolved type.
+        @type real: L{xsd.sxbase.XBuiltin}
+        @return: The list of translated values.
+        @rtype: list
+        """
+        present = [t for t in texts if t is not None]
+        values = real.translateall(present)
+        if len(present) < len(texts):
+            if type.nillable or real.nillable:
+                empty = None
+            else:
+                empty = self.plain(Text(''))
+            translated = iter(values)
+            values = []
+            for t in texts:
+                if t is None:
+                    values.append(empty)
+                else:
+                    values.append(translated.next())
+        if real.typecode is None:
+            for i, v in enumerate(values):
+                if not isinstance(v, basestring):
+                    continue
+                if self.native:
+                    values[i] = self.plain(v)
+                elif not isinstance(v, Text):
+                    values[i] = Text(v)
+        if self.plan is not None:
+            self.plan.nodes += len(texts)
+        return values
+    
+    def extend(self, content, key, values):
+        """
+        Extend the (list) value of I{key} in L{Content.data} with
+        a list of translated values.
+        @param content: The current content being unmarshalled.
+        @type content: L{Content}
+        @param key: The attribute name.
+        @type key: str
+        @param values: A list of translated values.
+        @type values: list
+        """
+        if key in content.data:
+            v = self.getvalue(content.data, key)
+            if isinstance(v, list):
+                v.extend(values)
+            else:
+                self.setvalue(content.data, key, [v]+values)
+            return
+        if values[0] is None:
+            del values[0]
+        self.setvalue(content.data, key, values)
+    
+    def packed(self, values, real):
+        """
+        Get the list of (translated) values as an array as specified
+        by I{arrays}.  The list is returned when not specified, the
+        type has no array I{typecode} or a value cannot be stored in
+        the array (such as None).
+        @param values: A list of translated values.
+        @type values: list
+        @param real: The (builtin) resolved type.
+        @type real: L{xsd.sxbase.XBuiltin}
+        @return: The array, else I{values}.
+        @rtype: (array|list)
+        """
+        if self.arrays is None or real.typecode is None:
+            return values
+        if not isinstance(values, list):
+            return values
+        try:
+            result = array(real.typecode, values)
+        except (TypeError, OverflowError):
+            return values
+        if self.arrays == 'numpy' and numpy is not None:
+            result = numpy.frombuffer(result, dtype=real.typecode)
+        return result
         
     def unbounded(self, content):
         return content.type.unbounded()
     
     def nillable(self, content):
-        resolved = content.type.resolve()
+        resolved = self.resolver.resolve(content.type)
         return ( content.type.nillable or \
             (resolved.builtin() and resolved.nillable ) )
     
@@ -135,7 +516,7 @@ class Typed(Core):
     def translated(self, value, type):
         """ translate using the schema type """
         if value is not None:
-            resolved = type.resolve()
+            resolved = self.resolver.resolve(type)
             return resolved.translate(value)
         else:
             return value
\ No newline at end of file
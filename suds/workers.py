@@ -0,0 +1,94 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+"""
+Contains classes for applying a function to a list of items concurrently.
+"""
+
+from threading import Thread
+from Queue import Queue
+from logging import getLogger
+
+log = getLogger(__name__)
+
+
+class Workers:
+    """
+    Applies a function to each item in a list using up to I{concurrency}
+    (daemon) worker threads which are started for each list.
+    @ivar fn: The function applied to each item.
+    @type fn: callable
+    @ivar concurrency: The maximum number of worker threads.
+    @type concurrency: int
+    @ivar name: The name of an item (used for logging).
+    @type name: str
+    """
+
+    def __init__(self, fn, concurrency, name='item'):
+        """
+        @param fn: The function applied to each item.
+        @type fn: callable
+        @param concurrency: The maximum number of worker threads.
+        @type concurrency: int
+        @param name: The name of an item (used for logging).
+        @type name: str
+        """
+        self.fn = fn
+        self.concurrency = max(1, concurrency)
+        self.name = name
+
+    def __call__(self, items):
+        """
+        Apply the function to each item and wait for all to complete.
+        @param items: A list of items.
+        @type items: list
+        @return: The results (or the exception raised) in I{items} order.
+        @rtype: list
+        """
+        items = list(items)
+        result = [None]*len(items)
+        queue = Queue()
+        for item in enumerate(items):
+            queue.put(item)
+        workers = []
+        for n in range(min(self.concurrency, len(items))):
+            queue.put(None)
+            worker = Thread(target=self.work, args=(queue, result))
+            worker.setDaemon(True)
+            worker.start()
+            workers.append(worker)
+        for worker in workers:
+            worker.join()
+        return result
+
+    def work(self, queue, result):
+        """
+        The worker (thread) main loop.
+        @param queue: The queue of (index, item).
+        @type queue: I{Queue}
+        @param result: The result list.
+        @type result: list
+        """
+        while True:
+            item = queue.get()
+            if item is None:
+                break
+            index, item = item
+            try:
+                result[index] = self.fn(item)
+            except Exception, e:
+                log.debug('%s [%d] failed', self.name, index, exc_info=True)
+                result[index] = e
@@ -28,10 +28,12 @@ from suds.bindings.document import Document
 from suds.bindings.rpc import RPC, Encoded
 from suds.xsd import qualify, Namespace
 from suds.xsd.schema import Schema, SchemaCollection
+from suds.xsd.sxbase import loadlock
 from suds.xsd.query import ElementQuery
 from suds.sudsobject import Object, Facade, Metadata
 from suds.reader import DocumentReader, DefinitionsReader
 from urlparse import urljoin
+from copy import copy
 import re, soaparray
 
 log = getLogger(__name__)
@@ -157,7 +159,8 @@ class Definitions(WObject):
         self.open_imports()
         self.resolve()
         self.build_schema()
-        self.set_wrapped()
+        if not options.lazy:
+            self.set_wrapped()
         for s in self.services:
             self.add_methods(s)
         log.debug("wsdl at '%s' loaded:\n%s", url, self)
@@ -252,21 +255,53 @@ class Definitions(WObject):
         for b in self.bindings.values():
             for op in b.operations.values():
                 for body in (op.soap.input.body, op.soap.output.body):
-                    body.wrapped = False
-                    if len(body.parts) != 1:
+                    self.wrap(body)
+
+    def wrap(self, body):
+        """
+        Set the (wrapped|bare) flag on a message body.  The flag is
+        determined under the schema load lock and assigned only once it
+        has been determined so that a failed lookup is retried and other
+        threads never see a partially determined flag.
+        @param body: A message body.
+        @type body: L{Facade}
+        @return: The flag.
+        @rtype: bool
+        """
+        loadlock.acquire()
+        try:
+            try:
+                return body.wrapped
+            except AttributeError:
+                pass
+            wrapped = False
+            if len(body.parts) == 1:
+                for p in body.parts:
+                    if p.element is None:
                         continue
-                    for p in body.parts:
-                        if p.element is None:
-                            continue
-                        query = ElementQuery(p.element)
-                        pt = query.execute(self.schema)
-                        if pt is None:
-                            raise TypeNotFound(query.ref)
-                        resolved = pt.resolve()
-                        if resolved.builtin():
-                            continue
-                        body.wrapped = True
+                    query = ElementQuery(p.element)
+                    pt = query.execute(self.schema)
+                    if pt is None:
+                        raise TypeNotFound(query.ref)
+                    resolved = pt.resolve()
+                    if resolved.builtin():
+                        continue
+                    wrapped = True
+            body.wrapped = wrapped
+            return wrapped
+        finally:
+            loadlock.release()
                         
+    def bind(self, options):
+        """
+        Get a view of the definitions for a client.
+        @param options: The client options.
+        @type options: L{options.Options}
+        @return: The view.
+        @rtype: L{View}
+        """
+        return View(self, options)
+
     def __getstate__(self):
         nopickle = ('options',)
         state = self.__dict__.copy()
@@ -279,6 +314,45 @@ class Definitions(WObject):
         return 'Definitions (id=%s)' % self.id
 
 
+class View(Definitions):
+    """
+    A view of shared (cached) definitions for a client.  The view has
+    the client I{options} and its own services and methods (bound to
+    the view) so that the options and method locations of one client
+    are never seen by another.  Everything else is the (unmodified)
+    shared definitions.
+    @ivar definitions: The shared definitions.
+    @type definitions: L{Definitions}
+    """
+
+    def __init__(self, definitions, options):
+        """
+        @param definitions: The shared definitions.
+        @type definitions: L{Definitions}
+        @param options: The client options.
+        @type options: L{options.Options}
+        """
+        Object.__init__(self)
+        self.definitions = definitions
+        self.options = options
+        self.services = []
+        for s in definitions.services:
+            service = s.clone()
+            self.add_methods(service)
+            self.services.append(service)
+
+    def bind(self, options):
+        return View(self.definitions, options)
+
+    def __getattr__(self, name):
+        if name.startswith('__') and name.endswith('__'):
+            raise AttributeError(name)
+        return getattr(self.definitions, name)
+
+    def __unicode__(self):
+        return unicode(self.definitions)
+
+
 class Import(WObject):
     """
     Represents the <wsdl:import/>.
@@ -813,6 +887,20 @@ class Port(NamedObject):
         @rtype: I{Method}
         """
         return self.methods.get(name)
+
+    def clone(self, service):
+        """
+        Get a copy of the port (without methods).
+        @param service: The service containing the copy.
+        @type service: L{Service}
+        @return: The copy.
+        @rtype: L{Port}
+        """
+        port = copy(self)
+        port.__dict__['__keylist__'] = list(self.__keylist__)
+        port.__service = service
+        port.methods = {}
+        return port
         
 
 class Service(NamedObject):
@@ -850,6 +938,17 @@ class Service(NamedObject):
                 return p
         return None
     
+    def clone(self):
+        """
+        Get a copy of the service with copies of the ports (without methods).
+        @return: The copy.
+        @rtype: L{Service}
+        """
+        service = copy(self)
+        service.__dict__['__keylist__'] = list(self.__keylist__)
+        service.ports = [p.clone(service) for p in self.ports]
+        return service
+
     def setlocation(self, url, names=None):
         """
         Override the invocation location (url) for service method.
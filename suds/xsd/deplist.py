@@ -19,6 +19,7 @@ The I{depsolve} module defines a class for performing dependancy solving.
 """
 
 from logging import getLogger
+from collections import deque
 from suds import *
 
 log = getLogger(__name__)
@@ -28,26 +29,28 @@ class DepList:
     """
     Dependancy solving list.
     Items are tuples: (object, (deps,))
-    @ivar raw: The raw (unsorted) items.
-    @type raw: list
+    Items are sorted (topologically) so that each item follows the
+    items it depends on.  Dependencies on objects that are not in the
+    list are ignored.  When the dependencies are cyclic, the cycle is
+    broken where a depth first search would have broken it and is
+    reported in I{cycles}.
+    @ivar unsorted: The raw (unsorted) items.
+    @type unsorted: list
     @ivar index: The index of (unsorted) items.
-    @type index: list
-    @ivar stack: The sorting stack.
-    @type stack: list
-    @ivar pushed: The I{pushed} set tracks items that have been
-        processed.
-    @type pushed: set
+    @type index: dict
     @ivar sorted: The sorted list of items.
     @type sorted: list
+    @ivar cycles: The cycles found (and broken) by the sort.
+        Each is a list of objects.
+    @type cycles: list
     """
 
     def __init__(self):
         """ """
         self.unsorted = []
         self.index = {}
-        self.stack = []
-        self.pushed = set()
         self.sorted = None
+        self.cycles = []
         
     def add(self, *items):
         """
@@ -66,65 +69,86 @@ class DepList:
     def sort(self):
         """
         Sort the list based on dependancies.
+        Each item is (1) counted against the number of items it depends
+        on and (2) listed as a dependent of each of them.  Items with no
+        pending dependencies are emitted (in the order added), which
+        releases their dependents.  When items remain but none are
+        ready, a cycle is broken.
         @return: The sorted items.
         @rtype: list
         """
-        self.sorted = list()
-        self.pushed = set()
+        self.sorted = []
+        self.cycles = []
+        order = []
+        refs = {}
+        pending = {}
+        dependents = {}
         for item in self.unsorted:
-            popped = []
-            self.push(item)            
-            while len(self.stack):
-                try:
-                    top = self.top()
-                    ref = top[1].next()
-                    refd = self.index.get(ref)
-                    if refd is None:
-                        log.debug('"%s" not found, skipped', Repr(ref))
-                        continue
-                    self.push(refd)
-                except StopIteration:
-                    popped.append(self.pop())
+            key = item[0]
+            if key in refs:
+                continue
+            known = []
+            for ref in item[1]:
+                if ref == key or ref in known:
+                    continue
+                if ref not in self.index:
+                    log.debug('"%s" not found, skipped', Repr(ref))
                     continue
-            for p in popped:
-                self.sorted.append(p)
+                known.append(ref)
+                dependents.setdefault(ref, []).append(key)
+            order.append(item)
+            refs[key] = known
+            pending[key] = len(known)
+        done = set()
+        ready = deque([item[0] for item in order if not pending[item[0]]])
+        position = 0
+        while len(done) < len(order):
+            if not ready:
+                while order[position][0] in done:
+                    position += 1
+                ready.append(self.__cycle(order[position][0], refs, done))
+            key = ready.popleft()
+            if key in done:
+                continue
+            done.add(key)
+            self.sorted.append(self.index[key])
+            for dependent in dependents.get(key, ()):
+                if dependent in done:
+                    continue
+                pending[dependent] -= 1
+                if not pending[dependent]:
+                    ready.append(dependent)
         self.unsorted = self.sorted
         return self.sorted
-    
-    def top(self):
-        """
-        Get the item at the top of the stack.
-        @return: The top item.
-        @rtype: (item, iter)
-        """
-        return self.stack[-1]
-    
-    def push(self, item):
-        """
-        Push and item onto the sorting stack.
-        @param item: An item to push.
-        @type item: I{item}
-        @return: The number of items pushed.
-        @rtype: int
-        """
-        if item in self.pushed:
-            return
-        frame = (item, iter(item[1]))
-        self.stack.append(frame)
-        self.pushed.add(item)
-    
-    def pop(self):
+
+    def __cycle(self, key, refs, done):
         """
-        Pop the top item off the stack and append
-        it to the sorted list.
-        @return: The popped item.
-        @rtype: I{item}
+        Find the cycle that prevents the specified item from being
+        sorted by following (the first of) its unsorted dependencies
+        until an item repeats.  The cycle is recorded and reported.
+        @param key: An unsorted item key.
+        @type key: object
+        @param refs: The known dependencies by item key.
+        @type refs: dict
+        @param done: The keys of sorted items.
+        @type done: set
+        @return: The key of the item to be sorted (next) to break the
+            cycle.  This is the last item on the path before it repeats.
+        @rtype: object
         """
-        try:
-            frame = self.stack.pop()
-            return frame[0]
-        except:
-            pass
+        path = []
+        visited = {}
+        while key not in visited:
+            visited[key] = len(path)
+            path.append(key)
+            for ref in refs[key]:
+                if ref not in done:
+                    key = ref
+                    break
+        cycle = path[visited[key]:]
+        self.cycles.append(cycle)
+        log.debug('cycle: %s', ' -> '.join([str(Repr(x)) for x in cycle+cycle[:1]]))
+        return path[-1]
 
 
 if __name__ == '__main__':
@@ -39,6 +39,15 @@ class Doctor:
         """
         pass
 
+    def key(self):
+        """
+        Get the configuration (as strings) that affects how schemas
+        are repaired.  Used to key cached documents.
+        @return: A list of strings.
+        @rtype: [str,..]
+        """
+        return []
+
 
 class Practice(Doctor):
     """
@@ -63,6 +72,14 @@ class Practice(Doctor):
             d.examine(root)
         return root
 
+    def key(self):
+        key = []
+        for d in self.doctors:
+            key.append(d.__class__.__name__)
+            if isinstance(d, Doctor):
+                key += d.key()
+        return key
+
 
 class TnsFilter:
     """
@@ -171,6 +188,15 @@ class Import:
         log.debug('%s inserted', node)
         root.insert(node) 
         
+    def key(self):
+        """
+        Get the import (namespace, location and filter) as a string.
+        @return: The import as a string.
+        @rtype: str
+        """
+        filter = ','.join(self.filter.tns)
+        return '%s|%s|%s' % (self.ns, self.location, filter)
+        
     def exists(self, root):
         """
         Check to see if the <xs:import/> already exists
@@ -212,6 +238,9 @@ class ImportDoctor(Doctor, DocumentPlugin):
         for imp in self.imports:
             imp.apply(node)
 
+    def key(self):
+        return [imp.key() for imp in self.imports]
+
     def parsed(self, context):
         node = context.document
         # xsd root
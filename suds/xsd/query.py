@@ -40,7 +40,7 @@ class Query(Object):
         Object.__init__(self)
         self.id = objid(self)
         self.ref = ref
-        self.history = []
+        self.history = set()
         self.resolved = False
         if not isqref(self.ref):
             raise Exception('%s, must be qref' % tostr(self.ref))
@@ -80,10 +80,11 @@ class Query(Object):
         if result is None:
             log.debug('%s, not-found', self.ref)
             return
+        result.load()
         if self.resolved:
             result = result.resolve()
         log.debug('%s, found as: %s', self.ref, Repr(result))
-        self.history.append(result)
+        self.history.add(result)
         return result
 
 
@@ -160,14 +161,10 @@ class AttrQuery(Query):
     
     def __deepsearch(self, schema):
         from suds.xsd.sxbasic import Attribute
-        result = None
-        for e in schema.all:
-            result = e.find(self.ref, (Attribute,))
-            if self.filter(result):
-                result = None
-            else:
-                break
-        return result
+        for result in schema.deep(self.ref, Attribute):
+            if not self.filter(result):
+                return result
+        return None
 
 
 class AttrGroupQuery(Query):
@@ -198,11 +195,7 @@ class ElementQuery(Query):
     
     def __deepsearch(self, schema):
         from suds.xsd.sxbasic import Element
-        result = None
-        for e in schema.all:
-            result = e.find(self.ref, (Element,))
-            if self.filter(result):
-                result = None
-            else:
-                break
-        return result
\ No newline at end of file
+        for result in schema.deep(self.ref, Element):
+            if not self.filter(result):
+                return result
+        return None
\ No newline at end of file
@@ -29,7 +29,7 @@ from suds.xsd import *
 from suds.xsd.sxbuiltin import *
 from suds.xsd.sxbasic import Factory as BasicFactory
 from suds.xsd.sxbuiltin import Factory as BuiltinFactory
-from suds.xsd.sxbase import SchemaObject
+from suds.xsd.sxbase import SchemaObject, loadlock
 from suds.xsd.deplist import DepList
 from suds.sax.element import Element
 from suds.sax import splitPrefix, Namespace
@@ -98,6 +98,8 @@ class SchemaCollection:
             child.dereference()
         log.debug('loaded:\n%s', self)
         merged = self.merge()
+        if merged is not None:
+            merged.mkindex()
         log.debug('MERGED:\n%s', merged)
         return merged
         
@@ -189,9 +191,25 @@ class Schema:
     @ivar form_qualified: The flag indicating:
         (@elementFormDefault).
     @type form_qualified: bool
+    @ivar lazy: The flag indicating that top level objects are only
+        built and dereferenced when first found by a query.
+    @type lazy: bool
+    @ivar index: The (named) objects nested (at any depth) in the
+        loaded objects in I{all} by (qname, class).  Built when the
+        schema is dereferenced (None when not built).
+    @type index: {(qref, class):[L{SchemaObject},...]}
+    @ivar importers: The schemas that have merged this schema.
+    @type importers: [L{Schema},...]
+    @ivar hits: The number of type resolutions answered by a memo.
+    @type hits: int
+    @ivar misses: The number of type resolutions performed.
+    @type misses: int
     """
     
     Tag = 'schema'
+    index = None
+    hits = 0
+    misses = 0
     
     def __init__(self, root, baseurl, options, container=None):
         """
@@ -217,6 +235,11 @@ class Schema:
         self.attributes = {}
         self.groups = {}
         self.agrps = {}
+        self.lazy = options.lazy
+        self.index = None
+        self.importers = []
+        self.hits = 0
+        self.misses = 0
         if options.doctor is not None:
             options.doctor.examine(root)
         form = self.root.get('elementFormDefault')
@@ -250,7 +273,7 @@ class Schema:
             - Build the graph.
             - Collate the children.
         """
-        self.children = BasicFactory.build(self.root, self)
+        self.children = BasicFactory.build(self.root, self, lazy=self.lazy)
         collated = BasicFactory.collate(self.children)
         self.children = collated[0]
         self.attributes = collated[2]
@@ -264,10 +287,12 @@ class Schema:
         """
         Merge the contents from the schema.  Only objects not already contained
         in this schema's collections are merged.  This is to provide for bidirectional
-        import which produce cyclic includes.
+        import which produce cyclic includes.  When indexed, the merged objects
+        are added to the index.
         @returns: self
         @rtype: L{Schema} 
         """
+        merged = len(self.all)
         for item in schema.attributes.items():
             if item[0] in self.attributes:
                 continue
@@ -294,6 +319,13 @@ class Schema:
             self.all.append(item[1])
             self.agrps[item[0]] = item[1]
         schema.merged = True
+        schema.importers.append(self)
+        if self.index is not None:
+            loadlock.acquire()
+            try:
+                self.addindex(self.index, self.all[merged:], set())
+            finally:
+                loadlock.release()
         return self
         
     def open_imports(self, options):
@@ -315,15 +347,47 @@ class Schema:
     def dereference(self):
         """
         Instruct all children to perform dereferencing.
-        """
-        all = []
+        When I{lazy}, each (top level) child is dereferenced
+        when loaded instead.  The schema is indexed.
+        """
+        if not self.lazy:
+            all = []
+            for child in self.children:
+                child.content(all)
+            self.__dereference(all)
+        self.mkindex()
+
+    def realize(self, x):
+        """
+        Build and dereference a I{lazy} (top level) object.  The
+        objects it depends on are loaded first.  The object is added
+        to the index of this schema and the schemas that import it.
+        @param x: A top level object.
+        @type x: L{SchemaObject}
+        """
+        log.debug('(%s) loading %s', self.tns[1], Repr(x))
+        x.rawchildren = BasicFactory.build(x.root, self, x.childtags())
+        self.__dereference(x.content(), True)
+        visited = set()
+        pending = [self]
+        while pending:
+            schema = pending.pop()
+            if schema in visited:
+                continue
+            visited.add(schema)
+            if schema.index is not None:
+                schema.addindex(schema.index, x.rawchildren, set())
+            pending.extend(schema.importers)
+
+    def __dereference(self, all, load=False):
         indexes = {}
-        for child in self.children:
-            child.content(all)
         deplist = DepList()
         for x in all:
             x.qualify()
             midx, deps = x.dependencies()
+            if load:
+                for d in deps:
+                    d.load()
             item = (x, tuple(deps))
             deplist.add(item)
             indexes[x] = midx
@@ -333,6 +397,73 @@ class Schema:
             d = deps[midx]
             log.debug('(%s) merging %s <== %s', self.tns[1], Repr(x), Repr(d))
             x.merge(d)
+
+    def deep(self, qref, cls):
+        """
+        Get the objects of the specified class with the specified qname
+        nested (at any depth) within the top level objects in I{all}.
+        The objects are in the order found by searching each top level
+        object (depth first) in turn.
+        @param qref: A qualified reference.
+        @type qref: qref
+        @param cls: The class of the objects.
+        @type cls: I{class}
+        @return: The objects.
+        @rtype: [L{SchemaObject},...]
+        """
+        index = self.index
+        if index is None:
+            index = self.mkindex()
+        return index.get((qref, cls), ())
+
+    def mkindex(self):
+        """
+        Index the (named) objects nested in the objects in I{all}.
+        Each object is indexed once, where first found.  I{Lazy} objects
+        are not loaded (or searched) and are indexed when loaded.
+        @return: The index.
+        @rtype: {(qref, class):[L{SchemaObject},...]}
+        """
+        loadlock.acquire()
+        try:
+            index = {}
+            visited = set()
+            self.addindex(index, self.all, visited)
+            self.index = index
+            log.debug('(%s) indexed %d objects', self.tns[1], len(visited))
+            return index
+        finally:
+            loadlock.release()
+
+    def addindex(self, index, objects, visited):
+        """
+        Add the (named) objects nested (depth first) in the specified
+        (loaded) objects to an index.  Objects already indexed under
+        the same key are not added again.
+        @param index: The index to update.
+        @type index: {(qref, class):[L{SchemaObject},...]}
+        @param objects: A list of objects.
+        @type objects: [L{SchemaObject},...]
+        @param visited: The objects already searched.
+        @type visited: set
+        """
+        pending = objects[::-1]
+        while pending:
+            x = pending.pop()
+            if x in visited:
+                continue
+            visited.add(x)
+            if x.name is not None:
+                found = index.setdefault((x.qname, x.__class__), [])
+                if x not in found:
+                    found.append(x)
+            if not x.lazy:
+                pending.extend(x.rawchildren[::-1])
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('index', None)
+        return state
         
     def locate(self, ns):
         """
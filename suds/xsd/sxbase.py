@@ -20,6 +20,7 @@ schema objects.
 """
 
 from logging import getLogger
+from threading import RLock
 from suds import *
 from suds.xsd import *
 from suds.sax.element import Element
@@ -27,6 +28,22 @@ from suds.sax import Namespace
 
 log = getLogger(__name__)
 
+#
+# Serializes the loading of I{lazy} objects (and indexing) since
+# a client may be shared by threads.  A single (reentrant) lock is
+# used since loading an object loads the objects it depends on
+# which may be contained in other schemas.
+#
+loadlock = RLock()
+loading = set()
+
+#
+# Changed each time schema objects are (lazily) loaded or merged so
+# that what has been recorded about them (see: L{suds.plan.Plan})
+# may be discarded.
+#
+version = 0
+
 
 class SchemaObject(object):
     """
@@ -46,8 +63,13 @@ class SchemaObject(object):
     @type default: object
     @ivar rawchildren: A list raw of all children.
     @type rawchildren: [L{SchemaObject},...]
+    @cvar lazy: A flag that indicates that the (top level) object
+        has been created but not yet built and dereferenced.
+    @type lazy: boolean
     """
 
+    lazy = False
+
     @classmethod
     def prepend(cls, d, s, filter=Filter()):
         """
@@ -104,6 +126,37 @@ class SchemaObject(object):
         self.rawchildren = []
         self.cache = {}
         
+    def load(self):
+        """
+        Build and dereference the object when it was created I{lazy}.
+        The object is flagged as loaded only once it has been built and
+        dereferenced so that other threads never see it partially built.
+        When loading fails, the object is left I{lazy}.  An object that
+        (cyclically) depends on itself is not loaded again while loading.
+        @return: self
+        @rtype: L{SchemaObject}
+        """
+        global version
+        if not self.lazy:
+            return self
+        loadlock.acquire()
+        try:
+            if self.lazy and self not in loading:
+                loading.add(self)
+                try:
+                    self.schema.realize(self)
+                    self.lazy = False
+                except:
+                    self.rawchildren = []
+                    loading.discard(self)
+                    version += 1
+                    raise
+                loading.discard(self)
+                version += 1
+        finally:
+            loadlock.release()
+        return self
+        
     def attributes(self, filter=Filter()):
         """
         Get only the attribute content.
@@ -382,7 +435,11 @@ class SchemaObject(object):
     def merge(self, other):
         """
         Merge another object as needed.
+        Any memoized resolution is discarded.
         """
+        global version
+        version += 1
+        self.__dict__.pop('memo', None)
         other.qualify()
         for n in ('name',
                   'qname',
@@ -602,8 +659,13 @@ class Iter:
 class XBuiltin(SchemaObject):
     """
     Represents an (xsd) schema <xs:*/> node
+    @cvar typecode: The I{array} module typecode used to store
+        (translated) values of this type, else None.
+    @type typecode: str
     """
     
+    typecode = None
+    
     def __init__(self, schema, name):
         """
         @param schema: The containing schema.
@@ -622,6 +684,17 @@ class XBuiltin(SchemaObject):
     
     def resolve(self, nobuiltin=False):
         return self
+    
+    def translateall(self, values, topython=True):
+        """
+        Translate a list of values (of this type) to/from python types.
+        @param values: A list of (non-empty) values to translate.
+        @type values: list
+        @return: The list of converted I{language} types.
+        @rtype: list
+        @see: L{translate()}
+        """
+        return [self.translate(v, topython) for v in values]
 
 
 class Content(SchemaObject):
@@ -44,32 +44,50 @@ class RestrictionMatcher:
 class TypedContent(Content):
     """
     Represents any I{typed} content.
+    The (whole chain) resolution is memoized.  The memo is discarded
+    when the object is merged since that may change what it resolves
+    to.  The objects in the chain are loaded (and dereferenced) before
+    they are resolved so the chain is not changed once resolved.
+    @ivar memo: The memoized resolution by I{nobuiltin} flag.
+    @type memo: {bool:L{SchemaObject}}
     """
+
+    memo = None
+
     def resolve(self, nobuiltin=False):
-        qref = self.qref()
-        if qref is None:
-            return self
-        key = 'resolved:nb=%s' % nobuiltin
-        cached = self.cache.get(key)
-        if cached is not None:
-            return cached
+        self.load()
+        memo = self.memo
+        if memo is None:
+            memo = {}
+            self.memo = memo
+        else:
+            result = memo.get(nobuiltin)
+            if result is not None:
+                self.schema.hits += 1
+                return result
+        self.schema.misses += 1
         result = self
-        query = TypeQuery(qref)
-        query.history = [self]
-        log.debug('%s, resolving: %s\n using:%s', self.id, qref, query)
-        resolved = query.execute(self.schema)
-        if resolved is None:
-            log.debug(self.schema)
-            raise TypeNotFound(qref)
-        self.cache[key] = resolved
-        if resolved.builtin():
-            if nobuiltin:
-                result = self
+        qref = self.qref()
+        if qref is not None:
+            query = TypeQuery(qref)
+            query.history = set([self])
+            log.debug('%s, resolving: %s\n using:%s', self.id, qref, query)
+            resolved = query.execute(self.schema)
+            if resolved is None:
+                log.debug(self.schema)
+                raise TypeNotFound(qref)
+            if resolved.builtin():
+                if not nobuiltin:
+                    result = resolved
             else:
-                result = resolved
-        else:
-            result = resolved.resolve(nobuiltin)
+                result = resolved.resolve(nobuiltin)
+        memo[nobuiltin] = result
         return result
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('memo', None)
+        return state
     
     def qref(self):
         """
@@ -758,13 +776,16 @@ class Factory:
             return None
 
     @classmethod
-    def build(cls, root, schema, filter=('*',)):
+    def build(cls, root, schema, filter=('*',), lazy=False):
         """
         Build an xsobject representation.
         @param root: An schema XML root.
         @type root: L{sax.element.Element}
         @param filter: A tag filter.
         @type filter: [str,...]
+        @param lazy: Only create the (top level) objects and flag them
+            I{lazy} to be built when loaded.
+        @type lazy: boolean
         @return: A schema object graph.
         @rtype: L{sxbase.SchemaObject}
         """
@@ -775,6 +796,9 @@ class Factory:
                 if child is None:
                     continue
                 children.append(child)
+                if lazy:
+                    child.lazy = True
+                    continue
                 c = cls.build(node, schema, child.childtags())
                 child.rawchildren = c
         return children
@@ -82,6 +82,8 @@ class XInteger(XBuiltin):
     Represents an (xsd) xs:int builtin type.
     """
         
+    typecode = 'l'
+        
     def translate(self, value, topython=True):
         if topython:
             if isinstance(value, basestring) and len(value):
@@ -93,12 +95,20 @@ class XInteger(XBuiltin):
                 return str(value)
             else:
                 return value
+
+    def translateall(self, values, topython=True):
+        if topython:
+            return map(int, values)
+        else:
+            return XBuiltin.translateall(self, values, topython)
             
 class XLong(XBuiltin):
     """
     Represents an (xsd) xs:long builtin type.
     """
         
+    typecode = 'l'
+        
     def translate(self, value, topython=True):
         if topython:
             if isinstance(value, basestring) and len(value):
@@ -111,12 +121,20 @@ class XLong(XBuiltin):
             else:
                 return value
 
+    def translateall(self, values, topython=True):
+        if topython:
+            return map(long, values)
+        else:
+            return XBuiltin.translateall(self, values, topython)
+
        
 class XFloat(XBuiltin):
     """
     Represents an (xsd) xs:float builtin type.
     """
         
+    typecode = 'd'
+        
     def translate(self, value, topython=True):
         if topython:
             if isinstance(value, basestring) and len(value):
@@ -128,6 +146,12 @@ class XFloat(XBuiltin):
                 return str(value)
             else:
                 return value
+
+    def translateall(self, values, topython=True):
+        if topython:
+            return map(float, values)
+        else:
+            return XBuiltin.translateall(self, values, topython)
             
 
 class XDate(XBuiltin):
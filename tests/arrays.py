@@ -0,0 +1,58 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+#
+# Memory used by (and time to unmarshal) a 200k point numeric series
+# returned as lists and as arrays.
+#
+
+import sys
+sys.path.append('../')
+from time import time
+from suds.client import Client
+from suds.cache import NoCache
+from tests.server import Server
+
+
+def sizeof(x):
+    """ sum the size of the list (or array) and the values it references """
+    n = sys.getsizeof(x)
+    if isinstance(x, list):
+        for v in x:
+            n += sys.getsizeof(v)
+    return n
+
+
+def main():
+    points = 200000
+    server = Server()
+    try:
+        for arrays in (None, 'array'):
+            client = Client(server.url('/wsdl'), cache=NoCache(), arrays=arrays)
+            client.service.getSeries(10)
+            for n in range(3):
+                started = time()
+                reply = client.service.getSeries(points)
+                elapsed = time()-started
+            series = reply.series
+            total = sizeof(series.index)+sizeof(series.value)
+            print '%s: %d points, %.2f s, %d bytes/point' % \
+                (arrays, points, elapsed, total/points)
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -17,6 +17,8 @@
 import sys
 sys.path.append('../')
 import unittest
+import random
+import suds.sax.date as sxdate
 from suds.sax.date import Timezone as Tz
 from suds.xsd.sxbuiltin import *
 from unittest import TestCase
@@ -544,6 +546,68 @@ class DateTimeTest(TestCase):
             % (Y, M, D, h, m, s, offset)
         return s
 
+
+
+class CodecTest(TestCase):
+
+    def setUp(self):
+        self.random = random.Random(22)
+        self.local = Timezone.LOCAL
+
+    def tearDown(self):
+        Timezone.LOCAL = self.local
+
+    def values(self, n=500):
+        for i in range(n):
+            r = self.random
+            value = dt.datetime(
+                r.randint(1, 9999),
+                r.randint(1, 12),
+                r.randint(1, 28),
+                r.randint(0, 23),
+                r.randint(0, 59),
+                r.randint(0, 59),
+                r.choice((0, r.randint(1, 999999))))
+            yield value
+
+    def testRoundTrip(self):
+        for value in self.values():
+            Timezone.LOCAL = self.random.randint(-12, 12)
+            s = str(sxdate.DateTime(value))
+            self.assertEqual(value, sxdate.DateTime(s).datetime)
+            s = str(sxdate.Time(value.time()))
+            self.assertEqual(value.time(), sxdate.Time(s).time)
+            s = str(sxdate.Date(value.date()))
+            self.assertEqual(value.date(), sxdate.Date(s).date)
+
+    def testParsed(self):
+        for value in self.values():
+            local = self.random.randint(-12, 12)
+            Timezone.LOCAL = local
+            zone = self.random.choice(('', 'Z', 'z', '+02:00', '-11:30'))
+            fraction = self.random.choice(('', '.5', '.123', '.12345678'))
+            s = '%s%s%s' % (value.replace(microsecond=0).isoformat(),
+                fraction, zone)
+            expected = value.replace(microsecond=int(fraction[1:7] or 0))
+            if zone:
+                offset = int(zone[:3].replace('z', '0').replace('Z', '0'))
+                adjusted = expected + dt.timedelta(hours=local-offset)
+                if adjusted.year in (1, 9999):
+                    continue
+                expected = adjusted
+            self.assertEqual(expected, sxdate.DateTime(s).datetime)
+            time = sxdate.Time(s.split('T')[1], False)
+            self.assertEqual(value.replace(
+                microsecond=int(fraction[1:7] or 0)).time(), time.time)
+            self.assertEqual(bool(zone), hasattr(time, 'offset'))
+
+    def testInvalid(self):
+        for s in ('2010-13-01T00:00:00', '2010-01-01T25:00:00',
+                  '2010-01-01T00:00:00.', '2010-01-01T00:00:00+06'):
+            self.assertRaises(ValueError, sxdate.DateTime, s)
+        for s in ('25:00:00', '10:00', '10:00:00.'):
+            self.assertRaises(ValueError, sxdate.Time, s)
+
         
 if __name__ == '__main__':
     unittest.main()
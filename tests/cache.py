@@ -0,0 +1,334 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+import sys
+sys.path.append('../')
+import os
+import unittest
+import shutil
+from time import time
+from tempfile import mkdtemp
+from cStringIO import StringIO
+from suds.client import Client
+from suds.options import Options
+from suds.plugin import MessagePlugin
+from suds.reader import Reader
+from suds.sax.parser import Parser
+from suds.xsd.doctor import ImportDoctor, Import
+from suds.cache import FileCache, MemoryCache, TieredCache, ObjectCache
+from suds.cache import DocumentCache
+from unittest import TestCase
+from tests import *
+from tests.server import Server
+
+setup_logging()
+
+
+class MemoryCacheTest(TestCase):
+
+    def testShared(self):
+        cache = MemoryCache(copy=False)
+        object = dict(a=[1, 2])
+        cache.put('x', object)
+        self.assertTrue(cache.get('x') is object)
+        self.assertEqual(None, cache.getf('x'))
+
+    def testIsolated(self):
+        cache = MemoryCache(copy=True)
+        object = dict(a=[1, 2])
+        cache.put('x', object)
+        object['a'].append(3)
+        copy = cache.get('x')
+        self.assertEqual(dict(a=[1, 2]), copy)
+        copy['b'] = 1
+        self.assertEqual(dict(a=[1, 2]), cache.get('x'))
+
+    def testDocument(self):
+        cache = MemoryCache()
+        document = Parser().parse(string='<a><b/></a>')
+        cache.put('x', document)
+        copy = cache.get('x')
+        self.assertFalse(copy is document)
+        self.assertEqual(str(document), str(copy))
+
+    def testString(self):
+        cache = MemoryCache()
+        cache.put('x', 'hello')
+        self.assertEqual('hello', cache.get('x'))
+        self.assertEqual('hello', cache.getf('x').read())
+        self.assertEqual('world', cache.putf('y', StringIO('world')).read())
+        self.assertEqual('world', cache.get('y'))
+
+    def testLRU(self):
+        cache = MemoryCache(maxitems=2)
+        cache.put('a', 'A')
+        cache.put('b', 'B')
+        cache.get('a')
+        cache.put('c', 'C')
+        self.assertEqual(2, len(cache))
+        self.assertEqual(None, cache.get('b'))
+        self.assertEqual('A', cache.get('a'))
+        self.assertEqual('C', cache.get('c'))
+
+    def testMaxBytes(self):
+        cache = MemoryCache(maxitems=0, maxbytes=10)
+        cache.put('a', '12345')
+        cache.put('b', '12345')
+        cache.put('c', '1')
+        self.assertEqual(None, cache.get('a'))
+        self.assertEqual(6, cache.size)
+        cache.put('d', '12345678901')
+        self.assertEqual(None, cache.get('d'))
+        self.assertEqual(2, len(cache))
+
+    def testSharedMaxBytes(self):
+        cache = MemoryCache(maxitems=0, maxbytes=100, copy=False)
+        object = dict(a=[1, 2])
+        cache.put('x', object)
+        self.assertTrue(cache.get('x') is object)
+        self.assertTrue(0 < cache.size < 100)
+        cache.put('y', range(100))
+        self.assertEqual(None, cache.get('y'))
+
+    def testExpired(self):
+        cache = MemoryCache(seconds=1)
+        cache.put('a', 'A')
+        self.assertEqual('A', cache.get('a'))
+        cache.entries['a'] = (1,) + cache.entries['a'][1:]
+        self.assertEqual(None, cache.get('a'))
+        self.assertTrue(cache.restore('a'))
+        self.assertEqual('A', cache.get('a'))
+        self.assertFalse(cache.restore('b'))
+
+
+class FileCacheTest(TestCase):
+
+    def setUp(self):
+        self.location = mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.location)
+
+    def testSharded(self):
+        cache = FileCache(self.location)
+        for n in range(20):
+            cache.put('id%d' % n, 'hello%d' % n)
+        for n in range(20):
+            self.assertEqual('hello%d' % n, cache.get('id%d' % n))
+        files = cache.files()
+        self.assertEqual(20, len(files))
+        for path in files:
+            dn = os.path.basename(os.path.dirname(path))
+            self.assertTrue(cache.shard(dn))
+            self.assertFalse(os.path.basename(path).startswith('.'))
+        cache.purge('id0')
+        self.assertEqual(None, cache.get('id0'))
+        cache.clear()
+        self.assertEqual([], cache.files())
+
+    def testReplaced(self):
+        cache = FileCache(self.location)
+        cache.put('a', 'hello')
+        f = cache.getf('a')
+        cache.put('a', 'world')
+        self.assertEqual('hello', f.read())
+        f.close()
+        self.assertEqual('world', cache.get('a'))
+
+    def testVersion(self):
+        cache = FileCache(self.location)
+        cache.put('a', 'hello')
+        FileCache(self.location)
+        self.assertEqual('hello', cache.get('a'))
+        cache.write(os.path.join(self.location, 'version'), '0.0')
+        FileCache(self.location)
+        self.assertEqual(None, cache.get('a'))
+
+    def testExpired(self):
+        cache = FileCache(self.location, seconds=1)
+        FileCache.swept[self.location] = time()
+        cache.put('a', 'hello')
+        self.assertEqual('hello', cache.get('a'))
+        past = time()-10
+        for path in cache.files():
+            os.utime(path, (past, past))
+        self.assertEqual(None, cache.get('a'))
+        self.assertEqual(None, cache.sweeper)
+
+    def testSweep(self):
+        cache = FileCache(self.location, seconds=1)
+        cache.put('a', 'hello')
+        past = time()-10
+        for path in cache.files():
+            os.utime(path, (past, past))
+        cache.sweep(force=True)
+        self.assertEqual(1, len(cache.files()))
+        self.assertTrue(cache.files()[0].endswith('.stale'))
+        self.assertEqual(None, cache.get('a'))
+
+    def testBackground(self):
+        cache = FileCache(self.location, seconds=1)
+        cache.put('a', 'hello')
+        cache.put('b', 'world')
+        past = time()-10
+        for path in cache.files():
+            os.utime(path, (past, past))
+        FileCache.swept.pop(self.location, None)
+        cache.get('a')
+        cache.sweeper.join(10)
+        for path in cache.files():
+            self.assertTrue(path.endswith('.stale'))
+
+    def testMode(self):
+        cache = FileCache(self.location)
+        cache.put('a', 'hello')
+        umask = os.umask(0)
+        os.umask(umask)
+        for path in cache.files():
+            mode = os.stat(path).st_mode & 0777
+            self.assertEqual(0666 & ~umask, mode)
+
+
+class TieredCacheTest(TestCase):
+
+    def setUp(self):
+        self.server = Server()
+        self.location = mkdtemp()
+
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.location)
+
+    def testWsdl(self):
+        cache = TieredCache(MemoryCache(), ObjectCache(self.location))
+        url = self.server.url('/wsdl')
+        client = Client(url, cache=cache, cachingpolicy=1)
+        self.assertEqual(1, len(cache.memory))
+        client = Client(url, cache=cache, cachingpolicy=1)
+        self.assertEqual('hello', client.service.echo('hello'))
+        cache.memory.clear()
+        client = Client(url, cache=cache, cachingpolicy=1)
+        self.assertEqual(1, len(cache.memory))
+        self.assertEqual('hello', client.service.echo('hello'))
+
+    def testShared(self):
+        cache = MemoryCache()
+        url = self.server.url('/wsdl')
+        a = Client(url, cache=cache, cachingpolicy=1)
+        b = Client(url, cache=cache, cachingpolicy=1, retnative=True)
+        self.assertTrue(a.wsdl.schema is b.wsdl.schema)
+        records = b.service.getRecords(2)
+        self.assertEqual(u'name-1', records[1]['name'])
+        records = a.service.getRecords(2)
+        self.assertEqual('name-1', records[1].name)
+        b.wsdl.services[0].setlocation('http://localhost:1/')
+        self.assertEqual('hello', a.service.echo('hello'))
+
+    def testDocument(self):
+        cache = MemoryCache()
+        url = self.server.url('/wsdl')
+        client = Client(url, cache=cache)
+        self.assertEqual(1, len(cache))
+        client = Client(url, cache=cache)
+        self.assertEqual('hello', client.service.echo('hello'))
+
+
+class RevalidateTest(TestCase):
+
+    def setUp(self):
+        self.server = Server()
+        self.location = mkdtemp()
+        self.cache = ObjectCache(self.location, seconds=1)
+
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.location)
+
+    def testKey(self):
+        options = Options(cache=self.cache)
+        url = self.server.url('/wsdl')
+        id = Reader(options).mangle(url, 'document')
+        self.assertEqual(id, Reader(Options()).mangle(url, 'document'))
+        self.assertNotEqual(id, Reader(options).mangle(url+'x', 'document'))
+        options.autoblend = True
+        self.assertNotEqual(id, Reader(options).mangle(url, 'document'))
+        options.autoblend = False
+        options.plugins = [MessagePlugin()]
+        self.assertNotEqual(id, Reader(options).mangle(url, 'document'))
+        options.plugins = []
+        options.doctor = ImportDoctor(Import('urn:a'))
+        doctored = Reader(options).mangle(url, 'document')
+        self.assertNotEqual(id, doctored)
+        options.doctor = ImportDoctor(Import('urn:b'))
+        self.assertNotEqual(doctored, Reader(options).mangle(url, 'document'))
+        options.doctor = ImportDoctor(Import('urn:a'))
+        self.assertEqual(doctored, Reader(options).mangle(url, 'document'))
+
+    def testNotModified(self):
+        url = self.server.url('/wsdl')
+        Client(url, cache=self.cache, revalidate=True)
+        self.assertEqual([None], self.server.gets)
+        self.expire()
+        client = Client(url, cache=self.cache, revalidate=True)
+        self.assertEqual([None, '"1"'], self.server.gets)
+        self.assertEqual('hello', client.service.echo('hello'))
+        Client(url, cache=self.cache, revalidate=True)
+        self.assertEqual(2, len(self.server.gets))
+
+    def testDocumentCache(self):
+        self.cache = DocumentCache(self.location, seconds=1)
+        url = self.server.url('/wsdl')
+        Client(url, cache=self.cache, revalidate=True)
+        self.assertEqual([None], self.server.gets)
+        Client(url, cache=self.cache, revalidate=True)
+        self.assertEqual(1, len(self.server.gets))
+        self.expire()
+        client = Client(url, cache=self.cache, revalidate=True)
+        self.assertEqual([None, '"1"'], self.server.gets)
+        self.assertEqual('hello', client.service.echo('hello'))
+
+    def testModified(self):
+        url = self.server.url('/wsdl')
+        Client(url, cache=self.cache, revalidate=True)
+        self.expire()
+        self.server.version = 2
+        Client(url, cache=self.cache, revalidate=True)
+        self.expire()
+        Client(url, cache=self.cache, revalidate=True)
+        self.assertEqual([None, '"1"', '"2"'], self.server.gets)
+
+    def testUnavailable(self):
+        url = self.server.url('/wsdl')
+        Client(url, cache=self.cache, revalidate=True)
+        self.expire()
+        stale = [p for p in self.cache.files() if '-document.' in p]
+        self.assertTrue(stale[0].endswith('.stale'))
+        self.server.stop()
+        self.assertRaises(
+            Exception, Client, url, cache=self.cache, revalidate=True)
+        self.assertEqual(
+            stale, [p for p in self.cache.files() if '-document.' in p])
+
+    def expire(self):
+        past = time()-10
+        for path in self.cache.files():
+            os.utime(path, (past, past))
+        self.cache.sweep(force=True)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,681 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+import os
+import sys
+import shutil
+import json
+sys.path.append('../')
+import unittest
+from array import array
+from types import GeneratorType
+from cStringIO import StringIO
+from time import time
+from tempfile import mkstemp, mkdtemp
+from suds import WebFault, TypeNotFound
+from threading import Thread
+from suds.client import Client
+from suds.sax.parser import Parser
+from suds.sax.document import Serializer
+from suds.plugin import MessagePlugin
+from suds.cache import NoCache, ObjectCache
+from suds.snapshot import Snapshot, compile, SnapshotError
+from suds.transport import Future
+from suds.xsd.query import ElementQuery
+from suds.xsd.sxbasic import Element
+from suds.transport.asynchttp import AsyncHttpTransport
+from unittest import TestCase
+from tests import *
+from tests.server import Server, ENVELOPE
+
+setup_logging()
+
+
+class ServerTest(TestCase):
+    """
+    Base for tests run against the stub server.
+    @cvar wsdl: The path of the WSDL used to create I{self.client}
+        (None for no default client).
+    @type wsdl: str
+    """
+
+    wsdl = '/wsdl'
+
+    def setUp(self):
+        self.server = Server()
+        if self.wsdl:
+            self.client = self.mkclient(self.wsdl, **self.options())
+
+    def tearDown(self):
+        self.server.stop()
+
+    def options(self):
+        """
+        The options used to create I{self.client}.
+        @rtype: dict
+        """
+        return {}
+
+    def mkclient(self, path='/wsdl', **kwargs):
+        """
+        Create an (uncached) client for a document on the server.
+        @param path: The WSDL path.
+        @type path: str
+        @return: A new client.
+        @rtype: L{Client}
+        """
+        return Client(self.server.url(path), cache=NoCache(), **kwargs)
+
+
+class AsyncTest(ServerTest):
+
+    def options(self):
+        return dict(transport=AsyncHttpTransport())
+
+    def testInvoke(self):
+        future = self.client.aservice.echo('hello')
+        self.assertTrue(isinstance(future, Future))
+        self.assertEqual('hello', future.result(10))
+
+    def testInFlight(self):
+        futures = []
+        for n in range(50):
+            futures.append(self.client.aservice.echo('hello%d' % n))
+        for n, future in enumerate(futures):
+            self.assertEqual('hello%d' % n, future.result(10))
+
+    def testCallback(self):
+        done = Future()
+        future = self.client.aservice.getRecords(3)
+        future.add_done_callback(lambda f: done.set_result(f.result()))
+        records = done.result(10)
+        self.assertEqual(3, len(records))
+        self.assertEqual(2, records[2].id)
+        self.assertEqual('name-2', records[2].name)
+
+    def testFault(self):
+        future = self.client.aservice.echo('fault')
+        self.assertRaises(WebFault, future.result, 10)
+        self.client.set_options(faults=False)
+        status, fault = self.client.aservice.echo('fault').result(10)
+        self.assertEqual(500, status)
+
+    def testMessages(self):
+        future = self.client.aservice.echo('hello')
+        self.assertEqual('hello', future.result(10))
+        sent = self.client.last_sent().plain()
+        received = self.client.last_received().plain()
+        self.assertTrue('hello' in sent)
+        self.assertTrue('echoResponse' in received)
+
+    def testBlocking(self):
+        self.assertEqual('hello', self.client.service.echo('hello'))
+
+
+class BatchTest(ServerTest):
+
+    def testOrder(self):
+        arglist = ['hello%d' % n for n in range(20)]
+        arglist[7] = 'fault'
+        arglist[8] = dict(text='keyword')
+        arglist[9] = ('positional',)
+        result = self.client.batch('echo', arglist, concurrency=5)
+        self.assertEqual(20, len(result))
+        self.assertEqual(20, len(self.server.requests))
+        for n, text in enumerate(result):
+            if n == 7:
+                self.assertTrue(isinstance(text, WebFault))
+            elif n == 8:
+                self.assertEqual('keyword', text)
+            elif n == 9:
+                self.assertEqual('positional', text)
+            else:
+                self.assertEqual('hello%d' % n, text)
+
+    def testMessages(self):
+        self.client.service.echo('hello')
+        sent = self.client.last_sent()
+        self.client.batch('echo', ['a', 'b', 'c'], concurrency=3)
+        self.assertTrue(self.client.last_sent() is sent)
+
+
+class ThreadTest(ServerTest):
+
+    def testShared(self):
+        failed = []
+        def call(n):
+            try:
+                for i in range(10):
+                    text = 'thread%d-%d' % (n, i)
+                    self.assertEqual(text, self.client.service.echo(text))
+                    sent = self.client.last_sent().plain()
+                    self.assertTrue(text in sent)
+                    received = self.client.last_received().plain()
+                    self.assertTrue(text in received)
+            except Exception, e:
+                failed.append(e)
+        threads = [Thread(target=call, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual([], failed)
+        self.assertEqual(None, self.client.last_sent())
+
+
+class PlanTest(ServerTest):
+
+    def testReused(self):
+        method = self.client.wsdl.services[0].ports[0].methods['echo']
+        self.client.service.echo('hello')
+        sent = self.client.last_sent().plain()
+        plan = method.binding.input.plan(method, 'mx')
+        misses = plan.misses
+        self.assertTrue(misses > 0)
+        self.client.service.echo('hello')
+        self.assertEqual(sent, self.client.last_sent().plain())
+        self.assertEqual(misses, plan.misses)
+        self.assertTrue(plan.hits > 0)
+
+    def testReply(self):
+        self.client.service.getRecords(5)
+        self.client.service.getRecords(5)
+        plans = [p for p in self.client.plans() if 'umx' in p.name]
+        self.assertEqual(1, len(plans))
+        plan = plans[0]
+        self.assertEqual(40, plan.nodes)
+        self.assertEqual(4, len(plan.tables['class']))
+        self.assertTrue(plan.ratio() > 0.5)
+        records = self.client.service.getRecords(2)
+        self.assertEqual('name-1', records[1].name)
+        self.assertEqual(1.5, records[1].score)
+
+    def testInvalidated(self):
+        client = self.mkclient(lazy=True)
+        method = client.wsdl.services[0].ports[0].methods['echo']
+        client.service.echo('hello')
+        plan = method.binding.input.plan(method, 'mx')
+        client.service.echo('hello')
+        misses = plan.misses
+        self.assertTrue(len(plan) > 0)
+        client.factory.create('Record')
+        client.service.echo('hello')
+        self.assertTrue(plan.misses > misses)
+        misses = plan.misses
+        client.service.echo('hello')
+        self.assertEqual(misses, plan.misses)
+
+    def testPickled(self):
+        method = self.client.wsdl.services[0].ports[0].methods['echo']
+        self.client.service.echo('hello')
+        state = method.binding.input.__getstate__()
+        self.assertFalse('plans' in state)
+
+
+class StreamTest(ServerTest):
+
+    def options(self):
+        return dict(streamreply=True)
+
+    def testStreamed(self):
+        records = self.client.service.getRecords(500)
+        self.assertTrue(isinstance(records, GeneratorType))
+        n = 0
+        for record in records:
+            self.assertEqual(n, record.id)
+            self.assertEqual('name-%d' % n, record.name)
+            self.assertEqual(n+0.5, record.score)
+            n += 1
+        self.assertEqual(500, n)
+
+    def testEmpty(self):
+        self.assertEqual([], list(self.client.service.getRecords(0)))
+
+    def testNotStreamed(self):
+        self.assertEqual('hello', self.client.service.echo('hello'))
+        self.assertRaises(WebFault, self.client.service.echo, 'fault')
+
+    def testRequest(self):
+        self.client.set_options(streamrequest=True)
+        self.assertEqual('hello', self.client.service.echo('hello'))
+        expected = self.client.last_sent().plain().encode('utf-8')
+        self.assertEqual(expected, self.server.requests[-1])
+        serializer = Serializer(self.client.last_sent())
+        serializer.blocksize = 10
+        self.assertTrue(len(list(serializer)) > 1)
+        self.assertEqual(len(expected), len(serializer))
+        self.assertEqual(expected, str(serializer))
+
+    def testRequestPlugin(self):
+        class Plugin(MessagePlugin):
+            def sending(self, context):
+                context.envelope = context.envelope.replace('hello', 'world')
+        self.client.set_options(streamrequest=True, plugins=[Plugin()])
+        self.assertEqual('world', self.client.service.echo('hello'))
+
+    def testParser(self):
+        xml = ENVELOPE % '<ns:a><ns:b>1</ns:b><ns:b>2</ns:b></ns:a>'
+        stream = Parser().stream(StringIO(xml), 4)
+        items = list(stream)
+        self.assertEqual(['1', '2'], [b.getText() for b in items])
+        self.assertEqual('urn:test', items[0].namespace()[1])
+        body = stream.document.childAtPath('Envelope/Body')
+        self.assertEqual(0, len(body.getChild('a').children))
+
+
+class BackendTest(ServerTest):
+
+    def testExpat(self):
+        self.client.set_options(parser='expat')
+        self.assertEqual('hello', self.client.service.echo('hello'))
+        self.assertRaises(WebFault, self.client.service.echo, 'fault')
+        records = self.client.service.getRecords(2)
+        self.assertEqual('name-1', records[1].name)
+
+    def testUnknown(self):
+        self.client.set_options(parser='lxml')
+        self.assertRaises(Exception, self.client.service.echo, 'hello')
+
+
+class SnapshotTest(ServerTest):
+
+    wsdl = None
+
+    def setUp(self):
+        ServerTest.setUp(self)
+        fd, self.path = mkstemp()
+        os.close(fd)
+
+    def tearDown(self):
+        ServerTest.tearDown(self)
+        os.remove(self.path)
+
+    def testLoaded(self):
+        compile(self.server.url('/wsdl'), self.path)
+        self.assertEqual(1, len(self.server.gets))
+        client = Client.from_snapshot(self.path, cache=NoCache())
+        self.assertEqual(1, len(self.server.gets))
+        self.assertEqual('hello', client.service.echo('hello'))
+        records = client.service.getRecords(2)
+        self.assertEqual('name-1', records[1].name)
+        self.assertEqual(1.5, records[1].score)
+        record = client.factory.create('Record')
+        self.assertTrue(hasattr(record, 'score'))
+        for schema in client.wsdl.schema.children:
+            self.assertEqual(0, len(schema.root.children))
+
+    def testUnchanged(self):
+        client = self.mkclient()
+        sd = str(client.sd[0])
+        Snapshot(self.path).write(client.wsdl)
+        for schema in client.wsdl.schema.children:
+            self.assertTrue(len(schema.root.children) > 0)
+        self.assertEqual(sd, str(client.sd[0]))
+        self.assertEqual('hello', client.service.echo('hello'))
+        snapshot = Client.from_snapshot(self.path, cache=NoCache())
+        self.assertEqual('hello', snapshot.service.echo('hello'))
+        for schema in snapshot.wsdl.schema.children:
+            self.assertEqual(0, len(schema.root.children))
+
+    def testInvalid(self):
+        open(self.path, 'w').write('garbage\n')
+        self.assertRaises(SnapshotError, Client.from_snapshot, self.path)
+
+
+class PrefetchTest(ServerTest):
+
+    SCHEMA = """<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+    xmlns:tns="urn:%(name)s" targetNamespace="urn:%(name)s">
+  %(imports)s
+  <xs:complexType name="%(name)s">
+    <xs:sequence>
+      <xs:element name="id" type="xs:int"/>
+    </xs:sequence>
+  </xs:complexType>
+</xs:schema>
+"""
+
+    IMPORT = '<xs:import namespace="urn:%s" schemaLocation="%s.xsd"/>'
+
+    GRAPH = dict(
+        A=('B', 'C'),
+        B=('D',),
+        C=('D', 'E'),
+        D=(),
+        E=('A',))
+
+    wsdl = None
+
+    def setUp(self):
+        ServerTest.setUp(self)
+        for name, imported in self.GRAPH.items():
+            imports = [self.IMPORT % (n, n) for n in imported]
+            xsd = self.SCHEMA % dict(name=name, imports=''.join(imports))
+            self.server.documents['/%s.xsd' % name] = xsd
+        wsdl = self.server.wsdl().replace(
+            '<xs:complexType name="Record">',
+            self.IMPORT % ('A', '/A') + '<xs:complexType name="Record">')
+        self.server.documents['/imports.wsdl'] = wsdl
+        self.server.delay = 0.2
+
+    def testIdentical(self):
+        client = self.mkclient('/imports.wsdl')
+        gets = list(self.server.gets)
+        del self.server.gets[:]
+        prefetched = self.mkclient('/imports.wsdl', prefetch=4)
+        self.assertEqual(sorted(set(gets)), sorted(self.server.gets))
+        self.assertEqual(str(client.sd[0]), str(prefetched.sd[0]))
+        self.assertEqual(
+            [t[0].name for t in client.sd[0].types],
+            [t[0].name for t in prefetched.sd[0].types])
+        for name in self.GRAPH:
+            prefetched.factory.create('{urn:%s}%s' % (name, name))
+        self.assertEqual('hello', prefetched.service.echo('hello'))
+
+    def testRevalidate(self):
+        location = mkdtemp()
+        try:
+            cache = ObjectCache(location, seconds=1)
+            url = self.server.url('/wsdl')
+            Client(url, cache=cache, revalidate=True, prefetch=2)
+            self.assertEqual([None], self.server.gets)
+            past = time()-10
+            for path in cache.files():
+                os.utime(path, (past, past))
+            cache.sweep(force=True)
+            Client(url, cache=cache, revalidate=True, prefetch=2)
+            self.assertEqual([None, '"1"'], self.server.gets)
+        finally:
+            shutil.rmtree(location)
+
+
+class IndexTest(ServerTest):
+
+    wsdl = None
+
+    def setUp(self):
+        ServerTest.setUp(self)
+        xsd = PrefetchTest.SCHEMA % dict(name='A', imports='')
+        self.server.documents['/A.xsd'] = xsd
+        wsdl = self.server.wsdl().replace(
+            '<xs:complexType name="Record">',
+            PrefetchTest.IMPORT % ('A', '/A') + '<xs:complexType name="Record">')
+        self.server.documents['/index.wsdl'] = wsdl
+        self.client = self.mkclient('/index.wsdl')
+
+    def testDeep(self):
+        schema = self.client.wsdl.schema
+        ref = ('id', 'urn:A')
+        query = ElementQuery(ref)
+        found = query.execute(schema)
+        expected = schema.types[('A', 'urn:A')].find(ref, (Element,))
+        self.assertTrue(found is expected)
+        self.assertTrue(query.execute(schema) is None)
+        self.assertTrue(query.execute(schema) is None)
+        index = schema.index
+        self.assertTrue(isinstance(index, dict))
+        self.assertEqual(None, ElementQuery(('id', 'urn:B')).execute(schema))
+        self.assertTrue(schema.index is index)
+        self.assertTrue(ElementQuery(ref).execute(schema) is expected)
+        self.assertTrue(schema.index is index)
+
+    def testLazy(self):
+        client = self.mkclient('/index.wsdl', lazy=True)
+        schema = client.wsdl.schema
+        index = schema.index
+        ref = ('label', 'urn:test')
+        series = schema.types[('Series', 'urn:test')]
+        self.assertEqual((), schema.deep(ref, Element))
+        self.assertTrue(series.lazy)
+        client.factory.create('Series')
+        self.assertFalse(series.lazy)
+        found = schema.deep(ref, Element)
+        self.assertEqual(1, len(found))
+        self.assertTrue(found[0] is series.find(ref, (Element,)))
+        self.assertTrue(schema.index is index)
+
+
+class ResolveTest(ServerTest):
+
+    def testMemo(self):
+        schema = self.client.wsdl.schema
+        record = schema.elements[('getRecordsResponse', 'urn:test')]
+        child = record.children()[0][0]
+        hits, misses = schema.hits, schema.misses
+        resolved = child.resolve()
+        self.assertEqual(('Record', 'urn:test'), resolved.qname)
+        self.assertEqual(misses+1, schema.misses)
+        self.assertTrue(child.resolve() is resolved)
+        self.assertEqual(hits+1, schema.hits)
+        self.assertTrue(child.resolve(nobuiltin=True) is resolved)
+        child.merge(child)
+        self.assertEqual(None, child.memo)
+        misses = schema.misses
+        self.assertTrue(child.resolve() is resolved)
+        self.assertEqual(misses+1, schema.misses)
+
+
+class LazyTest(ServerTest):
+
+    def options(self):
+        return dict(lazy=True)
+
+    def loaded(self):
+        schema = self.client.wsdl.schema
+        return [x.name for x in schema.children if not x.lazy]
+
+    def testDeferred(self):
+        self.assertEqual([], self.loaded())
+        self.assertEqual('hello', self.client.service.echo('hello'))
+        self.assertEqual(['echo', 'echoResponse'], sorted(self.loaded()))
+        records = self.client.service.getRecords(2)
+        self.assertEqual('name-1', records[1].name)
+        self.assertEqual(1.5, records[1].score)
+        self.assertEqual(5, len(self.loaded()))
+
+    def testIdentical(self):
+        eager = self.mkclient()
+        for name in ('Record', 'echo', 'getRecords'):
+            self.assertEqual(
+                str(eager.factory.create(name)),
+                str(self.client.factory.create(name)))
+        self.assertEqual(str(eager.sd[0]), str(self.client.sd[0]))
+
+    def testFailed(self):
+        wsdl = self.server.wsdl().replace(
+            '<xs:complexType name="Record">',
+            '<xs:element name="Broken"><xs:complexType><xs:sequence>'
+            '<xs:element ref="tns:Missing"/>'
+            '</xs:sequence></xs:complexType></xs:element>'
+            '<xs:complexType name="Record">')
+        self.server.documents['/broken.wsdl'] = wsdl
+        client = self.mkclient('/broken.wsdl', lazy=True)
+        broken = client.wsdl.schema.elements[('Broken', 'urn:test')]
+        for n in range(2):
+            self.assertRaises(TypeNotFound, client.factory.create, 'Broken')
+            self.assertTrue(broken.lazy)
+        self.assertEqual(
+            'name', client.factory.create('Record').__keylist__[1])
+
+    def testWrapRetried(self):
+        echo = self.client.wsdl.schema.elements[('echo', 'urn:test')]
+        def resolve(*args, **kwargs):
+            del echo.resolve
+            raise TypeNotFound('echo')
+        echo.resolve = resolve
+        self.assertRaises(TypeNotFound, self.client.service.echo, 'hello')
+        method = self.client.wsdl.services[0].ports[0].methods['echo']
+        self.assertFalse(hasattr(method.soap.input.body, 'wrapped'))
+        self.assertEqual('hello', self.client.service.echo('hello'))
+        self.assertTrue(method.soap.input.body.wrapped)
+
+
+class ArrayTest(ServerTest):
+
+    REPLY = ENVELOPE % (
+        '<ns:getSeriesResponse><ns:series>'
+        '<ns:index>1</ns:index><ns:index>2</ns:index>'
+        '<ns:value/><ns:value>2.5</ns:value><ns:value/>'
+        '<ns:label>a</ns:label><ns:label/>'
+        '</ns:series><ns:total>2.5</ns:total></ns:getSeriesResponse>')
+
+    wsdl = None
+
+    def testBatched(self):
+        client = self.mkclient()
+        reply = client.service.getSeries(4)
+        self.assertEqual([0, 1, 2, 3], reply.series.index)
+        self.assertEqual([0.5, 1.5, 2.5, 3.5], reply.series.value)
+        self.assertEqual([0.5, 2.0, 4.5, 8.0], reply.total)
+        self.assertEqual(list, type(reply.total))
+
+    def testEmpty(self):
+        client = self.mkclient()
+        inject = dict(reply=self.REPLY)
+        reply = client.service.getSeries(3, __inject=inject)
+        self.assertEqual([2.5, None], reply.series.value)
+        self.assertEqual([u'a', None], reply.series.label)
+        self.assertEqual([2.5], reply.total)
+
+    def testArrays(self):
+        client = self.mkclient(arrays='array')
+        reply = client.service.getSeries(4)
+        self.assertEqual(array('l', [0, 1, 2, 3]), reply.series.index)
+        self.assertEqual(array('d', [0.5, 1.5, 2.5, 3.5]), reply.series.value)
+        self.assertEqual(array('d', [0.5, 2.0, 4.5, 8.0]), reply.total)
+        inject = dict(reply=self.REPLY)
+        reply = client.service.getSeries(3, __inject=inject)
+        self.assertEqual(array('l', [1, 2]), reply.series.index)
+        self.assertEqual([2.5, None], reply.series.value)
+        self.assertEqual([u'a', None], reply.series.label)
+
+
+class ColumnarTest(ServerTest):
+
+    wsdl = None
+
+    def testOption(self):
+        client = self.mkclient(columnar=True)
+        reply = client.service.getRecords(3)
+        self.assertEqual(['id', 'name', 'score'], reply.__keylist__)
+        self.assertEqual([0, 1, 2], reply.id)
+        self.assertEqual([u'name-0', u'name-1', u'name-2'], reply.name)
+        self.assertEqual([0.5, 1.5, 2.5], reply.score)
+        self.assertEqual([], client.service.getRecords(0).id)
+
+    def testCall(self):
+        client = self.mkclient(arrays='array')
+        reply = client.service.getRecords(2, __columnar=True)
+        self.assertEqual(array('l', [0, 1]), reply.id)
+        self.assertEqual([u'name-0', u'name-1'], reply.name)
+        self.assertEqual(array('d', [0.5, 1.5]), reply.score)
+        records = client.service.getRecords(2)
+        self.assertEqual(2, len(records))
+        self.assertEqual('name-1', records[1].name)
+
+    def testMissing(self):
+        client = self.mkclient(columnar=True)
+        inject = dict(reply=ENVELOPE % (
+            '<ns:getRecordsResponse>'
+            '<ns:record><ns:id>1</ns:id><ns:name/></ns:record>'
+            '<ns:record><ns:score>2.5</ns:score></ns:record>'
+            '</ns:getRecordsResponse>'))
+        reply = client.service.getRecords(2, __inject=inject)
+        self.assertEqual([1, None], reply.id)
+        self.assertEqual([None, None], reply.name)
+        self.assertEqual([None, 2.5], reply.score)
+
+    def testFallback(self):
+        client = self.mkclient(columnar=True)
+        inject = dict(reply=ENVELOPE % (
+            '<ns:getRecordsResponse>'
+            '<ns:record><ns:id>1</ns:id><ns:id>2</ns:id></ns:record>'
+            '</ns:getRecordsResponse>'))
+        records = client.service.getRecords(1, __inject=inject)
+        self.assertEqual(1, len(records))
+        self.assertEqual([1, 2], records[0].id)
+        reply = client.service.getSeries(2)
+        self.assertEqual([0, 1], reply.series.index)
+
+    def testWrapped(self):
+        record = ('<xs:element name="record" type="tns:Record"'
+                  ' minOccurs="0" maxOccurs="unbounded"/>')
+        wsdl = self.server.wsdl().replace(
+            record, '<xs:element name="records" type="tns:ArrayOfRecord"/>')
+        wsdl = wsdl.replace(
+            '<xs:complexType name="Series">',
+            '<xs:complexType name="ArrayOfRecord"><xs:sequence>%s'
+            '</xs:sequence></xs:complexType>'
+            '<xs:complexType name="Series">' % record)
+        self.server.documents['/wrapped.wsdl'] = wsdl
+        client = self.mkclient('/wrapped.wsdl', columnar=True)
+        inject = dict(reply=ENVELOPE % (
+            '<ns:getRecordsResponse><ns:records>'
+            '<ns:record><ns:id>1</ns:id><ns:name>a</ns:name></ns:record>'
+            '<ns:record><ns:id>2</ns:id><ns:score>2.5</ns:score></ns:record>'
+            '</ns:records></ns:getRecordsResponse>'))
+        reply = client.service.getRecords(2, __inject=inject)
+        self.assertEqual([1, 2], reply.record.id)
+        self.assertEqual([u'a', None], reply.record.name)
+        self.assertEqual([None, 2.5], reply.record.score)
+        reply = client.service.getRecords(2, __columnar=False, __inject=inject)
+        self.assertEqual(2, len(reply.record))
+        self.assertEqual(2, reply.record[1].id)
+
+
+class NativeTest(ServerTest):
+
+    def options(self):
+        return dict(retnative=True)
+
+    def testList(self):
+        records = self.client.service.getRecords(2)
+        self.assertEqual(
+            [dict(id=0, name=u'name-0', score=0.5),
+             dict(id=1, name=u'name-1', score=1.5)],
+            records)
+        self.assertEqual(dict, type(records[0]))
+        self.assertEqual(unicode, type(records[0]['name']))
+
+    def testComposite(self):
+        reply = self.client.service.getSeries(2)
+        self.assertEqual(
+            dict(series=dict(index=[0, 1], value=[0.5, 1.5]),
+                 total=[0.5, 2.0]),
+            reply)
+        json.dumps(reply)
+
+    def testAttributes(self):
+        inject = dict(reply=ENVELOPE % (
+            '<ns:getRecordsResponse>'
+            '<ns:record ref="a"><ns:id>1</ns:id><ns:name/></ns:record>'
+            '</ns:getRecordsResponse>'))
+        records = self.client.service.getRecords(1, __inject=inject)
+        self.assertEqual([dict(_ref=u'a', id=1, name=None)], records)
+        self.assertEqual(unicode, type(records[0]['_ref']))
+
+    def testColumnar(self):
+        reply = self.client.service.getRecords(2, __columnar=True)
+        self.assertEqual(
+            dict(id=[0, 1], name=[u'name-0', u'name-1'], score=[0.5, 1.5]),
+            reply)
+
+
+
+
+if __name__ == '__main__':
+    unittest.main()
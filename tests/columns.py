@@ -0,0 +1,67 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+#
+# Memory used by (and time to unmarshal) a 50k record reply returned
+# as a list of objects and as columns.
+#
+
+import sys
+sys.path.append('../')
+from time import time
+from suds.client import Client
+from suds.cache import NoCache
+from suds.sudsobject import Object
+from tests.server import Server
+
+
+def sizeof(x, seen):
+    """ sum the size of the object and the (suds) objects it references """
+    if id(x) in seen:
+        return 0
+    seen.add(id(x))
+    n = sys.getsizeof(x)
+    if isinstance(x, Object):
+        n += sizeof(x.__dict__, seen)
+        for v in x.__dict__.values():
+            if isinstance(v, (Object, list)):
+                n += sizeof(v, seen)
+    if isinstance(x, list):
+        for v in x:
+            n += sizeof(v, seen)
+    return n
+
+
+def main():
+    records = 50000
+    server = Server()
+    try:
+        for options in (dict(), dict(columnar=True),
+                dict(columnar=True, arrays='array')):
+            client = Client(server.url('/wsdl'), cache=NoCache(), **options)
+            client.service.getRecords(10)
+            for n in range(3):
+                started = time()
+                reply = client.service.getRecords(records)
+                elapsed = time()-started
+            total = sizeof(reply, set())
+            print '%s: %d records, %.2f s, %d bytes/record' % \
+                (options, records, elapsed, total/records)
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+#
+# Time to dereference schemas with (synthetic) deep extension hierarchies.
+# The time per type should not grow with the number of types.
+#
+
+import sys
+import gc
+sys.path.append('../')
+from time import time
+from suds.options import Options
+from suds.sax.parser import Parser
+from suds.xsd.schema import Schema
+from suds.xsd.deplist import DepList
+
+
+TYPE = \
+    '<xs:complexType name="T%d">' \
+    '<xs:complexContent>' \
+    '<xs:extension base="%s">' \
+    '<xs:sequence><xs:element name="f%d" type="xs:string"/></xs:sequence>' \
+    '</xs:extension>' \
+    '</xs:complexContent>' \
+    '</xs:complexType>'
+
+
+def document(n, depth):
+    s = []
+    s.append('<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"')
+    s.append(' xmlns:tns="urn:test" targetNamespace="urn:test">')
+    s.append('<xs:complexType name="Base"><xs:sequence>')
+    s.append('<xs:element name="id" type="xs:int"/>')
+    s.append('</xs:sequence></xs:complexType>')
+    for i in range(n):
+        if i % depth:
+            base = 'tns:T%d' % (i-1)
+        else:
+            base = 'tns:Base'
+        s.append(TYPE % (i, base, i))
+    s.append('</xs:schema>')
+    return ''.join(s)
+
+
+def dereference(n, depth):
+    root = Parser().parse(string=document(n, depth)).root()
+    schema = Schema(root, '', Options(), container={})
+    schema.build()
+    gc.collect()
+    started = time()
+    schema.dereference()
+    return time()-started
+
+
+def deplist(n, depth):
+    items = []
+    for i in range(n):
+        if i % depth:
+            items.append((i, (i-1,)))
+        else:
+            items.append((i, ()))
+    items.reverse()
+    gc.collect()
+    started = time()
+    DepList().add(*items).sort()
+    return time()-started
+
+
+def main():
+    for depth in (10, 1000):
+        for n in (2500, 5000, 10000, 20000):
+            t = dereference(n, depth)
+            print 'dereference: %d types, depth=%d, %.2f s, %.1f us/type' % \
+                (n, depth, t, t/n*1000000)
+    for n in (25000, 50000, 100000, 200000):
+        t = deplist(n, n)
+        print 'deplist: %d items (one chain), %.2f s, %.1f us/item' % \
+            (n, t, t/n*1000000)
+
+
+if __name__ == '__main__':
+    main()
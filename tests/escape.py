@@ -0,0 +1,72 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+#
+# Time to escape/unescape text and to render an envelope with many leaves.
+#
+
+import sys
+sys.path.append('../')
+from time import time
+from suds.sax import encoder
+from suds.sax.text import Text
+from suds.sax.parser import Parser
+
+
+PLAIN = [u'name-%d' % n for n in range(100)] + [u'1.5', u'true']
+SPECIAL = [u'a < b & c', u"O'Brien & Sons", u'x &amp; y <z>']
+LONG = [u'lorem ipsum dolor sit amet ' * 40,
+        u'lorem ipsum <b>dolor</b> & sit amet ' * 30]
+
+
+def timed(fn, values, n=200000):
+    rounds = n/len(values)
+    started = time()
+    for i in xrange(rounds):
+        for v in values:
+            fn(v)
+    return (time()-started)/(rounds*len(values))*1000000
+
+
+def envelope(n):
+    s = []
+    s.append('<ns:records xmlns:ns="urn:test">')
+    for i in range(n):
+        s.append('<ns:record ns:id="%d">' % i)
+        s.append('<ns:name>name-%d</ns:name>' % i)
+        s.append('<ns:note>a &lt; b &amp; c</ns:note>')
+        s.append('</ns:record>')
+    s.append('</ns:records>')
+    return ''.join(s)
+
+
+def main():
+    for name, values in (('plain', PLAIN), ('special', SPECIAL), ('long', LONG)):
+        encoded = [encoder.encode(v) for v in values]
+        texts = [Text(v) for v in values]
+        print '%s: encode %.2f us, decode %.2f us, escape %.2f us' % (
+            name,
+            timed(encoder.encode, values),
+            timed(encoder.decode, encoded),
+            timed(Text.escape, texts))
+    root = Parser().parse(string=envelope(10000)).root()
+    started = time()
+    root.plain()
+    print 'render: 10000 records, %.2f s' % (time()-started)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+#
+# Memory used by a parsed (100k node) document.
+#
+
+import sys
+sys.path.append('../')
+from suds.sax.parser import Parser
+from suds.sax.element import Element
+from suds.sax.attribute import Attribute
+
+
+RECORD = \
+    '<ns:record ns:id="%d">' \
+    '<ns:name>name-%d</ns:name>' \
+    '<ns:score>%d.5</ns:score>' \
+    '<ns:note/>' \
+    '</ns:record>'
+
+
+def document(n):
+    s = []
+    s.append('<ns:records xmlns:ns="urn:test">')
+    for i in range(n/4):
+        s.append(RECORD % (i, i, i))
+    s.append('</ns:records>')
+    return ''.join(s)
+
+
+def sizeof(node, seen):
+    """ sum the size of the node and everything it references """
+    if id(node) in seen:
+        return 0
+    seen.add(id(node))
+    n = sys.getsizeof(node)
+    if hasattr(node, '__dict__'):
+        n += sizeof(node.__dict__, seen)
+    if isinstance(node, dict):
+        for k, v in node.items():
+            n += sizeof(k, seen)
+            n += sizeof(v, seen)
+    if isinstance(node, (list, tuple)):
+        for x in node:
+            n += sizeof(x, seen)
+    if isinstance(node, (Element, Attribute)):
+        for name in ('prefix', 'name', 'expns', 'text', 'value'):
+            n += sizeof(getattr(node, name, None), seen)
+    if isinstance(node, Element):
+        for name in ('nsprefixes', 'attributes', 'children'):
+            n += sizeof(getattr(node, '_Element__%s' % name), seen)
+    return n
+
+
+def main():
+    nodes = 100000
+    xml = document(nodes)
+    for backend in ('sax', 'expat'):
+        root = Parser(backend).parse(string=xml).root()
+        total = sizeof(root, set())
+        print '%s: %d nodes, %d bytes, %d bytes/node' % \
+            (backend, nodes, total, total/nodes)
+
+
+if __name__ == '__main__':
+    main()
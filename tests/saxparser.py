@@ -0,0 +1,115 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+#
+# Compare the trees built by the sax parser backends.
+#
+
+import sys
+sys.path.append('../')
+import unittest
+import pickle
+from cStringIO import StringIO
+from suds.sax.parser import Parser
+from suds.sax.element import NOPREFIXES
+from unittest import TestCase
+from tests import *
+from tests.server import WSDL, ENVELOPE, FAULT
+
+setup_logging()
+
+
+DOCUMENTS = [
+    WSDL % dict(location='http://localhost/soap'),
+    ENVELOPE % '<ns:echoResponse><ns:text>hello</ns:text></ns:echoResponse>',
+    ENVELOPE % (FAULT % 'failed'),
+    '<a>Me &amp;&amp; &lt;b&gt;my&lt;/b&gt; shadow&apos;s dog</a>',
+    '<a><![CDATA[<b>This is my &amp;&lt;tag&gt;</b>]]></a>',
+    '<a xmlns="urn:a" x="1" y="2" z="3"><b xmlns=""/><c xmlns="urn:c">'
+        '\xc3\xa9t\xc3\xa9</c>\n  <d>  padded  </d></a>',
+    '<p:a xmlns:p="urn:p" xmlns:q="urn:q" q:x="1"><q:b p:y="2">'
+        '<c xsi:nil="true" xmlns:xsi="urn:xsi"/></q:b></p:a>',
+]
+
+
+class ParserTest(TestCase):
+
+    def testIdentical(self):
+        for xml in DOCUMENTS:
+            a = Parser('sax').parse(string=xml)
+            b = Parser('expat').parse(string=xml)
+            self.assertEqual(a.plain(), b.plain())
+            self.assertEqual(a.str(), b.str())
+            self.compare(a.root(), b.root())
+
+    def testFile(self):
+        xml = DOCUMENTS[0]
+        a = Parser('sax').parse(file=StringIO(xml))
+        b = Parser('expat').parse(file=StringIO(xml))
+        self.compare(a.root(), b.root())
+
+    def testReused(self):
+        first = Parser().parse(string=DOCUMENTS[1])
+        second = Parser().parse(string=DOCUMENTS[2])
+        self.assertFalse(first.root() is second.root())
+        self.assertEqual('Envelope', first.root().name)
+
+    def testMalformed(self):
+        for backend in ('sax', 'expat'):
+            p = Parser(backend)
+            self.assertRaises(Exception, p.parse, string='<a><b></a>')
+
+    def testUnknown(self):
+        self.assertRaises(Exception, Parser, 'lxml')
+
+    def testPickled(self):
+        for backend in ('sax', 'expat'):
+            a = Parser(backend).parse(string=DOCUMENTS[0])
+            b = pickle.loads(pickle.dumps(a, 2))
+            self.compare(a.root(), b.root())
+            leaf = b.root().getChild('types').getChild('schema')
+            leaf.addPrefix('x', 'urn:x')
+            self.assertEqual({}, NOPREFIXES)
+
+    def testStreamText(self):
+        xml = '<a>\n <w>\n  <i>1</i>\n  <i> 2 </i>\n </w>\n</a>'
+        stream = Parser().stream(StringIO(xml), 3)
+        self.assertEqual([u'1', u' 2 '], [i.text for i in stream])
+        a = stream.document.root()
+        self.assertEqual(None, a.text)
+        self.assertEqual(None, a.getChild('w').text)
+        self.assertEqual([], stream.handler.text[1:])
+
+    def compare(self, a, b):
+        self.assertEqual(a.prefix, b.prefix)
+        self.assertEqual(a.name, b.name)
+        self.assertEqual(a.expns, b.expns)
+        self.assertEqual(a.nsprefixes, b.nsprefixes)
+        self.assertEqual(a.text, b.text)
+        self.assertEqual(type(a.text), type(b.text))
+        self.assertEqual(
+            [(x.prefix, x.name, x.value) for x in a.attributes],
+            [(x.prefix, x.name, x.value) for x in b.attributes])
+        for x in b.attributes:
+            self.assertTrue(x.parent is b)
+        self.assertEqual(len(a.children), len(b.children))
+        for x, y in zip(a.children, b.children):
+            self.assertTrue(y.parent is b)
+            self.compare(x, y)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,279 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+"""
+A local (stub) SOAP service used by the tests.
+"""
+
+import sys
+sys.path.append('../')
+from time import sleep
+from threading import Thread
+from SocketServer import ThreadingMixIn
+from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+from suds.sax.parser import Parser
+
+
+WSDL = """<?xml version="1.0" encoding="UTF-8"?>
+<definitions
+    xmlns="http://schemas.xmlsoap.org/wsdl/"
+    xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+    xmlns:xs="http://www.w3.org/2001/XMLSchema"
+    xmlns:tns="urn:test"
+    targetNamespace="urn:test"
+    name="Test">
+  <types>
+    <xs:schema targetNamespace="urn:test" elementFormDefault="qualified">
+      <xs:complexType name="Record">
+        <xs:sequence>
+          <xs:element name="id" type="xs:int"/>
+          <xs:element name="name" type="xs:string"/>
+          <xs:element name="score" type="xs:float"/>
+        </xs:sequence>
+      </xs:complexType>
+      <xs:complexType name="Series">
+        <xs:sequence>
+          <xs:element name="index" type="xs:int" maxOccurs="unbounded"/>
+          <xs:element name="value" type="xs:double" nillable="true" maxOccurs="unbounded"/>
+          <xs:element name="label" type="xs:string" minOccurs="0" maxOccurs="unbounded"/>
+        </xs:sequence>
+      </xs:complexType>
+      <xs:element name="echo">
+        <xs:complexType>
+          <xs:sequence>
+            <xs:element name="text" type="xs:string"/>
+          </xs:sequence>
+        </xs:complexType>
+      </xs:element>
+      <xs:element name="echoResponse">
+        <xs:complexType>
+          <xs:sequence>
+            <xs:element name="text" type="xs:string"/>
+          </xs:sequence>
+        </xs:complexType>
+      </xs:element>
+      <xs:element name="getRecords">
+        <xs:complexType>
+          <xs:sequence>
+            <xs:element name="count" type="xs:int"/>
+          </xs:sequence>
+        </xs:complexType>
+      </xs:element>
+      <xs:element name="getRecordsResponse">
+        <xs:complexType>
+          <xs:sequence>
+            <xs:element name="record" type="tns:Record" minOccurs="0" maxOccurs="unbounded"/>
+          </xs:sequence>
+        </xs:complexType>
+      </xs:element>
+      <xs:element name="getSeries">
+        <xs:complexType>
+          <xs:sequence>
+            <xs:element name="count" type="xs:int"/>
+          </xs:sequence>
+        </xs:complexType>
+      </xs:element>
+      <xs:element name="getSeriesResponse">
+        <xs:complexType>
+          <xs:sequence>
+            <xs:element name="series" type="tns:Series"/>
+            <xs:element name="total" type="xs:double" maxOccurs="unbounded"/>
+          </xs:sequence>
+        </xs:complexType>
+      </xs:element>
+    </xs:schema>
+  </types>
+  <message name="echoRequest">
+    <part name="parameters" element="tns:echo"/>
+  </message>
+  <message name="echoResponse">
+    <part name="parameters" element="tns:echoResponse"/>
+  </message>
+  <message name="getRecordsRequest">
+    <part name="parameters" element="tns:getRecords"/>
+  </message>
+  <message name="getRecordsResponse">
+    <part name="parameters" element="tns:getRecordsResponse"/>
+  </message>
+  <message name="getSeriesRequest">
+    <part name="parameters" element="tns:getSeries"/>
+  </message>
+  <message name="getSeriesResponse">
+    <part name="parameters" element="tns:getSeriesResponse"/>
+  </message>
+  <portType name="TestPort">
+    <operation name="echo">
+      <input message="tns:echoRequest"/>
+      <output message="tns:echoResponse"/>
+    </operation>
+    <operation name="getRecords">
+      <input message="tns:getRecordsRequest"/>
+      <output message="tns:getRecordsResponse"/>
+    </operation>
+    <operation name="getSeries">
+      <input message="tns:getSeriesRequest"/>
+      <output message="tns:getSeriesResponse"/>
+    </operation>
+  </portType>
+  <binding name="TestBinding" type="tns:TestPort">
+    <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+    <operation name="echo">
+      <soap:operation soapAction="echo"/>
+      <input><soap:body use="literal"/></input>
+      <output><soap:body use="literal"/></output>
+    </operation>
+    <operation name="getRecords">
+      <soap:operation soapAction="getRecords"/>
+      <input><soap:body use="literal"/></input>
+      <output><soap:body use="literal"/></output>
+    </operation>
+    <operation name="getSeries">
+      <soap:operation soapAction="getSeries"/>
+      <input><soap:body use="literal"/></input>
+      <output><soap:body use="literal"/></output>
+    </operation>
+  </binding>
+  <service name="TestService">
+    <port name="TestPort" binding="tns:TestBinding">
+      <soap:address location="%(location)s"/>
+    </port>
+  </service>
+</definitions>
+"""
+
+ENVELOPE = """<?xml version="1.0" encoding="UTF-8"?>
+<SOAP-ENV:Envelope xmlns:SOAP-ENV="http://schemas.xmlsoap.org/soap/envelope/" xmlns:ns="urn:test">
+<SOAP-ENV:Body>%s</SOAP-ENV:Body>
+</SOAP-ENV:Envelope>"""
+
+FAULT = """<SOAP-ENV:Fault>
+<faultcode>SOAP-ENV:Server</faultcode>
+<faultstring>%s</faultstring>
+<detail/>
+</SOAP-ENV:Fault>"""
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        document = self.server.documents.get(self.path)
+        if document is not None:
+            sleep(self.server.delay)
+            self.server.gets.append(self.path)
+            self.reply(200, document)
+            return
+        etag = '"%d"' % self.server.version
+        validator = self.headers.get('if-none-match')
+        self.server.gets.append(validator)
+        if validator == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        else:
+            self.reply(200, self.server.wsdl(), ETag=etag)
+
+    def do_POST(self):
+        n = int(self.headers.get('content-length', 0))
+        body = self.rfile.read(n)
+        self.server.requests.append(body)
+        document = Parser().parse(string=body)
+        request = document.childAtPath('Envelope/Body')[0]
+        method = getattr(self, request.name)
+        try:
+            content = method(request)
+            self.reply(200, ENVELOPE % content)
+        except Exception, e:
+            self.reply(500, ENVELOPE % (FAULT % e))
+
+    def echo(self, request):
+        text = request.getChild('text').getText()
+        if text == 'fault':
+            raise Exception('echo fault')
+        return '<ns:echoResponse><ns:text>%s</ns:text></ns:echoResponse>' % text
+
+    def getRecords(self, request):
+        count = int(request.getChild('count').getText())
+        s = ['<ns:getRecordsResponse>']
+        for i in range(count):
+            s.append('<ns:record>')
+            s.append('<ns:id>%d</ns:id>' % i)
+            s.append('<ns:name>name-%d</ns:name>' % i)
+            s.append('<ns:score>%d.5</ns:score>' % i)
+            s.append('</ns:record>')
+        s.append('</ns:getRecordsResponse>')
+        return ''.join(s)
+
+    def getSeries(self, request):
+        count = int(request.getChild('count').getText())
+        s = ['<ns:getSeriesResponse><ns:series>']
+        for i in range(count):
+            s.append('<ns:index>%d</ns:index>' % i)
+        for i in range(count):
+            s.append('<ns:value>%d.5</ns:value>' % i)
+        s.append('</ns:series>')
+        total = 0.0
+        for i in range(count):
+            total += i + 0.5
+            s.append('<ns:total>%s</ns:total>' % total)
+        s.append('</ns:getSeriesResponse>')
+        return ''.join(s)
+
+    def reply(self, code, body, **headers):
+        self.send_response(code)
+        self.send_header('Content-Type', 'text/xml; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for header in headers.items():
+            self.send_header(*header)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(ThreadingMixIn, HTTPServer):
+    """
+    The stub service.  The WSDL is served by GET and the
+    operations by POST on any path.  The WSDL is served with an
+    ETag of the I{version}.  Other I{documents} are served by path
+    after a I{delay}.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), Handler)
+        self.requests = []
+        self.gets = []
+        self.version = 1
+        self.documents = {}
+        self.delay = 0
+        thread = Thread(target=self.serve_forever)
+        thread.setDaemon(True)
+        thread.start()
+
+    def url(self, path='/'):
+        return 'http://127.0.0.1:%d%s' % (self.server_port, path)
+
+    def wsdl(self):
+        return WSDL % dict(location=self.url('/soap'))
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,200 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+import sys
+sys.path.append('../')
+import unittest
+from threading import Thread
+from SocketServer import ThreadingMixIn
+from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+from suds.transport import Request, TransportError
+from suds.transport.http import HttpTransport
+from suds.transport.https import HttpAuthenticated
+from unittest import TestCase
+from tests import *
+
+setup_logging()
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.server.connections.add(self.client_address)
+        self.server.requests.append(self.path)
+        n = int(self.headers.get('content-length', 0))
+        body = self.rfile.read(n)
+        if self.path == '/drop':
+            self.close_connection = 1
+            return
+        if self.path == '/auth' and 'authorization' not in self.headers:
+            self.send_response(401)
+            self.send_header('WWW-Authenticate', 'Basic realm="test"')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path == '/fault':
+            self.reply(500, body)
+        else:
+            self.reply(200, body)
+
+    def reply(self, code, body):
+        self.send_response(code)
+        self.send_header('Content-Type', 'text/xml')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(ThreadingMixIn, HTTPServer):
+
+    daemon_threads = True
+
+    def __init__(self):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), Handler)
+        self.connections = set()
+        self.requests = []
+        thread = Thread(target=self.serve_forever)
+        thread.setDaemon(True)
+        thread.start()
+
+    def url(self, path='/'):
+        return 'http://127.0.0.1:%d%s' % (self.server_port, path)
+
+
+class KeepAliveTest(TestCase):
+
+    def setUp(self):
+        self.server = Server()
+        self.transports = []
+
+    def tearDown(self):
+        for transport in self.transports:
+            transport.pool.clear()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def testReused(self):
+        transport = self.transport(keepalive=True)
+        for n in range(5):
+            reply = transport.send(Request(self.server.url(), 'hello%d' % n))
+            self.assertEqual('hello%d' % n, reply.message)
+        self.assertEqual(1, len(self.server.connections))
+        self.assertEqual(1, len(transport.pool))
+
+    def testNotReused(self):
+        transport = self.transport()
+        for n in range(3):
+            reply = transport.send(Request(self.server.url(), 'hello'))
+            self.assertEqual('hello', reply.message)
+        self.assertEqual(3, len(self.server.connections))
+        self.assertEqual(0, len(transport.pool))
+
+    def testMaxRequests(self):
+        transport = self.transport(keepalive=True, maxrequests=2)
+        for n in range(4):
+            transport.send(Request(self.server.url(), 'hello'))
+        self.assertEqual(2, len(self.server.connections))
+
+    def testStale(self):
+        transport = self.transport(keepalive=True)
+        transport.send(Request(self.server.url(), 'hello'))
+        for entries in transport.pool.idle.values():
+            for entry in entries:
+                entry.connection.sock.close()
+        reply = transport.send(Request(self.server.url(), 'again'))
+        self.assertEqual('again', reply.message)
+
+    def testError(self):
+        transport = self.transport(keepalive=True)
+        try:
+            transport.send(Request(self.server.url('/fault'), 'fault'))
+            self.fail('expected TransportError')
+        except TransportError, e:
+            self.assertEqual(500, e.httpcode)
+            self.assertEqual('fault', e.fp.read())
+        reply = transport.send(Request(self.server.url(), 'hello'))
+        self.assertEqual('hello', reply.message)
+        self.assertEqual(1, len(self.server.connections))
+
+    def testStreamed(self):
+        transport = self.transport(keepalive=True)
+        reply = transport.stream(Request(self.server.url(), 'hello'))
+        self.assertEqual(0, len(transport.pool))
+        self.assertEqual('hel', reply.message.read(3))
+        self.assertEqual(0, len(transport.pool))
+        self.assertEqual('lo', reply.message.read())
+        self.assertEqual(1, len(transport.pool))
+        reply = transport.stream(Request(self.server.url(), 'world'))
+        self.assertEqual('w', reply.message.read(1))
+        reply.message.close()
+        self.assertEqual(0, len(transport.pool))
+        reply = transport.send(Request(self.server.url(), 'again'))
+        self.assertEqual('again', reply.message)
+        self.assertEqual(2, len(self.server.connections))
+
+    def testNotResent(self):
+        transport = self.transport(keepalive=True)
+        transport.send(Request(self.server.url(), 'hello'))
+        self.assertRaises(
+            Exception,
+            transport.send, Request(self.server.url('/drop'), 'hello'))
+        self.assertEqual(['/', '/drop'], self.server.requests)
+
+    def transport(self, **kwargs):
+        transport = HttpTransport(**kwargs)
+        self.transports.append(transport)
+        return transport
+
+
+class Message:
+    """ a (streamed) message of the specified blocks """
+
+    def __init__(self, *blocks):
+        self.blocks = blocks
+
+    def __iter__(self):
+        return iter(self.blocks)
+
+    def __len__(self):
+        return sum([len(b) for b in self.blocks])
+
+
+class StreamTest(TestCase):
+
+    def setUp(self):
+        self.server = Server()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def testChallenged(self):
+        transport = HttpAuthenticated(
+            username='user', password='pw', timeout=10)
+        url = self.server.url('/auth')
+        reply = transport.send(Request(url, 'hello'))
+        self.assertEqual('hello', reply.message)
+        reply = transport.send(Request(url, Message('hel', 'lo')))
+        self.assertEqual('hello', reply.message)
+
+
+if __name__ == '__main__':
+    unittest.main()